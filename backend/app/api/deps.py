@@ -0,0 +1,80 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordBearer
+from jose import jwt
+from pydantic import ValidationError
+
+from app.core.auth_cache import Principal, principal_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import ALGORITHM
+from app.models.user import User
+from app.schemas.token import TokenPayload
+
+reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+
+
+def _load_principal(user_id: UUID) -> Optional[Principal]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return None
+        return Principal(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+        )
+    finally:
+        db.close()
+
+
+async def get_current_user(token: str = Depends(reusable_oauth2)) -> Principal:
+    """
+    Resolve the bearer token to the active user it was issued for.
+
+    Verified tokens are served from the principal cache, so a warm request
+    neither decodes the JWT nor touches the database.
+    """
+    principal = principal_cache.get(token)
+    if principal:
+        return principal
+
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        token_data = TokenPayload(**payload)
+        user_id = UUID(token_data.sub)
+    except (jwt.JWTError, ValidationError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    principal = await run_in_threadpool(_load_principal, user_id)
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user",
+        )
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
+
+
+async def get_current_active_superuser(current_user: Principal = Depends(get_current_user)) -> Principal:
+    """Resolve the current user, refusing anyone who is not a superuser."""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The user doesn't have enough privileges",
+        )
+    return current_user
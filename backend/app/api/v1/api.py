@@ -1,6 +1,16 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import users, auth, businesses, orders, technologies
+from app.api.v1.endpoints import users, auth, events, internal, leaderboards
+from app.core.config import settings
+
+if settings.DB_ASYNC_ENDPOINTS:
+    from app.api.v1.endpoints import (
+        businesses_async as businesses,
+        orders_async as orders,
+        technologies_async as technologies,
+    )
+else:
+    from app.api.v1.endpoints import businesses, orders, technologies
 
 api_router = APIRouter()
 
@@ -8,4 +18,7 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(businesses.router, prefix="/businesses", tags=["businesses"])
 api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
-api_router.include_router(technologies.router, prefix="/technologies", tags=["technologies"])
\ No newline at end of file
+api_router.include_router(technologies.router, prefix="/technologies", tags=["technologies"])
+api_router.include_router(leaderboards.router, prefix="/leaderboards", tags=["leaderboards"])
+api_router.include_router(internal.router, prefix="/internal", tags=["internal"])
+api_router.include_router(events.router, prefix="/ws", tags=["events"])
\ No newline at end of file
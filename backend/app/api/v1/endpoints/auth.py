@@ -1,29 +1,55 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_and_update_password_async,
+)
 from app.models.user import User
 from app.schemas.token import Token
 from app.schemas.user import UserCreate
 
+# Handlers that hash passwords are async, so a login storm waits on the
+# password hasher without holding threadpool threads. Their database calls
+# still run in the threadpool.
 router = APIRouter()
 
 
+def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+    user = db.query(User).filter(User.email == email).first()
+    # Hand the connection back to the pool while the caller hashes a password.
+    # The user stays loaded, detached; _save_user attaches it again.
+    db.close()
+    return user
+
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(_get_user_by_email, db, form_data.username)
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not user or not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -33,6 +59,10 @@ def login_access_token(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
+    # Upgrade hashes made with an old bcrypt cost while we have the password
+    if new_hash:
+        user.hashed_password = new_hash
+        user = await run_in_threadpool(_save_user, db, user)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": create_access_token(
@@ -43,7 +73,7 @@ def login_access_token(
 
 
 @router.post("/register", response_model=Token)
-def register_user(
+async def register_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
@@ -51,7 +81,7 @@ def register_user(
     """
     Register a new user.
     """
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await run_in_threadpool(_get_user_by_email, db, user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -61,11 +91,9 @@ def register_user(
     # Create new user
     db_user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db_user = await run_in_threadpool(_save_user, db, db_user)
     
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -0,0 +1,246 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.auth_cache import Principal
+from app.core.database import get_async_db
+from app.core.pagination import paginate, set_next_cursor
+from app.core.responses import etag_matches, list_response, not_modified
+from app.models.business import Business
+from app.models.statistics import Statistics
+from app.schemas.business import (
+    Business as BusinessSchema,
+    BusinessCreate,
+    BusinessUpdate,
+    business_list_adapter,
+)
+from app.schemas.click import ClickBatch, ClickBatchResult
+from app.schemas.snapshot import BusinessSnapshot
+from app.schemas.statistics import StatisticsSeries
+from app.services.business_events import progress_events, publish_business_events
+from app.services.business_snapshot import load_snapshot, snapshot_etag
+from app.services.click_batches import apply_click_batch
+from app.services.leaderboard import leaderboards
+from app.services.offline_progress import resume_business
+from app.services.statistics_buffer import statistics_buffer
+from app.services.statistics_history import MINUTE, load_series, series_bounds
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[BusinessSchema])
+async def read_businesses(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve businesses, oldest first.
+
+    Pass the X-Next-Cursor header of a full page as cursor to get the next
+    page; skip is ignored when a cursor is given.
+    """
+    result = await db.execute(paginate(select(Business), Business, cursor, skip, limit))
+    businesses = result.scalars().all()
+    set_next_cursor(response, businesses, limit)
+    return list_response(business_list_adapter, businesses, response)
+
+
+@router.post("/", response_model=BusinessSchema)
+async def create_business(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_in: BusinessCreate,
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Create new business.
+    """
+    business = Business(
+        name=business_in.name,
+        product_type=business_in.product_type,
+        owner_id=current_user.id,
+    )
+    db.add(business)
+    await db.commit()
+    await db.refresh(business)
+
+    # Create initial statistics for the business
+    statistics = Statistics(business_id=business.id)
+    db.add(statistics)
+    await db.commit()
+    leaderboards.set_scores(business.id, {})
+
+    return business
+
+
+@router.get("/{business_id}", response_model=BusinessSchema)
+async def read_business(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: UUID,
+) -> Any:
+    """
+    Get business by ID.
+
+    A player returning after OFFLINE_PROGRESS_MIN_SECONDS is first credited
+    with what their automation did while they were away.
+    """
+    business = await db.run_sync(resume_business, business_id)
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+    return business
+
+
+@router.get("/{business_id}/snapshot", response_model=BusinessSnapshot)
+async def read_business_snapshot(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    response: Response,
+    business_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+) -> Any:
+    """
+    Get a business with its statistics, active orders and technologies.
+
+    The response carries an ETag. Polls that send it back in If-None-Match
+    get an empty 304 after a single aggregate query while nothing changed.
+    """
+    if if_none_match:
+        etag = await db.run_sync(snapshot_etag, business_id)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    loaded = await db.run_sync(load_snapshot, business_id)
+    if not loaded:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+    etag, snapshot = loaded
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return snapshot
+
+
+@router.get("/{business_id}/statistics/series", response_model=StatisticsSeries)
+async def read_statistics_series(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: UUID,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    step: int = Query(MINUTE, ge=MINUTE),
+) -> Any:
+    """
+    Get a business's statistics increments between the from and to query
+    parameters (the last hour by default), summed into points step seconds
+    apart.
+
+    Points are read from the coarsest history buckets (minute, hour or day)
+    that divide step, so the cost grows with the number of buckets rather
+    than orders. Hour and day buckets trail the minute buckets by up to
+    STATISTICS_ROLLUP_SECONDS.
+    """
+    now = datetime.utcnow()
+    try:
+        start, end = series_bounds(start, end, step, now)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
+    series = await db.run_sync(load_series, business_id, start, end, step, now)
+    if not series:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+    return series
+
+
+@router.put("/{business_id}", response_model=BusinessSchema)
+async def update_business(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str,
+    business_in: BusinessUpdate,
+) -> Any:
+    """
+    Update business.
+    """
+    business = await db.scalar(select(Business).filter(Business.id == business_id))
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+
+    update_data = business_in.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(business, field, value)
+
+    db.add(business)
+    await db.commit()
+    await db.refresh(business)
+    return business
+
+
+@router.delete("/{business_id}", response_model=BusinessSchema)
+async def delete_business(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str,
+) -> Any:
+    """
+    Delete business.
+    """
+    business = await db.scalar(select(Business).filter(Business.id == business_id))
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+
+    await db.delete(business)
+    await db.commit()
+    leaderboards.remove(business.id)
+    return business
+
+
+@router.post("/{business_id}/clicks", response_model=ClickBatchResult)
+async def ingest_clicks(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: UUID,
+    batch_in: ClickBatch,
+) -> Any:
+    """
+    Apply a batch of production and shipping clicks.
+
+    The whole batch is folded into the business and its orders in one
+    transaction. Clicks over the business's rate limit are dropped and
+    reported in the result.
+    """
+    outcome = await db.run_sync(apply_click_batch, business_id, batch_in.events)
+    if not outcome:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+    result = ClickBatchResult.model_validate(outcome, from_attributes=True)
+    events = progress_events(outcome.orders, outcome.completed, outcome.shipped, outcome.revenue)
+    await db.commit()
+    statistics_buffer.add(business_id, **outcome.statistics_deltas)
+    leaderboards.increment(business_id, outcome.leaderboard_deltas)
+    publish_business_events(business_id, events)
+    return result
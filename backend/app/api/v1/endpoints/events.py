@@ -0,0 +1,53 @@
+import asyncio
+from uuid import UUID
+
+from fastapi import APIRouter, WebSocket, status
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.core.pubsub import Subscription, event_broker
+from app.models.business import Business
+from app.services.business_events import business_channel
+
+router = APIRouter()
+
+
+async def _forward(websocket: WebSocket, subscription: Subscription) -> None:
+    while True:
+        await websocket.send_text(await subscription.get())
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # Clients only listen, anything they send is ignored
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/businesses/{business_id}")
+async def business_events(websocket: WebSocket, business_id: UUID) -> None:
+    """
+    Push a business's order, statistics and technology changes as they are
+    committed.
+
+    Each message is a JSON array of events, see app.services.business_events.
+    Clients load the business snapshot first and apply the events on top of it.
+    """
+    async with AsyncSessionLocal() as db:
+        exists = await db.scalar(select(Business.id).filter(Business.id == business_id))
+    if not exists:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Business not found")
+        return
+
+    # Subscribe before accepting so nothing committed after the handshake is missed
+    with event_broker.subscribe(business_channel(business_id)) as subscription:
+        await websocket.accept()
+        tasks = [
+            asyncio.create_task(_forward(websocket, subscription)),
+            asyncio.create_task(_wait_for_disconnect(websocket)),
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
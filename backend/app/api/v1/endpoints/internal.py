@@ -0,0 +1,35 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_active_superuser
+from app.core.database import async_engine, engine, get_pool_status
+from app.core.security import password_hasher
+from app.schemas.internal import PasswordHasherStatus, PoolStatus
+
+# Telemetry about this deployment is for operators only
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+@router.get("/pool", response_model=PoolStatus)
+def read_pool_status() -> Any:
+    """
+    Report connection pool usage and connection wait times (in seconds).
+    """
+    return get_pool_status(engine.pool)
+
+
+@router.get("/pool/async", response_model=PoolStatus)
+def read_async_pool_status() -> Any:
+    """
+    Report the async engine's pool usage and connection wait times (in seconds).
+    """
+    return get_pool_status(async_engine.pool)
+
+
+@router.get("/password-hasher", response_model=PasswordHasherStatus)
+def read_password_hasher_status() -> Any:
+    """
+    Report password hashing queue depth and call durations (in seconds).
+    """
+    return password_hasher.status()
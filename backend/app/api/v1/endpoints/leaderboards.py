@@ -0,0 +1,59 @@
+from typing import Any, List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.business import Business
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardKind
+from app.services.leaderboard import leaderboards
+
+router = APIRouter()
+
+
+@router.get("/{kind}", response_model=List[LeaderboardEntry])
+def read_leaderboard(
+    *,
+    db: Session = Depends(get_db),
+    kind: LeaderboardKind,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+) -> Any:
+    """
+    Retrieve the top businesses on a leaderboard.
+    """
+    entries = leaderboards.top(kind, limit, skip)
+    names = dict(
+        db.query(Business.id, Business.name)
+        .filter(Business.id.in_([business_id for _, business_id, _ in entries]))
+        .all()
+    ) if entries else {}
+    return [
+        {
+            "rank": rank,
+            "business_id": business_id,
+            "business_name": names.get(business_id),
+            "score": score,
+        }
+        for rank, business_id, score in entries
+    ]
+
+
+@router.get("/{kind}/businesses/{business_id}", response_model=LeaderboardEntry)
+def read_business_rank(
+    *,
+    kind: LeaderboardKind,
+    business_id: UUID,
+) -> Any:
+    """
+    Get a business's rank on a leaderboard.
+    """
+    ranked = leaderboards.rank(kind, business_id)
+    if not ranked:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not ranked",
+        )
+    rank, score = ranked
+    return {"rank": rank, "business_id": business_id, "score": score}
@@ -1,12 +1,38 @@
-from typing import Any, List
-from datetime import datetime, timedelta
+from typing import Any, List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.models.order import Order, OrderStatus
-from app.schemas.order import Order as OrderSchema, OrderCreate, OrderUpdate
+from app.core.pagination import paginate, set_next_cursor
+from app.core.responses import list_response
+from app.models.business import Business
+from app.models.order import Order, OrderArchive, OrderStatus
+from app.schemas.order import (
+    ArchivedOrder as ArchivedOrderSchema,
+    Order as OrderSchema,
+    OrderCreate,
+    OrderUpdate,
+    archived_order_list_adapter,
+    order_list_adapter,
+)
+from app.services.business_events import (
+    order_transition_events,
+    orders_created_events,
+    publish_business_events,
+)
+from app.services.leaderboard import leaderboards
+from app.services.order_export import ExportFormat, stream_orders
+from app.services.order_generation import (
+    insert_orders_statement,
+    random_orders,
+)
+from app.services.order_transitions import build_transition_statement, statistics_increments
+from app.services.statistics_buffer import statistics_buffer
 
 router = APIRouter()
 
@@ -15,15 +41,73 @@ router = APIRouter()
 def read_business_orders(
     *,
     db: Session = Depends(get_db),
+    response: Response,
     business_id: str,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
-    Retrieve orders for a business.
+    Retrieve orders for a business, oldest first. Orders that have been
+    archived are listed by the history endpoint instead.
+
+    Pass the X-Next-Cursor header of a full page as cursor to get the next
+    page; skip is ignored when a cursor is given.
     """
-    orders = db.query(Order).filter(Order.business_id == business_id).offset(skip).limit(limit).all()
-    return orders
+    query = db.query(Order).filter(Order.business_id == business_id)
+    orders = paginate(query, Order, cursor, skip, limit).all()
+    set_next_cursor(response, orders, limit)
+    return list_response(order_list_adapter, orders, response)
+
+
+@router.get("/business/{business_id}/history", response_model=List[ArchivedOrderSchema])
+def read_business_order_history(
+    *,
+    db: Session = Depends(get_db),
+    response: Response,
+    business_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve a business's archived orders, oldest first.
+
+    Orders are archived ORDER_ARCHIVE_AFTER_SECONDS after they ship or
+    expire; until then they are listed with the live orders. Pages work as
+    for the live orders.
+    """
+    query = db.query(OrderArchive).filter(OrderArchive.business_id == business_id)
+    orders = paginate(query, OrderArchive, cursor, skip, limit).all()
+    set_next_cursor(response, orders, limit)
+    return list_response(archived_order_list_adapter, orders, response)
+
+
+@router.get("/business/{business_id}/export", response_class=StreamingResponse)
+def export_business_orders(
+    *,
+    db: Session = Depends(get_db),
+    business_id: UUID,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+) -> Any:
+    """
+    Stream every order a business has had, live and archived, oldest first,
+    as NDJSON or CSV.
+
+    Rows are streamed from a server-side cursor as they are read, so memory
+    use does not grow with the number of orders.
+    """
+    if not db.query(Business.id).filter(Business.id == business_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+    filename = f"orders-{business_id}.{export_format.value}"
+    return StreamingResponse(
+        stream_orders(business_id, export_format),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.post("/business/{business_id}", response_model=OrderSchema)
@@ -48,13 +132,8 @@ def create_order(
     db.commit()
     db.refresh(order)
     
-    # Update statistics
-    from app.models.statistics import Statistics
-    statistics = db.query(Statistics).filter(Statistics.business_id == business_id).first()
-    if statistics:
-        statistics.orders_received += 1
-        db.add(statistics)
-        db.commit()
+    statistics_buffer.add(order.business_id, orders_received=1)
+    publish_business_events(order.business_id, orders_created_events([order]))
     
     return order
 
@@ -66,9 +145,11 @@ def read_order(
     order_id: str,
 ) -> Any:
     """
-    Get order by ID.
+    Get order by ID, from the archive once it has been archived.
     """
     order = db.query(Order).filter(Order.id == order_id).first()
+    if not order:
+        order = db.query(OrderArchive).filter(OrderArchive.id == order_id).first()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,99 +162,81 @@ def read_order(
 def update_order(
     *,
     db: Session = Depends(get_db),
-    order_id: str,
+    order_id: UUID,
     order_in: OrderUpdate,
 ) -> Any:
     """
     Update order status.
+
+    The status change and the resulting statistics and business updates are
+    applied in one statement. Returns 409 when the order already left the
+    expected status (e.g. two clients shipping the same order).
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    statement = build_transition_statement(
+        order_id, order_in.status, order_in.expected_status
+    )
+    order = db.execute(statement).first()
     if not order:
+        db.rollback()
+        if (
+            not db.query(Order.id).filter(Order.id == order_id).first()
+            and not db.query(OrderArchive.id).filter(OrderArchive.id == order_id).first()
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found",
+            )
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found",
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order status has already changed",
         )
-    
-    # Update order status
-    old_status = order.status
-    order.status = order_in.status
-    db.add(order)
     db.commit()
-    db.refresh(order)
-    
-    # Update statistics based on status change
-    from app.models.statistics import Statistics
-    statistics = db.query(Statistics).filter(Statistics.business_id == order.business_id).first()
-    if statistics and old_status != order_in.status:
-        if order_in.status == OrderStatus.COMPLETED:
-            statistics.products_created += 1
-        elif order_in.status == OrderStatus.SHIPPED:
-            statistics.orders_shipped += 1
-            # Update business money
-            from app.models.business import Business
-            business = db.query(Business).filter(Business.id == order.business_id).first()
-            if business:
-                business.currency += order.value
-                business.reputation = min(100, business.reputation + 1)
-                db.add(business)
-                statistics.total_revenue += order.value
-        elif order_in.status == OrderStatus.EXPIRED:
-            statistics.orders_expired += 1
-            # Update business reputation
-            from app.models.business import Business
-            business = db.query(Business).filter(Business.id == order.business_id).first()
-            if business:
-                business.reputation = max(0, business.reputation - 2)
-                db.add(business)
-        
-        db.add(statistics)
-        db.commit()
-    
+    statistics_buffer.add(order.business_id, **statistics_increments(order.status, order.value))
+    leaderboards.record_order_transition(order.business_id, order.status, order.value)
+    publish_business_events(
+        order.business_id, order_transition_events(order.id, order.status, order.value)
+    )
     return order
 
 
+def _generate_orders(db: Session, business_id: UUID, count: int) -> List[Row]:
+    business = db.query(Business).filter(Business.id == business_id).first()
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+
+    orders = db.execute(
+        insert_orders_statement(),
+        random_orders(business_id, business.product_type, count),
+    ).all()
+    db.commit()
+    statistics_buffer.add(business_id, orders_received=count)
+    publish_business_events(business_id, orders_created_events(orders))
+    return orders
+
+
 @router.post("/generate/{business_id}", response_model=OrderSchema)
 def generate_order(
     *,
     db: Session = Depends(get_db),
-    business_id: str,
+    business_id: UUID,
 ) -> Any:
     """
     Generate a random order for a business.
     """
-    from app.models.business import Business
-    import random
-    
-    business = db.query(Business).filter(Business.id == business_id).first()
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Business not found",
-        )
-    
-    # Generate random order
-    value = random.randint(50, 100)
-    complexity = random.randint(1, 3)
-    deadline = datetime.utcnow() + timedelta(minutes=random.randint(1, 3))
-    
-    order = Order(
-        business_id=business_id,
-        product_type=business.product_type,
-        value=value,
-        complexity=complexity,
-        deadline=deadline,
-        status=OrderStatus.PENDING,
-    )
-    db.add(order)
-    db.commit()
-    db.refresh(order)
-    
-    # Update statistics
-    from app.models.statistics import Statistics
-    statistics = db.query(Statistics).filter(Statistics.business_id == business_id).first()
-    if statistics:
-        statistics.orders_received += 1
-        db.add(statistics)
-        db.commit()
-    
-    return order
\ No newline at end of file
+    return _generate_orders(db, business_id, 1)[0]
+
+
+@router.post("/generate/{business_id}/batch", response_model=List[OrderSchema])
+def generate_orders(
+    *,
+    db: Session = Depends(get_db),
+    business_id: UUID,
+    count: int = Query(..., ge=1, le=settings.ORDER_BATCH_MAX),
+) -> Any:
+    """
+    Generate a batch of random orders for a business, in creation order.
+    """
+    return _generate_orders(db, business_id, count)
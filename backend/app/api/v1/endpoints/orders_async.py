@@ -0,0 +1,246 @@
+from typing import Any, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.pagination import paginate, set_next_cursor
+from app.core.responses import list_response
+from app.models.business import Business
+from app.models.order import Order, OrderArchive, OrderStatus
+from app.schemas.order import (
+    ArchivedOrder as ArchivedOrderSchema,
+    Order as OrderSchema,
+    OrderCreate,
+    OrderUpdate,
+    archived_order_list_adapter,
+    order_list_adapter,
+)
+from app.services.business_events import (
+    order_transition_events,
+    orders_created_events,
+    publish_business_events,
+)
+from app.services.leaderboard import leaderboards
+from app.services.order_export import ExportFormat, stream_orders_async
+from app.services.order_generation import (
+    insert_orders_statement,
+    random_orders,
+)
+from app.services.order_transitions import build_transition_statement, statistics_increments
+from app.services.statistics_buffer import statistics_buffer
+
+router = APIRouter()
+
+
+@router.get("/business/{business_id}", response_model=List[OrderSchema])
+async def read_business_orders(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    response: Response,
+    business_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve orders for a business, oldest first. Orders that have been
+    archived are listed by the history endpoint instead.
+
+    Pass the X-Next-Cursor header of a full page as cursor to get the next
+    page; skip is ignored when a cursor is given.
+    """
+    statement = select(Order).filter(Order.business_id == business_id)
+    result = await db.execute(paginate(statement, Order, cursor, skip, limit))
+    orders = result.scalars().all()
+    set_next_cursor(response, orders, limit)
+    return list_response(order_list_adapter, orders, response)
+
+
+@router.get("/business/{business_id}/history", response_model=List[ArchivedOrderSchema])
+async def read_business_order_history(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    response: Response,
+    business_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve a business's archived orders, oldest first.
+
+    Orders are archived ORDER_ARCHIVE_AFTER_SECONDS after they ship or
+    expire; until then they are listed with the live orders. Pages work as
+    for the live orders.
+    """
+    statement = select(OrderArchive).filter(OrderArchive.business_id == business_id)
+    result = await db.execute(paginate(statement, OrderArchive, cursor, skip, limit))
+    orders = result.scalars().all()
+    set_next_cursor(response, orders, limit)
+    return list_response(archived_order_list_adapter, orders, response)
+
+
+@router.get("/business/{business_id}/export", response_class=StreamingResponse)
+async def export_business_orders(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: UUID,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+) -> Any:
+    """
+    Stream every order a business has had, live and archived, oldest first,
+    as NDJSON or CSV.
+
+    Rows are streamed from a server-side cursor as they are read, so memory
+    use does not grow with the number of orders.
+    """
+    if not await db.scalar(select(Business.id).filter(Business.id == business_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+    filename = f"orders-{business_id}.{export_format.value}"
+    return StreamingResponse(
+        stream_orders_async(business_id, export_format),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/business/{business_id}", response_model=OrderSchema)
+async def create_order(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str,
+    order_in: OrderCreate,
+) -> Any:
+    """
+    Create new order for a business.
+    """
+    order = Order(
+        business_id=business_id,
+        product_type=order_in.product_type,
+        value=order_in.value,
+        complexity=order_in.complexity,
+        deadline=order_in.deadline,
+        status=OrderStatus.PENDING,
+    )
+    db.add(order)
+    await db.commit()
+    await db.refresh(order)
+
+    statistics_buffer.add(order.business_id, orders_received=1)
+    publish_business_events(order.business_id, orders_created_events([order]))
+
+    return order
+
+
+@router.get("/{order_id}", response_model=OrderSchema)
+async def read_order(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    order_id: str,
+) -> Any:
+    """
+    Get order by ID, from the archive once it has been archived.
+    """
+    order = await db.scalar(select(Order).filter(Order.id == order_id))
+    if not order:
+        order = await db.scalar(select(OrderArchive).filter(OrderArchive.id == order_id))
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found",
+        )
+    return order
+
+
+@router.put("/{order_id}", response_model=OrderSchema)
+async def update_order(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    order_id: UUID,
+    order_in: OrderUpdate,
+) -> Any:
+    """
+    Update order status.
+
+    The status change and the resulting statistics and business updates are
+    applied in one statement. Returns 409 when the order already left the
+    expected status (e.g. two clients shipping the same order).
+    """
+    statement = build_transition_statement(
+        order_id, order_in.status, order_in.expected_status
+    )
+    order = (await db.execute(statement)).first()
+    if not order:
+        await db.rollback()
+        if (
+            not await db.scalar(select(Order.id).filter(Order.id == order_id))
+            and not await db.scalar(select(OrderArchive.id).filter(OrderArchive.id == order_id))
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order status has already changed",
+        )
+    await db.commit()
+    statistics_buffer.add(order.business_id, **statistics_increments(order.status, order.value))
+    leaderboards.record_order_transition(order.business_id, order.status, order.value)
+    publish_business_events(
+        order.business_id, order_transition_events(order.id, order.status, order.value)
+    )
+    return order
+
+
+async def _generate_orders(db: AsyncSession, business_id: UUID, count: int) -> List[Row]:
+    business = await db.scalar(select(Business).filter(Business.id == business_id))
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+
+    orders = (
+        await db.execute(
+            insert_orders_statement(),
+            random_orders(business_id, business.product_type, count),
+        )
+    ).all()
+    await db.commit()
+    statistics_buffer.add(business_id, orders_received=count)
+    publish_business_events(business_id, orders_created_events(orders))
+    return orders
+
+
+@router.post("/generate/{business_id}", response_model=OrderSchema)
+async def generate_order(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: UUID,
+) -> Any:
+    """
+    Generate a random order for a business.
+    """
+    return (await _generate_orders(db, business_id, 1))[0]
+
+
+@router.post("/generate/{business_id}/batch", response_model=List[OrderSchema])
+async def generate_orders(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: UUID,
+    count: int = Query(..., ge=1, le=settings.ORDER_BATCH_MAX),
+) -> Any:
+    """
+    Generate a batch of random orders for a business, in creation order.
+    """
+    return await _generate_orders(db, business_id, count)
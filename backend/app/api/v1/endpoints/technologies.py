@@ -1,9 +1,12 @@
-from typing import Any, List
+from typing import Any, List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session, joinedload
 
 from app.core.database import get_db
+from app.core.pagination import paginate_sorted, set_next_cursor
+from app.core.responses import list_response
 from app.models.technology import Technology, BusinessTechnology
 from app.schemas.technology import (
     Technology as TechnologySchema,
@@ -11,21 +14,49 @@ from app.schemas.technology import (
     BusinessTechnology as BusinessTechnologySchema,
     BusinessTechnologyCreate,
     BusinessTechnologyUpdate,
+    business_technology_list_adapter,
 )
+from app.services.business_currency import build_debit_statement
+from app.services.business_events import publish_business_events, technology_events
+from app.services.statistics_buffer import statistics_buffer
+from app.services.technology_catalog import technology_catalog
 
 router = APIRouter()
 
 
+def _load_business_technology(db: Session, business_id: str, technology_id: UUID) -> BusinessTechnology:
+    """
+    Reload a business technology after commit together with its technology,
+    in one query rather than a refresh plus a lazy load.
+    """
+    return (
+        db.query(BusinessTechnology)
+        .options(joinedload(BusinessTechnology.technology))
+        .populate_existing()
+        .filter(
+            BusinessTechnology.business_id == business_id,
+            BusinessTechnology.technology_id == technology_id,
+        )
+        .one()
+    )
+
+
 @router.get("/", response_model=List[TechnologySchema])
 def read_technologies(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
-    Retrieve technologies.
+    Retrieve technologies, oldest first.
+
+    Pass the X-Next-Cursor header of a full page as cursor to get the next
+    page; skip is ignored when a cursor is given.
     """
-    technologies = db.query(Technology).offset(skip).limit(limit).all()
+    technologies = paginate_sorted(technology_catalog.all(db), cursor, skip, limit)
+    set_next_cursor(response, technologies, limit)
     return technologies
 
 
@@ -46,7 +77,9 @@ def create_technology(
         effect_value=technology_in.effect_value,
     )
     db.add(technology)
+    technology_catalog.bump_version(db)
     db.commit()
+    technology_catalog.invalidate()
     db.refresh(technology)
     return technology
 
@@ -62,14 +95,16 @@ def read_business_technologies(
     """
     Retrieve technologies for a business.
     """
+    # Load the nested technology in the same query instead of once per row
     business_technologies = (
         db.query(BusinessTechnology)
+        .options(joinedload(BusinessTechnology.technology))
         .filter(BusinessTechnology.business_id == business_id)
         .offset(skip)
         .limit(limit)
         .all()
     )
-    return business_technologies
+    return list_response(business_technology_list_adapter, business_technologies)
 
 
 @router.post("/business/{business_id}", response_model=BusinessTechnologySchema)
@@ -98,39 +133,30 @@ def purchase_technology(
         )
     
     # Get the technology
-    technology = db.query(Technology).filter(Technology.id == technology_in.technology_id).first()
+    technology = technology_catalog.get(db, technology_in.technology_id)
     if not technology:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Technology not found",
         )
     
-    # Check if business has enough money
+    # Check the business exists
     from app.models.business import Business
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = db.query(Business.id).filter(Business.id == business_id).first()
     if not business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Business not found",
         )
     
-    if business.currency < technology.base_cost:
+    # Deduct money from business, if it still has enough
+    debited = db.scalar(build_debit_statement(business_id, technology.base_cost))
+    if debited is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Not enough money to purchase this technology",
         )
     
-    # Deduct money from business
-    business.currency -= technology.base_cost
-    db.add(business)
-    
-    # Update statistics
-    from app.models.statistics import Statistics
-    statistics = db.query(Statistics).filter(Statistics.business_id == business_id).first()
-    if statistics:
-        statistics.total_spent += technology.base_cost
-        db.add(statistics)
-    
     # Create business technology
     business_technology = BusinessTechnology(
         business_id=business_id,
@@ -139,8 +165,12 @@ def purchase_technology(
     )
     db.add(business_technology)
     db.commit()
-    db.refresh(business_technology)
-    return business_technology
+    statistics_buffer.add(business_id, total_spent=technology.base_cost)
+    publish_business_events(
+        business_id,
+        technology_events(technology_in.technology_id, technology_in.level, technology.base_cost),
+    )
+    return _load_business_technology(db, business_id, technology_in.technology_id)
 
 
 @router.put("/business/{business_id}/{technology_id}", response_model=BusinessTechnologySchema)
@@ -148,7 +178,7 @@ def upgrade_technology(
     *,
     db: Session = Depends(get_db),
     business_id: str,
-    technology_id: str,
+    technology_id: UUID,
     upgrade_in: BusinessTechnologyUpdate,
 ) -> Any:
     """
@@ -170,7 +200,7 @@ def upgrade_technology(
         )
     
     # Get the technology
-    technology = db.query(Technology).filter(Technology.id == technology_id).first()
+    technology = technology_catalog.get(db, technology_id)
     if not technology:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -180,35 +210,27 @@ def upgrade_technology(
     # Calculate upgrade cost
     upgrade_cost = technology.base_cost * business_technology.level
     
-    # Check if business has enough money
+    # Check the business exists
     from app.models.business import Business
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = db.query(Business.id).filter(Business.id == business_id).first()
     if not business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Business not found",
         )
     
-    if business.currency < upgrade_cost:
+    # Deduct money from business, if it still has enough
+    debited = db.scalar(build_debit_statement(business_id, upgrade_cost))
+    if debited is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Not enough money to upgrade this technology",
         )
     
-    # Deduct money from business
-    business.currency -= upgrade_cost
-    db.add(business)
-    
-    # Update statistics
-    from app.models.statistics import Statistics
-    statistics = db.query(Statistics).filter(Statistics.business_id == business_id).first()
-    if statistics:
-        statistics.total_spent += upgrade_cost
-        db.add(statistics)
-    
     # Update business technology
     business_technology.level = upgrade_in.level
     db.add(business_technology)
     db.commit()
-    db.refresh(business_technology)
-    return business_technology
\ No newline at end of file
+    statistics_buffer.add(business_id, total_spent=upgrade_cost)
+    publish_business_events(business_id, technology_events(technology_id, upgrade_in.level, upgrade_cost))
+    return _load_business_technology(db, business_id, technology_id)
\ No newline at end of file
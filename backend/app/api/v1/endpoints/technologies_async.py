@@ -0,0 +1,220 @@
+from typing import Any, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.database import get_async_db
+from app.core.pagination import paginate_sorted, set_next_cursor
+from app.core.responses import list_response
+from app.models.business import Business
+from app.models.technology import Technology, BusinessTechnology
+from app.schemas.technology import (
+    Technology as TechnologySchema,
+    TechnologyCreate,
+    BusinessTechnology as BusinessTechnologySchema,
+    BusinessTechnologyCreate,
+    BusinessTechnologyUpdate,
+    business_technology_list_adapter,
+)
+from app.services.business_currency import build_debit_statement
+from app.services.business_events import publish_business_events, technology_events
+from app.services.statistics_buffer import statistics_buffer
+from app.services.technology_catalog import technology_catalog
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[TechnologySchema])
+async def read_technologies(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve technologies, oldest first.
+
+    Pass the X-Next-Cursor header of a full page as cursor to get the next
+    page; skip is ignored when a cursor is given.
+    """
+    technologies = paginate_sorted(await db.run_sync(technology_catalog.all), cursor, skip, limit)
+    set_next_cursor(response, technologies, limit)
+    return technologies
+
+
+@router.post("/", response_model=TechnologySchema)
+async def create_technology(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    technology_in: TechnologyCreate,
+) -> Any:
+    """
+    Create new technology.
+    """
+    technology = Technology(
+        name=technology_in.name,
+        description=technology_in.description,
+        type=technology_in.type,
+        base_cost=technology_in.base_cost,
+        effect_value=technology_in.effect_value,
+    )
+    db.add(technology)
+    await db.run_sync(technology_catalog.bump_version)
+    await db.commit()
+    technology_catalog.invalidate()
+    await db.refresh(technology)
+    return technology
+
+
+@router.get("/business/{business_id}", response_model=List[BusinessTechnologySchema])
+async def read_business_technologies(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str,
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve technologies for a business.
+    """
+    # The async session cannot lazy load, so the nested technology is
+    # loaded up front, in the same query.
+    result = await db.execute(
+        select(BusinessTechnology)
+        .options(joinedload(BusinessTechnology.technology))
+        .filter(BusinessTechnology.business_id == business_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return list_response(business_technology_list_adapter, result.scalars().all())
+
+
+@router.post("/business/{business_id}", response_model=BusinessTechnologySchema)
+async def purchase_technology(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str,
+    technology_in: BusinessTechnologyCreate,
+) -> Any:
+    """
+    Purchase a technology for a business.
+    """
+    # Check if business already has this technology
+    existing = await db.scalar(
+        select(BusinessTechnology).filter(
+            BusinessTechnology.business_id == business_id,
+            BusinessTechnology.technology_id == technology_in.technology_id,
+        )
+    )
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Business already has this technology",
+        )
+
+    # Get the technology
+    technology = await db.run_sync(technology_catalog.get, technology_in.technology_id)
+    if not technology:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Technology not found",
+        )
+
+    # Check the business exists
+    business = await db.scalar(select(Business.id).filter(Business.id == business_id))
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+
+    # Deduct money from business, if it still has enough
+    debited = await db.scalar(build_debit_statement(business_id, technology.base_cost))
+    if debited is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Not enough money to purchase this technology",
+        )
+
+    # Create business technology
+    business_technology = BusinessTechnology(
+        business_id=business_id,
+        technology_id=technology_in.technology_id,
+        level=technology_in.level,
+    )
+    db.add(business_technology)
+    await db.commit()
+    statistics_buffer.add(business_id, total_spent=technology.base_cost)
+    publish_business_events(
+        business_id,
+        technology_events(technology_in.technology_id, technology_in.level, technology.base_cost),
+    )
+    await db.refresh(business_technology, ["technology"])
+    return business_technology
+
+
+@router.put("/business/{business_id}/{technology_id}", response_model=BusinessTechnologySchema)
+async def upgrade_technology(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str,
+    technology_id: UUID,
+    upgrade_in: BusinessTechnologyUpdate,
+) -> Any:
+    """
+    Upgrade a technology for a business.
+    """
+    # Get the business technology
+    business_technology = await db.scalar(
+        select(BusinessTechnology)
+        .options(joinedload(BusinessTechnology.technology))
+        .filter(
+            BusinessTechnology.business_id == business_id,
+            BusinessTechnology.technology_id == technology_id,
+        )
+    )
+    if not business_technology:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business technology not found",
+        )
+
+    # Get the technology
+    technology = await db.run_sync(technology_catalog.get, technology_id)
+    if not technology:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Technology not found",
+        )
+
+    # Calculate upgrade cost
+    upgrade_cost = technology.base_cost * business_technology.level
+
+    # Check the business exists
+    business = await db.scalar(select(Business.id).filter(Business.id == business_id))
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found",
+        )
+
+    # Deduct money from business, if it still has enough
+    debited = await db.scalar(build_debit_statement(business_id, upgrade_cost))
+    if debited is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Not enough money to upgrade this technology",
+        )
+
+    # Update business technology
+    business_technology.level = upgrade_in.level
+    db.add(business_technology)
+    await db.commit()
+    statistics_buffer.add(business_id, total_spent=upgrade_cost)
+    publish_business_events(business_id, technology_events(technology_id, upgrade_in.level, upgrade_cost))
+    # Nothing is expired on commit and the technology was loaded up front
+    return business_technology
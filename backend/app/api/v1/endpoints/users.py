@@ -1,31 +1,59 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import principal_cache
 from app.core.database import get_db
-from app.core.security import get_password_hash
+from app.core.pagination import paginate, set_next_cursor
+from app.core.responses import list_response
+from app.core.security import get_password_hash_async
 from app.models.user import User
-from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.schemas.user import User as UserSchema, UserCreate, UserUpdate, user_list_adapter
 
+# Handlers that hash passwords are async, so they wait on the password
+# hasher without holding threadpool threads. Their database calls still run
+# in the threadpool.
 router = APIRouter()
 
 
+def _get_user(db: Session, **filters: Any) -> Optional[User]:
+    user = db.query(User).filter_by(**filters).first()
+    # Hand the connection back to the pool while the caller hashes a password.
+    # The user stays loaded, detached; _save_user attaches it again.
+    db.close()
+    return user
+
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 @router.get("/", response_model=List[UserSchema])
 def read_users(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
-    Retrieve users.
+    Retrieve users, oldest first.
+
+    Pass the X-Next-Cursor header of a full page as cursor to get the next
+    page; skip is ignored when a cursor is given.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    users = paginate(db.query(User), User, cursor, skip, limit).all()
+    set_next_cursor(response, users, limit)
+    return list_response(user_list_adapter, users, response)
 
 
 @router.post("/", response_model=UserSchema)
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
@@ -33,7 +61,7 @@ def create_user(
     """
     Create new user.
     """
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await run_in_threadpool(_get_user, db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,13 +70,10 @@ def create_user(
     
     user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         is_superuser=user_in.is_superuser,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await run_in_threadpool(_save_user, db, user)
 
 
 @router.get("/{user_id}", response_model=UserSchema)
@@ -70,7 +95,7 @@ def read_user(
 
 
 @router.put("/{user_id}", response_model=UserSchema)
-def update_user(
+async def update_user(
     *,
     db: Session = Depends(get_db),
     user_id: str,
@@ -79,7 +104,7 @@ def update_user(
     """
     Update user.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await run_in_threadpool(_get_user, db, id=user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -88,16 +113,15 @@ def update_user(
     
     update_data = user_in.dict(exclude_unset=True)
     if update_data.get("password"):
-        hashed_password = get_password_hash(update_data["password"])
+        hashed_password = await get_password_hash_async(update_data["password"])
         del update_data["password"]
         update_data["hashed_password"] = hashed_password
     
     for field, value in update_data.items():
         setattr(user, field, value)
     
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    user = await run_in_threadpool(_save_user, db, user)
+    principal_cache.invalidate_user(user.id)
     return user
 
 
@@ -119,4 +143,5 @@ def delete_user(
     
     db.delete(user)
     db.commit()
+    principal_cache.invalidate_user(user.id)
     return user
\ No newline at end of file
@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional, Union
 
 from pydantic import AnyHttpUrl, PostgresDsn, validator
 from pydantic_settings import BaseSettings
+from sqlalchemy.engine import make_url
 
 
 class Settings(BaseSettings):
@@ -11,6 +12,19 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # bcrypt cost factor. Stored hashes with a different cost are rehashed the
+    # next time their user logs in.
+    BCRYPT_ROUNDS: int = 12
+    # Worker processes for password hashing (0 hashes in the calling thread),
+    # and how many hash/verify calls may be queued or running at once before
+    # new ones are rejected with 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # Verified access tokens are cached per worker for up to
+    # AUTH_CACHE_TTL_SECONDS (0 disables the cache). An entry costs well under
+    # 1 KB, so the default bound keeps the cache to a few megabytes.
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
     # BACKEND_CORS_ORIGINS is a JSON-formatted list of origins
     # e.g: '["http://localhost", "http://localhost:4200", "http://localhost:3000"]'
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = [
@@ -60,6 +74,107 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    # Connection pool configuration
+    # Size these against the number of uvicorn workers: every worker gets its
+    # own pool, so the database sees up to
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a connection before giving up
+    DB_POOL_TIMEOUT: float = 30.0
+    # Seconds after which a connection is recycled (-1 disables recycling)
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Serve the orders, businesses and technologies routers from the async
+    # (asyncpg) session instead of the threadpool-bound sync session
+    DB_ASYNC_ENDPOINTS: bool = False
+    ASYNC_SQLALCHEMY_DATABASE_URI: Optional[str] = None
+
+    @validator("ASYNC_SQLALCHEMY_DATABASE_URI", pre=True)
+    def assemble_async_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        if isinstance(v, str):
+            return v
+        url = make_url(str(values.get("SQLALCHEMY_DATABASE_URI"))).set(drivername="postgresql+asyncpg")
+        # asyncpg rejects libpq's sslmode but takes the same modes as ssl
+        sslmode = url.query.get("sslmode")
+        if sslmode is not None:
+            url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+        return url.render_as_string(hide_password=False)
+
+    # Encode responses with orjson, and serialize list endpoints straight to
+    # JSON with pre-built TypeAdapters (requires orjson)
+    FAST_JSON_RESPONSES: bool = False
+
+    # Upper bound for POST /orders/generate/{business_id}/batch?count=N
+    ORDER_BATCH_MAX: int = 100
+
+    # Server-side order expiry. Each sweep expires at most
+    # ORDER_EXPIRY_SWEEP_BATCH_SIZE orders per transaction.
+    ORDER_EXPIRY_SWEEPER_ENABLED: bool = True
+    ORDER_EXPIRY_SWEEP_INTERVAL_SECONDS: float = 5.0
+    ORDER_EXPIRY_SWEEP_BATCH_SIZE: int = 500
+
+    # Shipped and expired orders are moved to the order archive once they
+    # have been finished for ORDER_ARCHIVE_AFTER_SECONDS, at most
+    # ORDER_ARCHIVE_BATCH_SIZE per transaction.
+    ORDER_ARCHIVE_ENABLED: bool = True
+    ORDER_ARCHIVE_INTERVAL_SECONDS: float = 30.0
+    ORDER_ARCHIVE_AFTER_SECONDS: float = 300.0
+    ORDER_ARCHIVE_BATCH_SIZE: int = 1000
+
+    # Rows fetched from the server-side cursor and written per chunk of an
+    # order export
+    ORDER_EXPORT_BATCH_SIZE: int = 1000
+
+    # How often a worker checks whether the cached technology catalog changed
+    TECHNOLOGY_CATALOG_POLL_SECONDS: float = 1.0
+
+    # How often each worker folds other workers' statistics into its leaderboards
+    LEADERBOARD_SYNC_SECONDS: float = 5.0
+
+    # Click batches. Each business may credit at most CLICK_RATE_LIMIT_PER_SECOND
+    # clicks per second, and can bank at most CLICK_RATE_WINDOW_SECONDS of
+    # unused budget while idle.
+    CLICK_RATE_LIMIT_PER_SECOND: float = 20.0
+    CLICK_RATE_WINDOW_SECONDS: float = 2.0
+    CLICK_BATCH_MAX_EVENTS: int = 200
+
+    # Server-side simulation of automation technologies. Every tick advances
+    # automated businesses in transactions of at most SIMULATION_BATCH_SIZE.
+    SIMULATION_ENABLED: bool = True
+    SIMULATION_TICK_SECONDS: float = 1.0
+    SIMULATION_BATCH_SIZE: int = 1000
+
+    # Offline progress. Reading a business whose player has been away for at
+    # least OFFLINE_PROGRESS_MIN_SECONDS credits what its automation would have
+    # done meanwhile, with an order arriving every OFFLINE_ORDER_INTERVAL_SECONDS.
+    OFFLINE_PROGRESS_MIN_SECONDS: float = 300.0
+    OFFLINE_ORDER_INTERVAL_SECONDS: float = 30.0
+
+    # Business event push. EVENT_BROKER is "local" for a single worker, or
+    # "postgres" to fan events out across workers with LISTEN/NOTIFY. A
+    # WebSocket that falls EVENT_QUEUE_SIZE messages behind is told to resync.
+    EVENT_BROKER: str = "local"
+    EVENT_QUEUE_SIZE: int = 256
+
+    # Statistics counters are buffered per worker and written every
+    # STATISTICS_FLUSH_SECONDS with one statement, and once more on shutdown
+    STATISTICS_FLUSH_SECONDS: float = 0.5
+
+    # Statistics history. Flushed increments are added to per-minute buckets,
+    # which are rolled up into hour and day buckets every
+    # STATISTICS_ROLLUP_SECONDS. Minute buckets must be kept for at least an
+    # hour and hour buckets for at least a day; day buckets are never dropped.
+    STATISTICS_ROLLUP_SECONDS: float = 60.0
+    STATISTICS_MINUTE_RETENTION_HOURS: float = 48.0
+    STATISTICS_HOUR_RETENTION_DAYS: float = 90.0
+    STATISTICS_SERIES_MAX_POINTS: int = 1440
+
+    # Per-route request latency and SQL metrics, served at /metrics in the
+    # Prometheus text format
+    METRICS_ENABLED: bool = True
+
     class Config:
         case_sensitive = True
         env_file = ".env"
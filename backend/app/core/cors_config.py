@@ -1,5 +1,6 @@
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
 
 def setup_cors(app):
     """Configure CORS for the application."""
@@ -9,4 +10,5 @@ def setup_cors(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
\ No newline at end of file
@@ -1,12 +1,74 @@
+import time
+from typing import Any, Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.metrics import Counter, Histogram
+
+
+class _PoolWaitTimeMixin:
+    """Records how long callers wait for a connection from a queue pool."""
+
+    wait_time: Histogram
+    timeouts: Counter
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts.inc()
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_PoolWaitTimeMixin, QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    wait_time = Histogram()
+    timeouts = Counter()
+
+
+class InstrumentedAsyncQueuePool(_PoolWaitTimeMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long callers wait for a connection."""
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    wait_time = Histogram()
+    timeouts = Counter()
+
+
+_pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **_pool_options,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async engine only connects on first use, so creating it is free when
+# DB_ASYNC_ENDPOINTS is off.
+async_engine: AsyncEngine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_DATABASE_URI,
+    poolclass=InstrumentedAsyncQueuePool,
+    **_pool_options,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 # Dependency
@@ -15,4 +77,23 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_pool_status(pool: QueuePool) -> Dict[str, Any]:
+    """Report the current state of an instrumented connection pool."""
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # QueuePool.overflow() goes negative while the core pool is not full
+        "overflow": max(0, pool.overflow()),
+        "timeouts": int(pool.timeouts.value),
+        "wait_time": pool.wait_time.snapshot(),
+    }
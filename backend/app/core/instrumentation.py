@@ -0,0 +1,176 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    Counter,
+    HistogramFamily,
+    prometheus_header,
+    prometheus_histogram,
+    prometheus_sample,
+)
+
+# Buckets for the number of statements a request runs
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Requests that matched no route share one label, so unknown paths cannot
+# grow the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+request_duration = HistogramFamily(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ("method", "route", "status"),
+)
+request_statements = HistogramFamily(
+    "http_request_db_statements",
+    "SQL statements executed per HTTP request.",
+    ("method", "route"),
+    STATEMENT_BUCKETS,
+)
+request_db_duration = HistogramFamily(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL statements per HTTP request.",
+    ("method", "route"),
+)
+# Every statement, including those run by background tasks
+db_statements = Counter()
+db_duration = Counter()
+
+
+@dataclass
+class RequestStats:
+    """SQL executed on behalf of one request."""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+# Copied into the threadpool and run_sync greenlets, so statements run for a
+# request are counted against it wherever they execute
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info["statement_started_at"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.pop("statement_started_at", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    db_statements.inc()
+    db_duration.inc(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count the statements run on engine and the time spent in them."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """
+    Record each HTTP request's latency and the SQL it ran, labelled by the
+    route's path template rather than the requested path.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            # The router fills in the matched route as the request passes through
+            route = scope.get("route")
+            path = route.path if route is not None else UNMATCHED_ROUTE
+            method = scope["method"]
+            request_duration.labels(method, path, str(status_code)).observe(elapsed)
+            request_statements.labels(method, path).observe(stats.statements)
+            request_db_duration.labels(method, path).observe(stats.db_seconds)
+
+
+def _scalar(name: str, documentation: str, kind: str, samples: List[Tuple[Dict[str, Any], float]]) -> List[str]:
+    lines = prometheus_header(name, documentation, kind)
+    lines += [prometheus_sample(name, labels, value) for labels, value in samples]
+    return lines
+
+
+def render_metrics() -> str:
+    """
+    Render request, SQL, connection pool and password hashing metrics in the
+    Prometheus text exposition format.
+    """
+    from app.core.database import async_engine, engine, get_pool_status
+    from app.core.security import password_hasher
+
+    lines: List[str] = []
+    for family in (request_duration, request_statements, request_db_duration):
+        lines += family.render()
+    lines += _scalar("db_statements_total", "SQL statements executed.", "counter", [({}, db_statements.value)])
+    lines += _scalar(
+        "db_statement_duration_seconds_total",
+        "Time spent executing SQL statements.",
+        "counter",
+        [({}, db_duration.value)],
+    )
+
+    pools = [({"pool": "sync"}, get_pool_status(engine.pool)), ({"pool": "async"}, get_pool_status(async_engine.pool))]
+    for key, documentation in (
+        ("checked_out", "Connections checked out of the pool."),
+        ("idle", "Idle connections in the pool."),
+        ("overflow", "Connections open beyond the pool size."),
+    ):
+        lines += _scalar(f"db_pool_{key}", documentation, "gauge", [(labels, pool[key]) for labels, pool in pools])
+    lines += _scalar(
+        "db_pool_timeouts_total",
+        "Connection checkouts that timed out.",
+        "counter",
+        [(labels, pool["timeouts"]) for labels, pool in pools],
+    )
+    lines += prometheus_header("db_pool_wait_seconds", "Time spent waiting for a connection.", "histogram")
+    for labels, pool in pools:
+        lines += prometheus_histogram("db_pool_wait_seconds", labels, pool["wait_time"])
+
+    hasher = password_hasher.status()
+    lines += _scalar("password_hash_pending", "Password operations queued or running.", "gauge", [({}, hasher["pending"])])
+    lines += _scalar(
+        "password_hash_rejected_total",
+        "Password operations rejected while the hasher was busy.",
+        "counter",
+        [({}, hasher["rejected"])],
+    )
+    lines += prometheus_header("password_hash_duration_seconds", "Time spent hashing and verifying passwords.", "histogram")
+    lines += prometheus_histogram("password_hash_duration_seconds", {}, hasher["duration"])
+    return "\n".join(lines) + "\n"
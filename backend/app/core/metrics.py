@@ -0,0 +1,124 @@
+import bisect
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return cumulative bucket counts, total count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative: List[Dict[str, Any]] = []
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative.append({"le": bound, "count": running})
+        running += counts[-1]
+        cumulative.append({"le": "+Inf", "count": running})
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+    def reset(self) -> None:
+        """Clear all observations."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class HistogramFamily:
+    """Histograms of one metric keyed by label values, created on first use."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Histogram:
+        """Return the histogram for these label values."""
+        histogram = self._histograms.get(values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(values, Histogram(self.buckets))
+        return histogram
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines for every histogram in the family."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        lines = prometheus_header(self.name, self.documentation, "histogram")
+        for values, histogram in histograms:
+            lines += prometheus_histogram(
+                self.name, dict(zip(self.label_names, values)), histogram.snapshot()
+            )
+        return lines
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def prometheus_header(name: str, documentation: str, kind: str) -> List[str]:
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+
+
+def prometheus_sample(name: str, labels: Dict[str, Any], value: float) -> str:
+    return f"{name}{_labels(labels)} {value}"
+
+
+def prometheus_histogram(name: str, labels: Dict[str, Any], snapshot: Dict[str, Any]) -> List[str]:
+    """Render a Histogram.snapshot() as Prometheus bucket, sum and count samples."""
+    lines = [
+        prometheus_sample(f"{name}_bucket", {**labels, "le": bucket["le"]}, bucket["count"])
+        for bucket in snapshot["buckets"]
+    ]
+    lines.append(prometheus_sample(f"{name}_sum", labels, snapshot["sum"]))
+    lines.append(prometheus_sample(f"{name}_count", labels, snapshot["count"]))
+    return lines
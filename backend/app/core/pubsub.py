@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Set, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sent in place of the dropped messages when a subscriber falls behind
+RESYNC = '[{"t":"resync"}]'
+
+# Postgres channel every worker listens on, and its payload size limit
+NOTIFY_CHANNEL = "clickship_events"
+NOTIFY_PAYLOAD_LIMIT = 8000
+
+# How long to wait before reconnecting a lost LISTEN connection
+LISTEN_RETRY_SECONDS = 1.0
+
+
+class Subscription:
+    """A bounded queue of messages, read on the event loop that created it."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def _put(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A slow reader re-reads its state instead of getting a gap
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    def deliver(self, message: str) -> None:
+        """Queue message. Safe from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The subscriber's loop has already shut down
+            pass
+
+    async def get(self) -> str:
+        """Wait for the next message."""
+        return await self.queue.get()
+
+
+class LocalBroker:
+    """Fans messages out to subscribers in this process."""
+
+    def __init__(self, queue_size: int = settings.EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def subscribe(self, channel: str) -> Iterator[Subscription]:
+        """
+        Receive the messages published to channel while the block runs. Must
+        be entered on the event loop that reads the subscription.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscriptions = self._subscriptions[channel]
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[channel]
+
+    def deliver(self, channel: str, message: str) -> None:
+        """Hand message to this process's subscribers of channel."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+    def publish_many(self, messages: Iterable[Tuple[str, str]]) -> None:
+        """Publish ``(channel, message)`` pairs. Safe from any thread."""
+        for channel, message in messages:
+            self.deliver(channel, message)
+
+    def publish(self, channel: str, message: str) -> None:
+        """Publish message to every subscriber of channel."""
+        self.publish_many([(channel, message)])
+
+    async def run(self) -> None:
+        """Relay messages from other workers until cancelled."""
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Relays messages between workers through Postgres LISTEN/NOTIFY.
+
+    Every worker listens on NOTIFY_CHANNEL and delivers what it hears to its
+    own subscribers, including what it published itself. Messages over the
+    payload limit are replaced by a resync. NOTIFYs are sent one batch at a
+    time from a single thread, so they go out in the order they were published.
+    """
+
+    def __init__(self, queue_size: int = settings.EVENT_QUEUE_SIZE):
+        super().__init__(queue_size)
+        self._notifier = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-notify")
+
+    def publish_many(self, messages: Iterable[Tuple[str, str]]) -> None:
+        payloads = []
+        for channel, message in messages:
+            payload = f"{channel} {message}"
+            if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+                payload = f"{channel} {RESYNC}"
+            payloads.append({"channel": NOTIFY_CHANNEL, "payload": payload})
+        if not payloads:
+            return
+        future = self._notifier.submit(self._notify, payloads)
+        future.add_done_callback(lambda _: self._log_failure(future, len(payloads)))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Threads wait for their NOTIFY; the event loop never blocks on a
+            # database round trip
+            wait([future])
+
+    def _notify(self, payloads: list) -> None:
+        from app.core.database import engine
+
+        with engine.begin() as connection:
+            connection.execute(text("SELECT pg_notify(:channel, :payload)"), payloads)
+
+    @staticmethod
+    def _log_failure(future: Future, count: int) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Failed to publish {count} events", exc_info=error)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        channel, _, message = payload.partition(" ")
+        self.deliver(channel, message)
+
+    async def run(self) -> None:
+        """Listen on NOTIFY_CHANNEL until cancelled, reconnecting when the connection drops."""
+        from app.core.database import async_engine
+
+        while True:
+            try:
+                async with async_engine.connect() as connection:
+                    driver_connection = (await connection.get_raw_connection()).driver_connection
+                    lost = asyncio.Event()
+                    driver_connection.add_termination_listener(lambda _: lost.set())
+                    await driver_connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                    try:
+                        await lost.wait()
+                    finally:
+                        if not driver_connection.is_closed():
+                            await driver_connection.remove_listener(NOTIFY_CHANNEL, self._on_notify)
+                    await connection.invalidate()
+            except Exception:
+                logger.exception("Event listener connection failed")
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+
+BROKERS = {"local": LocalBroker, "postgres": PostgresBroker}
+
+if settings.EVENT_BROKER not in BROKERS:
+    raise ValueError(f"Unknown EVENT_BROKER {settings.EVENT_BROKER!r}, expected one of {sorted(BROKERS)}")
+
+event_broker: LocalBroker = BROKERS[settings.EVENT_BROKER]()
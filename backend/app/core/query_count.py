@@ -0,0 +1,65 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Count statements executed on a set of engines."""
+
+    def __init__(self, engines: Iterable[Engine], record: bool = False):
+        self.engines = list(engines)
+        self.count = 0
+        # Statement text is only kept on request; long runs would grow it without bound
+        self.statements: Optional[List[str]] = [] if record else None
+        self._lock = threading.Lock()
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, *args) -> None:
+        with self._lock:
+            self.count += 1
+            if self.statements is not None:
+                self.statements.append(statement)
+
+    def close(self) -> None:
+        """Stop counting."""
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+
+
+def _default_engines() -> List[Engine]:
+    from app.core.database import async_engine, engine
+
+    return [engine, async_engine.sync_engine]
+
+
+@contextmanager
+def count_queries(*engines: Engine) -> Iterator[QueryCounter]:
+    """
+    Count statements executed inside the block, on both application engines
+    unless others are given.
+    """
+    counter = QueryCounter(engines or _default_engines(), record=True)
+    try:
+        yield counter
+    finally:
+        counter.close()
+
+
+@contextmanager
+def assert_query_count(expected: int, *engines: Engine) -> Iterator[QueryCounter]:
+    """
+    Fail with the executed statements unless the block runs exactly
+    ``expected`` of them, e.g.::
+
+        with assert_query_count(1):
+            client.get(f"/api/v1/technologies/business/{business_id}")
+    """
+    with count_queries(*engines) as counter:
+        yield counter
+    if counter.count != expected:
+        statements = "\n".join(f"  {statement}" for statement in counter.statements)
+        raise AssertionError(f"Expected {expected} queries, {counter.count} were executed:\n{statements}")
@@ -0,0 +1,49 @@
+from typing import Any, Iterable, Optional, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """Response class used for every endpoint that does not pick its own."""
+    if settings.FAST_JSON_RESPONSES:
+        return ORJSONResponse
+    return JSONResponse
+
+
+def list_response(adapter: TypeAdapter, items: Iterable[Any], response: Optional[Response] = None) -> Any:
+    """
+    Serialize a list endpoint's ORM objects straight to JSON.
+
+    FastAPI validates response_model content into schema instances, dumps
+    them to Python primitives and then JSON-encodes those. With
+    FAST_JSON_RESPONSES on, the pre-built adapter reads the ORM attributes
+    and writes JSON bytes in one pass in pydantic-core. Otherwise the items
+    are returned unchanged for FastAPI to serialize as usual.
+
+    Pass the endpoint's injected response to keep headers set on it.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return items
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(items, from_attributes=True)),
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None,
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag, comparing weakly."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a conditional GET that matched etag."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
@@ -1,12 +1,26 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import Histogram
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes whose cost differs from BCRYPT_ROUNDS are flagged for rehashing
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 ALGORITHM = "HS256"
 
@@ -28,15 +42,182 @@ def create_access_token(
     return encoded_jwt
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when too many password operations are already queued."""
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Run bcrypt in a bounded pool of worker processes.
+
+    bcrypt is CPU bound and holds the GIL, so hashing in the server process
+    stalls every other request on the worker. At most ``max_pending`` calls
+    may be queued or running; beyond that, calls fail fast with
+    PasswordHasherBusy instead of growing an unbounded backlog. With
+    ``workers=0`` calls run in the calling thread, under the same limit.
+    When a worker process dies, the calls it took down fail and the next
+    call starts a fresh pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self.duration = Histogram()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker process."""
+        return max(0, self.pending - self.workers)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # forkserver avoids forking a process that is running threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return self._executor
+
+    def _reserve(self) -> float:
+        # The caller holds self._lock
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        self.pending += 1
+        return time.perf_counter()
+
+    def _release(self, started: float) -> None:
+        self.duration.observe(time.perf_counter() - started)
+        with self._lock:
+            self.pending -= 1
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        # A pool whose worker died rejects every call; the next one starts a new pool
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _done(self, future: Future, executor: ProcessPoolExecutor, started: float) -> None:
+        self._release(started)
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._discard(executor)
+
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        with self._lock:
+            started = self._reserve()
+            try:
+                executor = self._get_executor()
+                try:
+                    future = executor.submit(fn, *args)
+                except BrokenProcessPool:
+                    executor.shutdown(wait=False)
+                    self._executor = None
+                    executor = self._get_executor()
+                    future = executor.submit(fn, *args)
+            except BaseException:
+                self.pending -= 1
+                raise
+        future.add_done_callback(lambda _: self._done(future, executor, started))
+        return future
+
+    def _run_inline(self, fn: Callable, *args: Any) -> Any:
+        with self._lock:
+            started = self._reserve()
+        try:
+            return fn(*args)
+        finally:
+            self._release(started)
+
+    def _run(self, fn: Callable, *args: Any) -> Any:
+        if not self.workers:
+            return self._run_inline(fn, *args)
+        return self._submit(fn, *args).result()
+
+    async def _run_async(self, fn: Callable, *args: Any) -> Any:
+        if not self.workers:
+            return await asyncio.to_thread(self._run_inline, fn, *args)
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return self._run(_verify_and_update, plain_password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash, password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await self._run_async(_verify_and_update, plain_password, hashed_password)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "duration": self.duration.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify_and_update(plain_password, hashed_password)[0]
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password against a hash. Also returns a replacement hash when
+    the stored one does not use the configured bcrypt cost.
+    """
+    return password_hasher.verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Hash a password.
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return password_hasher.hash(password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Async variant of verify_and_update_password.
+    """
+    return await password_hasher.verify_and_update_async(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Async variant of get_password_hash.
+    """
+    return await password_hasher.hash_async(password)
\ No newline at end of file
@@ -1,14 +1,88 @@
+import argparse
+import io
+import itertools
 import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.core.security import get_password_hash
+from app.models.business import Business
+from app.models.statistics import Statistics
 from app.models.user import User
 from app.models.technology import Technology, TechnologyType
+from app.services.order_generation import ORDER_COMPLEXITIES, ORDER_DEADLINE_MINUTES, ORDER_VALUES
+from app.services.technology_catalog import TechnologyCatalog
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The technology catalog. init_db inserts new entries and updates changed
+# ones, matching them by name.
+TECHNOLOGIES = [
+    {
+        "name": "Faster Production",
+        "description": "Increases production speed by 10%",
+        "type": TechnologyType.EFFICIENCY,
+        "base_cost": 100,
+        "effect_value": 0.1,
+    },
+    {
+        "name": "Faster Shipping",
+        "description": "Increases shipping speed by 10%",
+        "type": TechnologyType.EFFICIENCY,
+        "base_cost": 100,
+        "effect_value": 0.1,
+    },
+    {
+        "name": "Auto-Production",
+        "description": "Automatically produces items over time",
+        "type": TechnologyType.AUTOMATION,
+        "base_cost": 500,
+        "effect_value": 0.05,
+    },
+    {
+        "name": "Auto-Shipping",
+        "description": "Automatically ships completed orders over time",
+        "type": TechnologyType.AUTOMATION,
+        "base_cost": 500,
+        "effect_value": 0.05,
+    },
+    {
+        "name": "Increased Capacity",
+        "description": "Allows handling more orders at once",
+        "type": TechnologyType.CAPACITY,
+        "base_cost": 300,
+        "effect_value": 1,
+    },
+]
+
+# Synthetic worlds. Businesses sell one of WORLD_PRODUCT_TYPES and own each
+# technology with probability WORLD_TECHNOLOGY_SHARE. WORLD_OPEN_ORDER_SHARE
+# of the orders are still open, placed within their deadline; of the rest,
+# WORLD_EXPIRED_ORDER_SHARE expired and the others shipped.
+WORLD_PRODUCT_TYPES = ("widget", "gadget", "gizmo", "doohickey")
+WORLD_TECHNOLOGY_SHARE = 0.3
+WORLD_TECHNOLOGY_LEVELS = range(1, 4)
+WORLD_OPEN_ORDER_SHARE = 0.02
+WORLD_EXPIRED_ORDER_SHARE = 0.2
+
+# Rows sent per COPY statement
+COPY_BATCH_ROWS = 50000
+
+NULL = "\\N"
+
+# Turn 128 random bits into a version 4, RFC 4122 variant UUID
+UUID_MASK = ~(0xF000 << 64 | 0xC000 << 48) & (1 << 128) - 1
+UUID_VERSION_4 = 0x4000 << 64 | 0x8000 << 48
+
 
 def init_db(db: Session) -> None:
     # Create initial admin user
@@ -23,61 +97,277 @@ def init_db(db: Session) -> None:
         db.commit()
         db.refresh(user)
         logger.info("Created admin user")
-    
-    # Create initial technologies
-    technologies = [
-        {
-            "name": "Faster Production",
-            "description": "Increases production speed by 10%",
-            "type": TechnologyType.EFFICIENCY,
-            "base_cost": 100,
-            "effect_value": 0.1,
-        },
-        {
-            "name": "Faster Shipping",
-            "description": "Increases shipping speed by 10%",
-            "type": TechnologyType.EFFICIENCY,
-            "base_cost": 100,
-            "effect_value": 0.1,
-        },
-        {
-            "name": "Auto-Production",
-            "description": "Automatically produces items over time",
-            "type": TechnologyType.AUTOMATION,
-            "base_cost": 500,
-            "effect_value": 0.05,
-        },
-        {
-            "name": "Auto-Shipping",
-            "description": "Automatically ships completed orders over time",
-            "type": TechnologyType.AUTOMATION,
-            "base_cost": 500,
-            "effect_value": 0.05,
-        },
-        {
-            "name": "Increased Capacity",
-            "description": "Allows handling more orders at once",
-            "type": TechnologyType.CAPACITY,
-            "base_cost": 300,
-            "effect_value": 1,
+
+    upsert_technologies(db)
+
+
+def upsert_technologies(db: Session) -> List[str]:
+    """
+    Write TECHNOLOGIES with a single INSERT ... ON CONFLICT and return the
+    names of the technologies that were created or changed. Workers reload
+    their technology catalog if there were any.
+    """
+    columns = [name for name in TECHNOLOGIES[0] if name != "name"]
+    statement = insert(Technology).values(TECHNOLOGIES)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Technology.name],
+        set_={
+            "updated_at": datetime.utcnow(),
+            **{name: statement.excluded[name] for name in columns},
         },
+        # Unchanged rows are left alone, and not returned
+        where=or_(*(getattr(Technology, name).is_distinct_from(statement.excluded[name]) for name in columns)),
+    ).returning(Technology.name)
+    changed = list(db.execute(statement).scalars())
+    if changed:
+        TechnologyCatalog.bump_version(db)
+    db.commit()
+    for name in changed:
+        logger.info(f"Created or updated technology: {name}")
+    return changed
+
+
+def create_players(
+    db: Session,
+    count: int,
+    email_prefix: str = "player",
+    password: str = "player",
+    currency: int = 100,
+) -> List[Tuple[str, UUID]]:
+    """
+    Create count users, each owning one business with its statistics, and
+    return their ``(email, business_id)`` pairs.
+
+    All players share one password hash, so seeding is not bound by bcrypt.
+    """
+    hashed_password = get_password_hash(password)
+    players = []
+    for i in range(count):
+        user = User(email=f"{email_prefix}{i}@example.com", hashed_password=hashed_password)
+        business = Business(
+            name=f"Business {i}",
+            product_type="widget",
+            currency=currency,
+            owner=user,
+        )
+        business.statistics = Statistics()
+        db.add(user)
+        players.append((user, business))
+    db.flush()
+    # Read ids before commit expires the instances
+    players = [(user.email, business.id) for user, business in players]
+    db.commit()
+    logger.info(f"Created {count} players")
+    return players
+
+
+def _copy(cursor: Any, table: str, columns: Sequence[str], lines: Iterable[str]) -> int:
+    """COPY tab-separated lines into table, COPY_BATCH_ROWS at a time, and return how many there were."""
+    statement = f'COPY "{table}" ({", ".join(columns)}) FROM STDIN'
+    lines = iter(lines)
+    count = 0
+    while True:
+        batch = list(itertools.islice(lines, COPY_BATCH_ROWS))
+        if not batch:
+            return count
+        cursor.copy_expert(statement, io.StringIO("".join(batch)))
+        count += len(batch)
+
+
+def seed_world(
+    db: Session,
+    users: int,
+    businesses_per_user: int,
+    orders_per_business: int,
+    seed: int = 0,
+    email_prefix: Optional[str] = None,
+    password: str = "player",
+    days: float = 30.0,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Load a synthetic world of users, their businesses with technologies and
+    statistics, and each business's order history spread over the last
+    days, then commit. Returns the number of rows loaded per table.
+
+    Rows are streamed to PostgreSQL with COPY. Every value is drawn from a
+    random.Random seeded with seed, so a seed always loads the same world,
+    with times relative to now. Seeding the same database twice with one
+    seed fails on the duplicate ids. Statistics agree with the orders, which
+    include shipped and expired ones the archiver will move once it runs.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.utcnow()
+    email_prefix = f"world{seed}-" if email_prefix is None else email_prefix
+    span = days * 24 * 60 * 60
+    hashed_password = get_password_hash(password)
+
+    timestamp = now.replace(tzinfo=timezone.utc).timestamp()
+
+    # Formatting dominates the cost of a row, so these skip the uuid and
+    # timedelta objects. PostgreSQL accepts UUIDs as plain hex.
+    def new_id() -> str:
+        return f"{rng.getrandbits(128) & UUID_MASK | UUID_VERSION_4:032x}"
+
+    def ago(seconds: float) -> str:
+        return datetime.utcfromtimestamp(timestamp - seconds).isoformat(" ")
+
+    technologies = db.query(Technology.id, Technology.base_cost).order_by(Technology.name).all()
+    user_rows = []
+    for i in range(users):
+        # Everyone has been around for at least an hour, longer than any deadline
+        user_rows.append((new_id(), rng.uniform(60 * 60, span), f"{email_prefix}{i}@example.com"))
+    businesses = [
+        (new_id(), user_id, rng.uniform(60 * 60, user_age), rng.choice(WORLD_PRODUCT_TYPES))
+        for user_id, user_age, _ in user_rows
+        for _ in range(businesses_per_user)
     ]
-    
-    for tech_data in technologies:
-        tech = db.query(Technology).filter(Technology.name == tech_data["name"]).first()
-        if not tech:
-            tech = Technology(**tech_data)
-            db.add(tech)
-            db.commit()
-            db.refresh(tech)
-            logger.info(f"Created technology: {tech.name}")
-
-
-def main() -> None:
+    # Per business: products created, orders shipped, orders expired, revenue, spent
+    totals = [[0, 0, 0, 0, 0] for _ in businesses]
+
+    def user_lines() -> Iterator[str]:
+        for user_id, age, email in user_rows:
+            created = ago(age)
+            yield f"{user_id}\t{created}\t{created}\t{email}\t{hashed_password}\tt\tf\n"
+
+    def business_lines() -> Iterator[str]:
+        for index, (business_id, user_id, age, product_type) in enumerate(businesses):
+            created = ago(age)
+            yield (
+                f"{business_id}\t{created}\t{ago(rng.uniform(0, age))}\tBusiness {index}\t{product_type}\t"
+                f"{rng.randint(0, 5000)}\t{rng.uniform(0.0, 100.0):.2f}\t1.0\t{ago(rng.uniform(0, age))}\t"
+                f"{NULL}\t{NULL}\t{user_id}\n"
+            )
+
+    def technology_lines() -> Iterator[str]:
+        for index, (business_id, _, age, _) in enumerate(businesses):
+            for technology_id, base_cost in technologies:
+                if rng.random() >= WORLD_TECHNOLOGY_SHARE:
+                    continue
+                level = rng.choice(WORLD_TECHNOLOGY_LEVELS)
+                totals[index][4] += base_cost * level
+                created = ago(rng.uniform(0, age))
+                yield f"{new_id()}\t{created}\t{created}\t{level}\t{business_id}\t{technology_id}\n"
+
+    def order_lines() -> Iterator[str]:
+        for index, (business_id, _, age, product_type) in enumerate(businesses):
+            business_totals = totals[index]
+            # Drawn a business at a time, as order_generation does
+            values = rng.choices(ORDER_VALUES, k=orders_per_business)
+            complexities = rng.choices(ORDER_COMPLEXITIES, k=orders_per_business)
+            deadlines = rng.choices(ORDER_DEADLINE_MINUTES, k=orders_per_business)
+            for value, complexity, minutes in zip(values, complexities, deadlines):
+                window = minutes * 60
+                if rng.random() < WORLD_OPEN_ORDER_SHARE:
+                    placed = rng.uniform(0, window)
+                    updated = placed
+                    stage = rng.random()
+                    if stage < 0.5:
+                        order_status, production, shipping = "PENDING", 0.0, 0.0
+                    elif stage < 0.8:
+                        order_status, production, shipping = "IN_PROGRESS", rng.random(), 0.0
+                    else:
+                        order_status, production, shipping = "COMPLETED", 1.0, rng.random()
+                        business_totals[0] += 1
+                else:
+                    placed = rng.uniform(window, age)
+                    if rng.random() < WORLD_EXPIRED_ORDER_SHARE:
+                        order_status, production, shipping = "EXPIRED", rng.random(), 0.0
+                        updated = placed - window
+                        business_totals[2] += 1
+                    else:
+                        order_status, production, shipping = "SHIPPED", 1.0, 1.0
+                        updated = placed - rng.uniform(0, window)
+                        business_totals[0] += 1
+                        business_totals[1] += 1
+                        business_totals[3] += value
+                yield (
+                    f"{new_id()}\t{ago(placed)}\t{ago(updated)}\t{product_type}\t{order_status}\t{value}\t"
+                    f"{complexity}\t{ago(placed - window)}\t{production:.3f}\t{shipping:.3f}\t{business_id}\n"
+                )
+
+    def statistics_lines() -> Iterator[str]:
+        updated = ago(0)
+        for (business_id, _, age, _), (created, shipped, expired, revenue, spent) in zip(businesses, totals):
+            yield (
+                f"{new_id()}\t{ago(age)}\t{updated}\t{orders_per_business}\t{created}\t{shipped}\t"
+                f"{expired}\t{revenue}\t{spent}\t{business_id}\n"
+            )
+
+    started = time.perf_counter()
+    cursor = db.connection().connection.cursor()
+    try:
+        counts = {
+            "user": _copy(cursor, "user", (
+                "id", "created_at", "updated_at", "email", "hashed_password", "is_active", "is_superuser",
+            ), user_lines()),
+            "business": _copy(cursor, "business", (
+                "id", "created_at", "updated_at", "name", "product_type", "currency", "reputation",
+                "click_power", "last_played_at", "clicks_settled_at", "simulated_at", "owner_id",
+            ), business_lines()),
+            "businesstechnology": _copy(cursor, "businesstechnology", (
+                "id", "created_at", "updated_at", "level", "business_id", "technology_id",
+            ), technology_lines()),
+            "order": _copy(cursor, "order", (
+                "id", "created_at", "updated_at", "product_type", "status", "value", "complexity",
+                "deadline", "production_progress", "shipping_progress", "business_id",
+            ), order_lines()),
+            # After the orders and technologies, which its counters are summed from
+            "statistics": _copy(cursor, "statistics", (
+                "id", "created_at", "updated_at", "orders_received", "products_created", "orders_shipped",
+                "orders_expired", "total_revenue", "total_spent", "business_id",
+            ), statistics_lines()),
+        }
+        # Plan queries against the new volume straight away
+        for table in counts:
+            cursor.execute(f'ANALYZE "{table}"')
+    finally:
+        cursor.close()
+    db.commit()
+    logger.info(
+        f"Seeded {counts['user']} users, {counts['business']} businesses and {counts['order']} orders "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return counts
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create the initial data, or seed a synthetic world.")
+    commands = parser.add_subparsers(dest="command")
+    world = commands.add_parser(
+        "seed_world",
+        help="create the initial data, then load a synthetic world with COPY",
+    )
+    world.add_argument("--users", type=int, required=True)
+    world.add_argument("--businesses-per-user", type=int, default=1)
+    world.add_argument("--orders-per-business", type=int, default=100)
+    world.add_argument("--seed", type=int, default=0, help="random seed; a seed always loads the same world")
+    world.add_argument("--email-prefix", help="prefix of the users' emails (default: world<seed>-)")
+    world.add_argument("--password", default="player", help="password of every user")
+    world.add_argument("--days", type=float, default=30.0, help="how far back the order history goes")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
     logger.info("Creating initial data")
     db = SessionLocal()
-    init_db(db)
-    logger.info("Initial data created")
+    try:
+        init_db(db)
+        logger.info("Initial data created")
+        if args.command == "seed_world":
+            seed_world(
+                db,
+                users=args.users,
+                businesses_per_user=args.businesses_per_user,
+                orders_per_business=args.orders_per_business,
+                seed=args.seed,
+                email_prefix=args.email_prefix,
+                password=args.password,
+                days=args.days,
+            )
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
@@ -1,25 +1,96 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
 
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.cors_config import setup_cors
+from app.core.database import async_engine, engine
+from app.core.instrumentation import (
+    PROMETHEUS_CONTENT_TYPE,
+    MetricsMiddleware,
+    instrument_engine,
+    render_metrics,
+)
+from app.core.pubsub import event_broker
+from app.core.responses import default_response_class
+from app.core.security import PasswordHasherBusy, password_hasher
+from app.services.leaderboard import load_leaderboards, run_leaderboard_sync
+from app.services.order_archive import run_order_archiver
+from app.services.order_expiry import run_expiry_sweeper
+from app.services.simulation import run_simulation
+from app.services.statistics_buffer import flush_statistics, run_statistics_flusher
+from app.services.statistics_history import run_statistics_rollup
+from app.services.technology_catalog import load_technology_catalog
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(load_technology_catalog)
+    await asyncio.to_thread(load_leaderboards)
+    background_tasks = [
+        asyncio.create_task(run_leaderboard_sync()),
+        asyncio.create_task(event_broker.run()),
+        asyncio.create_task(run_statistics_flusher()),
+        asyncio.create_task(run_statistics_rollup()),
+    ]
+    if settings.ORDER_EXPIRY_SWEEPER_ENABLED:
+        background_tasks.append(asyncio.create_task(run_expiry_sweeper()))
+    if settings.ORDER_ARCHIVE_ENABLED:
+        background_tasks.append(asyncio.create_task(run_order_archiver()))
+    if settings.SIMULATION_ENABLED:
+        background_tasks.append(asyncio.create_task(run_simulation()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    # Background tasks may have buffered statistics until they were cancelled
+    await asyncio.to_thread(flush_statistics)
+    await asyncio.to_thread(password_hasher.shutdown)
+    # asyncpg connections are bound to the event loop that opened them
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="Click & Ship Tycoon API",
     description="API for Click & Ship Tycoon game",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=default_response_class(),
 )
 
 # Set up CORS using our configuration
 setup_cors(app)
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many password operations in progress, try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Click & Ship Tycoon API"}
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
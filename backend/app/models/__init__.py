@@ -1,17 +1,22 @@
 from app.models.user import User
 from app.models.business import Business
-from app.models.order import Order, OrderStatus
+from app.models.order import Order, OrderArchive, OrderStatus
 from app.models.technology import Technology, BusinessTechnology, TechnologyType
 from app.models.statistics import Statistics
+from app.models.statistics_bucket import StatisticsBucket
+from app.models.catalog_version import CatalogVersion
 
 # For easy importing
 __all__ = [
     "User",
     "Business",
     "Order",
+    "OrderArchive",
     "OrderStatus",
     "Technology",
     "BusinessTechnology",
     "TechnologyType",
     "Statistics",
+    "StatisticsBucket",
+    "CatalogVersion",
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -14,9 +14,13 @@ class Business(Base):
     reputation = Column(Float, default=50.0)
     click_power = Column(Float, default=1.0)
     last_played_at = Column(DateTime, nullable=True)
+    # Time up to which the click-rate budget has been spent
+    clicks_settled_at = Column(DateTime, nullable=True)
+    # Time up to which automation has been simulated
+    simulated_at = Column(DateTime, nullable=True)
     
     # Foreign keys
-    owner_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False, index=True)
     
     # Relationships
     owner = relationship("User", back_populates="businesses")
@@ -24,5 +28,10 @@ class Business(Base):
     technologies = relationship("BusinessTechnology", back_populates="business", cascade="all, delete-orphan")
     statistics = relationship("Statistics", back_populates="business", uselist=False, cascade="all, delete-orphan")
     
+    # Keyset pagination
+    __table_args__ = (
+        Index("ix_business_created_at_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<Business {self.name}>"
\ No newline at end of file
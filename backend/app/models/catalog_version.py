@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Integer
+
+from app.core.base_model import Base
+
+
+class CatalogVersion(Base):
+    """Version counter for an in-process cached catalog.
+
+    Writers bump the counter whenever the catalog changes so that every
+    worker can notice and reload its cache.
+    """
+    
+    name = Column(String, unique=True, nullable=False)
+    version = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<CatalogVersion {self.name} v{self.version}>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -24,6 +24,8 @@ class Order(Base):
     value = Column(Integer, nullable=False)
     complexity = Column(Integer, nullable=False)
     deadline = Column(DateTime, nullable=False)
+    production_progress = Column(Float, default=0.0, nullable=False)
+    shipping_progress = Column(Float, default=0.0, nullable=False)
     
     # Foreign keys
     business_id = Column(UUID(as_uuid=True), ForeignKey("business.id"), nullable=False)
@@ -31,5 +33,53 @@ class Order(Base):
     # Relationships
     business = relationship("Business", back_populates="orders")
     
+    __table_args__ = (
+        Index("ix_order_business_id_status", "business_id", "status"),
+        # Keyset pagination of a business's orders
+        Index("ix_order_business_id_created_at_id", "business_id", "created_at", "id"),
+        # Only non-terminal orders can expire, so only they are indexed by deadline
+        Index(
+            "ix_order_deadline_active",
+            "deadline",
+            postgresql_where=text("status IN ('PENDING', 'IN_PROGRESS', 'COMPLETED')"),
+        ),
+        # The archiver moves terminal orders out in the order they finished
+        Index(
+            "ix_order_updated_at_terminal",
+            "updated_at",
+            postgresql_where=text("status IN ('SHIPPED', 'EXPIRED')"),
+        ),
+    )
+    
+    def __repr__(self):
+        return f"<Order {self.id} - {self.status}>"
+
+
+class OrderArchive(Base):
+    """Shipped or expired order moved out of the order table.
+
+    Rows keep the id and timestamps they had as orders.
+    """
+    
+    product_type = Column(String, nullable=False)
+    status = Column(Enum(OrderStatus), nullable=False)
+    value = Column(Integer, nullable=False)
+    complexity = Column(Integer, nullable=False)
+    deadline = Column(DateTime, nullable=False)
+    production_progress = Column(Float, default=0.0, nullable=False)
+    shipping_progress = Column(Float, default=0.0, nullable=False)
+    archived_at = Column(DateTime, nullable=False)
+    
+    # Foreign keys. Archived orders are removed by the database with their
+    # business, there can be far too many to load for an ORM cascade.
+    business_id = Column(
+        UUID(as_uuid=True), ForeignKey("business.id", ondelete="CASCADE"), nullable=False
+    )
+    
+    __table_args__ = (
+        # Keyset pagination of a business's order history
+        Index("ix_orderarchive_business_id_created_at_id", "business_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
-        return f"<Order {self.id} - {self.status}>"
\ No newline at end of file
+        return f"<OrderArchive {self.id} - {self.status}>"
\ No newline at end of file
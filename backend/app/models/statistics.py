@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -21,5 +21,10 @@ class Statistics(Base):
     # Relationships
     business = relationship("Business", back_populates="statistics")
     
+    # The leaderboard sync reads rows changed since its last pass
+    __table_args__ = (
+        Index("ix_statistics_updated_at", "updated_at"),
+    )
+    
     def __repr__(self):
         return f"<Statistics for Business {self.business_id}>"
\ No newline at end of file
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.base_model import Base
+
+
+class StatisticsBucket(Base):
+    """Statistics increments of one business over one time bucket.
+
+    Minute buckets are written as statistics are flushed, and rolled up into
+    hour and day buckets. resolution is the bucket width in seconds.
+    """
+    
+    resolution = Column(Integer, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    orders_received = Column(Integer, default=0, nullable=False)
+    orders_shipped = Column(Integer, default=0, nullable=False)
+    orders_expired = Column(Integer, default=0, nullable=False)
+    total_revenue = Column(Integer, default=0, nullable=False)
+    total_spent = Column(Integer, default=0, nullable=False)
+    
+    # Foreign keys. Buckets are removed by the database with their business,
+    # there can be far too many to load for an ORM cascade.
+    business_id = Column(
+        UUID(as_uuid=True), ForeignKey("business.id", ondelete="CASCADE"), nullable=False
+    )
+    
+    __table_args__ = (
+        # One bucket per business, width and start; also serves series reads
+        Index(
+            "ix_statisticsbucket_business_id_resolution_bucket_start",
+            "business_id",
+            "resolution",
+            "bucket_start",
+            unique=True,
+        ),
+        # Rollups read the buckets changed since their last pass, retention
+        # deletes the oldest
+        Index("ix_statisticsbucket_resolution_updated_at", "resolution", "updated_at"),
+        Index("ix_statisticsbucket_resolution_bucket_start", "resolution", "bucket_start"),
+    )
+    
+    def __repr__(self):
+        return f"<StatisticsBucket {self.resolution}s at {self.bucket_start} for Business {self.business_id}>"
\ No newline at end of file
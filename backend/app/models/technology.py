@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -26,6 +26,11 @@ class Technology(Base):
     # Relationships
     business_technologies = relationship("BusinessTechnology", back_populates="technology")
     
+    # init_db upserts the catalog by name
+    __table_args__ = (
+        Index("ix_technology_name", "name", unique=True),
+    )
+    
     def __repr__(self):
         return f"<Technology {self.name}>"
 
@@ -43,5 +48,14 @@ class BusinessTechnology(Base):
     business = relationship("Business", back_populates="technologies")
     technology = relationship("Technology", back_populates="business_technologies")
     
+    __table_args__ = (
+        Index(
+            "ix_businesstechnology_business_id_technology_id",
+            "business_id",
+            "technology_id",
+            unique=True,
+        ),
+    )
+    
     def __repr__(self):
         return f"<BusinessTechnology {self.business_id} - {self.technology_id} (Level {self.level})>"
\ No newline at end of file
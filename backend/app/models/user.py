@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, Index, String
 from sqlalchemy.orm import relationship
 
 from app.core.base_model import Base
@@ -15,5 +15,10 @@ class User(Base):
     # Relationships
     businesses = relationship("Business", back_populates="owner", cascade="all, delete-orphan")
     
+    # Keyset pagination
+    __table_args__ = (
+        Index("ix_user_created_at_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<User {self.email}>"
\ No newline at end of file
@@ -7,6 +7,10 @@ from app.schemas.technology import (
     BusinessTechnology, BusinessTechnologyCreate, BusinessTechnologyUpdate, BusinessTechnologyInDB
 )
 from app.schemas.statistics import Statistics, StatisticsCreate, StatisticsUpdate, StatisticsInDB
+from app.schemas.click import ClickBatch, ClickBatchResult, ClickEvent, ClickKind
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardKind
+from app.schemas.snapshot import BusinessSnapshot
+from app.schemas.internal import Histogram, HistogramBucket, PasswordHasherStatus, PoolStatus
 
 # For easy importing
 __all__ = [
@@ -38,4 +42,15 @@ __all__ = [
     "StatisticsCreate",
     "StatisticsUpdate",
     "StatisticsInDB",
+    "ClickBatch",
+    "ClickBatchResult",
+    "ClickEvent",
+    "ClickKind",
+    "LeaderboardEntry",
+    "LeaderboardKind",
+    "BusinessSnapshot",
+    "Histogram",
+    "HistogramBucket",
+    "PasswordHasherStatus",
+    "PoolStatus",
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, TypeAdapter, UUID4
 
 
 # Shared properties
@@ -54,4 +54,8 @@ class Business(BusinessInDBBase):
 class BusinessInDB(BusinessInDBBase):
     """Business in DB schema."""
     
-    pass
\ No newline at end of file
+    pass
+
+
+# Pre-built adapter for list responses, see app.core.responses.list_response
+business_list_adapter = TypeAdapter(List[Business])
\ No newline at end of file
@@ -0,0 +1,40 @@
+from datetime import datetime
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.schemas.business import Business
+from app.schemas.order import Order
+
+
+class ClickKind(str, Enum):
+    """Click kind enum."""
+    
+    PRODUCTION = "production"
+    SHIPPING = "shipping"
+
+
+class ClickEvent(BaseModel):
+    """Run of consecutive clicks of one kind."""
+    
+    kind: ClickKind
+    count: int = Field(..., ge=1)
+    client_ts: datetime
+
+
+class ClickBatch(BaseModel):
+    """Click batch schema."""
+    
+    events: List[ClickEvent] = Field(..., max_length=settings.CLICK_BATCH_MAX_EVENTS)
+
+
+class ClickBatchResult(BaseModel):
+    """Click batch result schema."""
+    
+    accepted: int
+    dropped: int
+    business: Business
+    # Orders whose progress or status changed
+    orders: List[Order]
\ No newline at end of file
@@ -0,0 +1,41 @@
+from typing import List, Union
+
+from pydantic import BaseModel
+
+
+class HistogramBucket(BaseModel):
+    """Cumulative histogram bucket."""
+
+    le: Union[float, str]
+    count: int
+
+
+class Histogram(BaseModel):
+    """Histogram snapshot schema."""
+
+    buckets: List[HistogramBucket]
+    count: int
+    sum: float
+
+
+class PoolStatus(BaseModel):
+    """Database connection pool status schema."""
+
+    size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    timeouts: int
+    wait_time: Histogram
+
+
+class PasswordHasherStatus(BaseModel):
+    """Password hashing worker pool status schema."""
+
+    workers: int
+    max_pending: int
+    pending: int
+    queue_depth: int
+    rejected: int
+    duration: Histogram
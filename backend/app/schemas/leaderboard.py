@@ -0,0 +1,21 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, UUID4
+
+
+class LeaderboardKind(str, Enum):
+    """Leaderboard kind enum."""
+    
+    REVENUE = "revenue"
+    SHIPPED = "shipped"
+    PRODUCTS = "products"
+
+
+class LeaderboardEntry(BaseModel):
+    """Leaderboard entry schema."""
+    
+    rank: int
+    business_id: UUID4
+    business_name: Optional[str] = None
+    score: int
\ No newline at end of file
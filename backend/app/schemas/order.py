@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, TypeAdapter, UUID4
 
 
 class OrderStatus(str, Enum):
@@ -41,6 +41,8 @@ class OrderUpdate(OrderBase):
     """Order update schema."""
     
     status: OrderStatus
+    # Only apply the change if the order is still in this status
+    expected_status: Optional[OrderStatus] = None
 
 
 # Properties shared by models stored in DB
@@ -50,6 +52,8 @@ class OrderInDBBase(OrderBase):
     id: UUID4
     business_id: UUID4
     created_at: datetime
+    production_progress: float = 0.0
+    shipping_progress: float = 0.0
     
     class Config:
         orm_mode = True
@@ -66,4 +70,16 @@ class Order(OrderInDBBase):
 class OrderInDB(OrderInDBBase):
     """Order in DB schema."""
     
-    pass
\ No newline at end of file
+    pass
+
+
+# Properties to return via API for archived orders
+class ArchivedOrder(OrderInDBBase):
+    """Archived order schema."""
+    
+    archived_at: datetime
+
+
+# Pre-built adapters for list responses, see app.core.responses.list_response
+order_list_adapter = TypeAdapter(List[Order])
+archived_order_list_adapter = TypeAdapter(List[ArchivedOrder])
\ No newline at end of file
@@ -0,0 +1,17 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.business import Business
+from app.schemas.order import Order
+from app.schemas.statistics import Statistics
+from app.schemas.technology import BusinessTechnology
+
+
+class BusinessSnapshot(BaseModel):
+    """Everything a client needs to render a business."""
+    
+    business: Business
+    statistics: Optional[Statistics] = None
+    orders: List[Order]
+    technologies: List[BusinessTechnology]
\ No newline at end of file
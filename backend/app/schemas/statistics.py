@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, UUID4
 
@@ -54,4 +54,27 @@ class Statistics(StatisticsInDBBase):
 class StatisticsInDB(StatisticsInDBBase):
     """Statistics in DB schema."""
     
-    pass
\ No newline at end of file
+    pass
+
+
+class StatisticsPoint(BaseModel):
+    """Statistics increments over one step of a series."""
+    
+    start: datetime
+    orders_received: int = 0
+    orders_shipped: int = 0
+    orders_expired: int = 0
+    total_revenue: int = 0
+    total_spent: int = 0
+
+
+class StatisticsSeries(BaseModel):
+    """Statistics history of a business, one point per step seconds."""
+    
+    business_id: UUID4
+    start: datetime
+    end: datetime
+    step: int
+    # Width in seconds of the history buckets the points were summed from
+    resolution: int
+    points: List[StatisticsPoint]
\ No newline at end of file
@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, TypeAdapter, UUID4
 
 
 class TechnologyType(str, Enum):
@@ -112,4 +112,8 @@ class BusinessTechnology(BusinessTechnologyInDBBase):
 class BusinessTechnologyInDB(BusinessTechnologyInDBBase):
     """Business technology in DB schema."""
     
-    pass
\ No newline at end of file
+    pass
+
+
+# Pre-built adapter for list responses, see app.core.responses.list_response
+business_technology_list_adapter = TypeAdapter(List[BusinessTechnology])
\ No newline at end of file
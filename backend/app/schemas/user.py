@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, UUID4
+from pydantic import BaseModel, EmailStr, TypeAdapter, UUID4
 
 
 # Shared properties
@@ -48,4 +48,8 @@ class User(UserInDBBase):
 class UserInDB(UserInDBBase):
     """User in DB schema."""
     
-    hashed_password: str
\ No newline at end of file
+    hashed_password: str
+
+
+# Pre-built adapter for list responses, see app.core.responses.list_response
+user_list_adapter = TypeAdapter(List[User])
\ No newline at end of file
@@ -0,0 +1 @@
+# Import service modules for easy importing
\ No newline at end of file
@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from sqlalchemy import Update, update
+
+from app.models.business import Business
+
+
+def build_debit_statement(business_id: UUID, amount: int) -> Update:
+    """
+    Build a single statement that takes amount from a business's currency
+    while it can afford it, returning the new balance, or no row when it
+    cannot (or the business does not exist).
+
+    The simulation tick and click batches credit currency at any time, so
+    the balance is checked and changed in the database rather than read,
+    changed and written back.
+    """
+    return (
+        update(Business)
+        .where(Business.id == business_id, Business.currency >= amount)
+        .values(currency=Business.currency - amount)
+        .returning(Business.currency)
+    )
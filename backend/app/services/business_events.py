@@ -0,0 +1,123 @@
+"""
+Events pushed to a business's WebSocket subscribers.
+
+Each message is a compact JSON array of events, each tagged with ``t``:
+
+* ``order.created`` carries the full order.
+* ``order`` carries an order's id and only the fields that changed.
+* ``statistics.delta`` and ``business.delta`` carry increments to add to the
+  client's copy. Reputation stays clamped to 0..100.
+* ``technology`` carries a technology's new level.
+* ``resync`` means events were dropped and the client should re-read the
+  business snapshot.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+from uuid import UUID
+
+from app.core.pubsub import event_broker
+from app.models.order import OrderStatus
+from app.schemas.order import Order as OrderSchema
+from app.services.order_transitions import statistics_increments
+
+Event = Dict[str, Any]
+
+
+def business_channel(business_id: UUID) -> str:
+    # Some routes take the id as a plain string
+    return f"business:{UUID(str(business_id))}"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_events(events: Sequence[Event]) -> str:
+    return json.dumps(events, separators=(",", ":"), default=_default)
+
+
+def order_created(order: Any) -> Event:
+    return {
+        "t": "order.created",
+        "order": OrderSchema.model_validate(order, from_attributes=True).model_dump(mode="json"),
+    }
+
+
+def orders_created_events(orders: Sequence[Any]) -> List[Event]:
+    return [order_created(order) for order in orders] + statistics_delta(orders_received=len(orders))
+
+
+def order_changed(order_id: UUID, **changes: Any) -> Event:
+    return {"t": "order", "id": order_id, **changes}
+
+
+def _delta(kind: str, increments: Dict[str, int]) -> List[Event]:
+    increments = {name: value for name, value in increments.items() if value}
+    return [{"t": kind, **increments}] if increments else []
+
+
+def statistics_delta(**increments: int) -> List[Event]:
+    return _delta("statistics.delta", increments)
+
+
+def business_delta(**increments: int) -> List[Event]:
+    return _delta("business.delta", increments)
+
+
+def order_transition_events(order_id: UUID, status: OrderStatus, value: int) -> List[Event]:
+    """Events for an order moving to status, mirroring its statistics and business side effects."""
+    events = [order_changed(order_id, status=status.value)]
+    events += statistics_delta(**statistics_increments(status, value))
+    if status == OrderStatus.SHIPPED:
+        events += business_delta(currency=value, reputation=1)
+    elif status == OrderStatus.EXPIRED:
+        events += business_delta(reputation=-2)
+    return events
+
+
+def orders_expired_events(order_ids: Sequence[UUID]) -> List[Event]:
+    events = [order_changed(order_id, status=OrderStatus.EXPIRED.value) for order_id in order_ids]
+    events += statistics_delta(orders_expired=len(order_ids))
+    events += business_delta(reputation=-2 * len(order_ids))
+    return events
+
+
+def progress_events(orders: Iterable[Any], completed: int, shipped: int, revenue: int) -> List[Event]:
+    """Events for orders advanced by clicks or automation."""
+    events = [
+        order_changed(
+            order.id,
+            status=OrderStatus(order.status).value,
+            production_progress=order.production_progress,
+            shipping_progress=order.shipping_progress,
+        )
+        for order in orders
+    ]
+    events += statistics_delta(products_created=completed, orders_shipped=shipped, total_revenue=revenue)
+    events += business_delta(currency=revenue, reputation=shipped)
+    return events
+
+
+def technology_events(technology_id: UUID, level: int, cost: int) -> List[Event]:
+    events: List[Event] = [{"t": "technology", "technology_id": technology_id, "level": level}]
+    events += statistics_delta(total_spent=cost)
+    events += business_delta(currency=-cost)
+    return events
+
+
+def publish_business_events(business_id: UUID, events: Sequence[Event]) -> None:
+    """Push events to a business's subscribers. Call only after they are committed."""
+    if events:
+        event_broker.publish(business_channel(business_id), encode_events(events))
+
+
+def publish_many_business_events(events_by_business: Iterable[Tuple[UUID, Sequence[Event]]]) -> None:
+    """Push events for several businesses in one round trip."""
+    event_broker.publish_many(
+        (business_channel(business_id), encode_events(events))
+        for business_id, events in events_by_business
+        if events
+    )
@@ -0,0 +1,132 @@
+import hashlib
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.business import Business
+from app.models.order import Order
+from app.models.statistics import Statistics
+from app.models.technology import BusinessTechnology
+from app.schemas.snapshot import BusinessSnapshot
+from app.services.order_expiry import ACTIVE_STATUSES
+from app.services.statistics_buffer import merge_pending, statistics_buffer
+
+
+def _etag(
+    business_updated_at: datetime,
+    statistics_updated_at: Optional[datetime],
+    order_count: int,
+    orders_updated_at: Optional[datetime],
+    technology_count: int,
+    technologies_updated_at: Optional[datetime],
+    pending_statistics: Optional[Dict[str, int]],
+) -> str:
+    """
+    Weak ETag over the rows a snapshot is built from.
+
+    Every write bumps its row's updated_at, and an order leaving the active
+    set changes the count, so the tag changes whenever the snapshot would.
+    Statistics deltas this worker has not flushed yet count as well.
+    """
+    parts = (
+        business_updated_at,
+        statistics_updated_at,
+        order_count,
+        orders_updated_at,
+        technology_count,
+        technologies_updated_at,
+        tuple(pending_statistics.values()) if pending_statistics else None,
+    )
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _latest(rows: Iterable) -> Optional[datetime]:
+    return max((row.updated_at for row in rows), default=None)
+
+
+def snapshot_etag(db: Session, business_id: UUID) -> Optional[str]:
+    """
+    Compute a business's snapshot ETag in one aggregate query, without
+    loading any ORM instances. Returns None when the business does not exist.
+    """
+    active_orders = select(
+        func.count(Order.id), func.max(Order.updated_at)
+    ).where(Order.business_id == business_id, Order.status.in_(ACTIVE_STATUSES)).subquery()
+    technologies = select(
+        func.count(BusinessTechnology.id), func.max(BusinessTechnology.updated_at)
+    ).where(BusinessTechnology.business_id == business_id).subquery()
+    statistics_updated_at = (
+        select(Statistics.updated_at)
+        .where(Statistics.business_id == business_id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(Business.updated_at, statistics_updated_at, *active_orders.c, *technologies.c)
+        .select_from(Business)
+        .join(active_orders, true())
+        .join(technologies, true())
+        .where(Business.id == business_id)
+    )
+    row, pending_statistics = statistics_buffer.read_with_pending(
+        business_id, lambda: db.execute(statement).first()
+    )
+    if row is None:
+        return None
+    return _etag(*row, pending_statistics)
+
+
+def load_snapshot(db: Session, business_id: UUID) -> Optional[Tuple[str, BusinessSnapshot]]:
+    """
+    Load a business's snapshot and its ETag in three queries: the business
+    with its statistics, its active orders, and its technologies with their
+    definitions. Returns None when the business does not exist.
+    """
+    query = (
+        db.query(Business)
+        .options(joinedload(Business.statistics))
+        .filter(Business.id == business_id)
+        # A repeated read must refresh the statistics it already loaded
+        .populate_existing()
+    )
+    business, pending_statistics = statistics_buffer.read_with_pending(business_id, query.first)
+    if not business:
+        return None
+    orders: Sequence[Order] = (
+        db.query(Order)
+        .filter(Order.business_id == business_id, Order.status.in_(ACTIVE_STATUSES))
+        .order_by(Order.created_at, Order.id)
+        .all()
+    )
+    technologies: Sequence[BusinessTechnology] = (
+        db.query(BusinessTechnology)
+        .options(joinedload(BusinessTechnology.technology))
+        .filter(BusinessTechnology.business_id == business_id)
+        .order_by(BusinessTechnology.created_at, BusinessTechnology.id)
+        .all()
+    )
+    statistics = business.statistics
+    etag = _etag(
+        business.updated_at,
+        statistics.updated_at if statistics else None,
+        len(orders),
+        _latest(orders),
+        len(technologies),
+        _latest(technologies),
+        pending_statistics,
+    )
+    # Validated here so the async router serializes no ORM state
+    snapshot = BusinessSnapshot.model_validate(
+        {
+            "business": business,
+            "statistics": statistics,
+            "orders": orders,
+            "technologies": technologies,
+        },
+        from_attributes=True,
+    )
+    merge_pending(snapshot.statistics, pending_statistics)
+    return etag, snapshot
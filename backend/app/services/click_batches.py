@@ -0,0 +1,182 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.business import Business
+from app.models.order import Order, OrderStatus
+from app.schemas.click import ClickEvent, ClickKind
+from app.schemas.leaderboard import LeaderboardKind
+from app.services.order_expiry import ACTIVE_STATUSES
+
+# Progress is a float; treat anything this close to the target as done
+PROGRESS_EPSILON = 1e-9
+
+
+@dataclass
+class ClickBatchOutcome:
+    """Result of folding a click batch into a business's state."""
+
+    business: Business
+    accepted: int = 0
+    dropped: int = 0
+    orders: List[Order] = field(default_factory=list)
+    completed: int = 0
+    shipped: int = 0
+    revenue: int = 0
+
+    @property
+    def leaderboard_deltas(self) -> Dict[LeaderboardKind, int]:
+        return {
+            LeaderboardKind.PRODUCTS: self.completed,
+            LeaderboardKind.SHIPPED: self.shipped,
+            LeaderboardKind.REVENUE: self.revenue,
+        }
+
+    @property
+    def statistics_deltas(self) -> Dict[str, int]:
+        return {
+            "products_created": self.completed,
+            "orders_shipped": self.shipped,
+            "total_revenue": self.revenue,
+        }
+
+
+def click_budget(business: Business, now: datetime) -> Tuple[float, datetime]:
+    """
+    Return how many clicks the business may credit now, and the point in time
+    the budget is measured from.
+
+    The budget refills at CLICK_RATE_LIMIT_PER_SECOND and holds at most
+    CLICK_RATE_WINDOW_SECONDS worth of clicks. Accepted clicks move
+    ``clicks_settled_at`` forward by 1 / rate each, so batches of any size or
+    frequency are held to the same rate.
+    """
+    floor = now - timedelta(seconds=settings.CLICK_RATE_WINDOW_SECONDS)
+    settled_at = business.clicks_settled_at
+    if settled_at is None or settled_at < floor:
+        settled_at = floor
+    elapsed = max((now - settled_at).total_seconds(), 0.0)
+    return elapsed * settings.CLICK_RATE_LIMIT_PER_SECOND, settled_at
+
+
+def _advance(
+    queue: List[Order],
+    progress: float,
+    attribute: str,
+    done_status: OrderStatus,
+) -> List[Order]:
+    """
+    Spend progress on the orders at the head of queue, moving each finished
+    order to done_status and off the queue. Returns the orders that changed.
+    """
+    changed = []
+    while progress > PROGRESS_EPSILON and queue:
+        order = queue[0]
+        changed.append(order)
+        needed = order.complexity - getattr(order, attribute)
+        if progress + PROGRESS_EPSILON < needed:
+            setattr(order, attribute, getattr(order, attribute) + progress)
+            break
+        setattr(order, attribute, float(order.complexity))
+        order.status = done_status
+        progress -= needed
+        queue.pop(0)
+    return changed
+
+
+def apply_click_batch(
+    db: Session,
+    business_id: UUID,
+    events: Sequence[ClickEvent],
+    now: Optional[datetime] = None,
+) -> Optional[ClickBatchOutcome]:
+    """
+    Fold a batch of click runs into the business and its active orders.
+
+    Runs are applied in client_ts order. Each production click adds
+    ``click_power`` to the oldest unfinished order, completing it once its
+    progress reaches its complexity; leftover progress carries to the next
+    order. Shipping clicks do the same for completed orders. Clicks beyond the
+    business's rate budget are dropped.
+
+    The business and its active orders are locked, and every change is left
+    in the caller's transaction. Orders another transaction holds are skipped,
+    like orders the client saw before they moved on. Statistics are not
+    touched: the caller buffers ``statistics_deltas`` once it commits. Returns
+    None when the business does not exist.
+    """
+    now = now or datetime.utcnow()
+    business = (
+        db.query(Business)
+        .filter(Business.id == business_id)
+        .with_for_update()
+        .first()
+    )
+    if not business:
+        return None
+
+    # Overdue orders are left for the expiry sweeper. Status changes and the
+    # sweeper lock an order before its business, so waiting on an order they
+    # hold while holding the business could deadlock
+    orders = (
+        db.query(Order)
+        .filter(
+            Order.business_id == business_id,
+            Order.status.in_(ACTIVE_STATUSES),
+            Order.deadline >= now,
+        )
+        .order_by(Order.created_at, Order.id)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    to_produce = [order for order in orders if order.status != OrderStatus.COMPLETED]
+    to_ship = [order for order in orders if order.status == OrderStatus.COMPLETED]
+
+    outcome = ClickBatchOutcome(business=business)
+    budget, settled_at = click_budget(business, now)
+    click_power = business.click_power or 1.0
+    touched: Dict[UUID, Order] = {}
+    for event in sorted(events, key=lambda event: event.client_ts):
+        accepted = min(event.count, int(budget - outcome.accepted + PROGRESS_EPSILON))
+        outcome.accepted += accepted
+        outcome.dropped += event.count - accepted
+        if not accepted:
+            continue
+
+        if event.kind == ClickKind.PRODUCTION:
+            changed = _advance(
+                to_produce, accepted * click_power, "production_progress", OrderStatus.COMPLETED
+            )
+            for order in changed:
+                if order.status == OrderStatus.COMPLETED:
+                    to_ship.append(order)
+                    outcome.completed += 1
+                else:
+                    order.status = OrderStatus.IN_PROGRESS
+        else:
+            changed = _advance(
+                to_ship, accepted * click_power, "shipping_progress", OrderStatus.SHIPPED
+            )
+            for order in changed:
+                if order.status == OrderStatus.SHIPPED:
+                    outcome.shipped += 1
+                    outcome.revenue += order.value
+        for order in changed:
+            touched[order.id] = order
+
+    outcome.orders = sorted(touched.values(), key=lambda order: (order.created_at, order.id))
+
+    business.clicks_settled_at = settled_at + timedelta(
+        seconds=outcome.accepted / settings.CLICK_RATE_LIMIT_PER_SECOND
+    )
+    business.last_played_at = now
+    if outcome.shipped:
+        business.currency += outcome.revenue
+        business.reputation = min(100, business.reputation + outcome.shipped)
+
+    db.flush()
+    return outcome
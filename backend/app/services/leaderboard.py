@@ -0,0 +1,360 @@
+import asyncio
+import logging
+import threading
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.order import OrderStatus
+from app.models.statistics import Statistics
+from app.schemas.leaderboard import LeaderboardKind
+from app.services.statistics_buffer import statistics_buffer
+
+logger = logging.getLogger(__name__)
+
+# Statistics column backing each leaderboard
+SCORE_COLUMNS = {
+    LeaderboardKind.REVENUE: Statistics.total_revenue,
+    LeaderboardKind.SHIPPED: Statistics.orders_shipped,
+    LeaderboardKind.PRODUCTS: Statistics.products_created,
+}
+
+# Scores are 32-bit statistics columns. A member's sort key packs the inverted
+# score into the high bits and the member index into the low 32 bits, so keys
+# sort by score descending, then by the order members were first seen.
+MAX_SCORE = 2 ** 31 - 1
+INDEX_BITS = 32
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+# Rows whose updated_at is this close to the last sync are re-read, because
+# updated_at is stamped before commit and commits can land out of order.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def _key(score: int, index: int) -> int:
+    return ((MAX_SCORE - min(max(score, 0), MAX_SCORE)) << INDEX_BITS) | index
+
+
+def _score(key: int) -> int:
+    return MAX_SCORE - (key >> INDEX_BITS)
+
+
+def _row_scores(row, pending: Dict[UUID, Dict[str, int]]) -> Dict[LeaderboardKind, int]:
+    # Statistics increments this worker has not flushed yet are already on the boards
+    deltas = pending.get(row.business_id, {})
+    return {kind: getattr(row, column.key) + deltas.get(column.key, 0) for kind, column in SCORE_COLUMNS.items()}
+
+
+class RankedKeys:
+    """
+    Sorted set of non-negative 63-bit integer keys with rank and select.
+
+    Keys live in sorted ``array('q')`` blocks of bounded size. A Fenwick tree
+    over block lengths turns rank and select into O(log n) operations, and
+    because blocks never exceed ``2 * block_size`` keys, inserts and removes
+    are O(log n) as well (a bisect plus a bounded memmove). Eight bytes per
+    key keeps a million-member board at a few megabytes.
+    """
+
+    def __init__(self, block_size: int = 512):
+        self.block_size = block_size
+        self._blocks: List[array] = []
+        self._maxes: List[int] = []
+        self._tree: List[int] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _rebuild_tree(self) -> None:
+        tree = [len(block) for block in self._blocks]
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, block_index: int, delta: int) -> None:
+        while block_index < len(self._tree):
+            self._tree[block_index] += delta
+            block_index |= block_index + 1
+
+    def _prefix(self, block_index: int) -> int:
+        """Number of keys in blocks before block_index."""
+        total = 0
+        while block_index > 0:
+            total += self._tree[block_index - 1]
+            block_index &= block_index - 1
+        return total
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """Find the block holding the key at position and the offset in it."""
+        block_index = 0
+        bit = 1 << max(len(self._tree).bit_length() - 1, 0)
+        while bit:
+            candidate = block_index + bit
+            if candidate <= len(self._tree) and self._tree[candidate - 1] <= position:
+                block_index = candidate
+                position -= self._tree[candidate - 1]
+            bit >>= 1
+        return block_index, position
+
+    def bulk_load(self, keys: Iterable[int]) -> None:
+        """Replace the contents with keys, sorting them once."""
+        ordered = sorted(keys)
+        size = self.block_size
+        self._blocks = [array("q", ordered[i:i + size]) for i in range(0, len(ordered), size)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(ordered)
+        self._rebuild_tree()
+
+    def add(self, key: int) -> None:
+        if not self._blocks:
+            self._blocks.append(array("q", [key]))
+            self._maxes.append(key)
+            self._len = 1
+            self._rebuild_tree()
+            return
+
+        block_index = bisect_left(self._maxes, key)
+        if block_index == len(self._blocks):
+            block_index -= 1
+        block = self._blocks[block_index]
+        insort(block, key)
+        self._maxes[block_index] = block[-1]
+        self._len += 1
+
+        if len(block) > 2 * self.block_size:
+            half = len(block) // 2
+            self._blocks[block_index:block_index + 1] = [block[:half], block[half:]]
+            self._maxes[block_index:block_index + 1] = [block[half - 1], block[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(block_index, 1)
+
+    def remove(self, key: int) -> None:
+        block_index = bisect_left(self._maxes, key)
+        if block_index == len(self._blocks):
+            raise KeyError(key)
+        block = self._blocks[block_index]
+        position = bisect_left(block, key)
+        if position == len(block) or block[position] != key:
+            raise KeyError(key)
+        del block[position]
+        self._len -= 1
+
+        if not block:
+            del self._blocks[block_index]
+            del self._maxes[block_index]
+            self._rebuild_tree()
+        else:
+            self._maxes[block_index] = block[-1]
+            self._tree_add(block_index, -1)
+
+    def index(self, key: int) -> int:
+        """Zero-based position of key."""
+        block_index = bisect_left(self._maxes, key)
+        if block_index == len(self._blocks):
+            raise KeyError(key)
+        block = self._blocks[block_index]
+        position = bisect_left(block, key)
+        if position == len(block) or block[position] != key:
+            raise KeyError(key)
+        return self._prefix(block_index) + position
+
+    def slice(self, offset: int, limit: int) -> List[int]:
+        """Keys at positions [offset, offset + limit)."""
+        if offset >= self._len or limit <= 0:
+            return []
+        block_index, position = self._locate(offset)
+        keys: List[int] = []
+        while block_index < len(self._blocks) and len(keys) < limit:
+            block = self._blocks[block_index]
+            keys.extend(block[position:position + limit - len(keys)])
+            block_index += 1
+            position = 0
+        return keys
+
+
+class Leaderboards:
+    """
+    In-process revenue, shipped and products leaderboards.
+
+    Order transitions update the boards incrementally as they commit, and a
+    background sync folds in statistics rows changed by other workers since
+    the last sync. Top-K reads cost O(log n + K) and rank lookups O(log n).
+    """
+
+    def __init__(self, block_size: int = 512):
+        self._lock = threading.Lock()
+        self._block_size = block_size
+        self._business_ids: List[Optional[UUID]] = []
+        self._indexes: Dict[UUID, int] = {}
+        self._keys = {kind: RankedKeys(block_size) for kind in LeaderboardKind}
+        self._scores = {kind: array("q") for kind in LeaderboardKind}
+        self._synced_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def _index(self, business_id: UUID) -> int:
+        index = self._indexes.get(business_id)
+        if index is None:
+            index = len(self._business_ids)
+            self._business_ids.append(business_id)
+            self._indexes[business_id] = index
+            for kind in LeaderboardKind:
+                self._scores[kind].append(0)
+                self._keys[kind].add(_key(0, index))
+        return index
+
+    def _set(self, kind: LeaderboardKind, index: int, score: int) -> None:
+        scores = self._scores[kind]
+        if scores[index] == score:
+            return
+        keys = self._keys[kind]
+        keys.remove(_key(scores[index], index))
+        keys.add(_key(score, index))
+        scores[index] = score
+
+    def set_scores(self, business_id: UUID, scores: Dict[LeaderboardKind, int]) -> None:
+        """Set absolute scores for a business."""
+        with self._lock:
+            index = self._index(business_id)
+            for kind, score in scores.items():
+                self._set(kind, index, score)
+
+    def increment(self, business_id: UUID, deltas: Dict[LeaderboardKind, int]) -> None:
+        """Add deltas to a business's scores."""
+        with self._lock:
+            index = self._index(business_id)
+            for kind, delta in deltas.items():
+                self._set(kind, index, self._scores[kind][index] + delta)
+
+    def record_order_transition(self, business_id: UUID, status: OrderStatus, value: int) -> None:
+        """Apply the leaderboard effect of an order moving to status."""
+        if status == OrderStatus.SHIPPED:
+            self.increment(
+                business_id, {LeaderboardKind.SHIPPED: 1, LeaderboardKind.REVENUE: value}
+            )
+        elif status == OrderStatus.COMPLETED:
+            self.increment(business_id, {LeaderboardKind.PRODUCTS: 1})
+
+    def remove(self, business_id: UUID) -> None:
+        """Drop a deleted business from every board."""
+        with self._lock:
+            index = self._indexes.pop(business_id, None)
+            if index is None:
+                return
+            self._business_ids[index] = None
+            for kind in LeaderboardKind:
+                self._keys[kind].remove(_key(self._scores[kind][index], index))
+
+    def top(self, kind: LeaderboardKind, limit: int, offset: int = 0) -> List[Tuple[int, UUID, int]]:
+        """Return ``(rank, business_id, score)`` for ranks offset+1 .. offset+limit."""
+        with self._lock:
+            keys = self._keys[kind].slice(offset, limit)
+            return [
+                (offset + position + 1, self._business_ids[key & INDEX_MASK], _score(key))
+                for position, key in enumerate(keys)
+            ]
+
+    def rank(self, kind: LeaderboardKind, business_id: UUID) -> Optional[Tuple[int, int]]:
+        """Return ``(rank, score)`` for a business, or None if it is unknown."""
+        with self._lock:
+            index = self._indexes.get(business_id)
+            if index is None:
+                return None
+            score = self._scores[kind][index]
+            return self._keys[kind].index(_key(score, index)) + 1, score
+
+    def _read_statistics(self, db: Session, since: Optional[datetime] = None, **options: Any):
+        """
+        Start reading statistics rows, changed since since when given, and
+        return them with the deltas this worker has not flushed yet.
+        """
+        statement = select(Statistics.business_id, Statistics.updated_at, *SCORE_COLUMNS.values())
+        if since is not None:
+            statement = statement.where(Statistics.updated_at > since)
+        return statistics_buffer.read_with_pending_all(
+            lambda: db.execute(statement.execution_options(**options))
+        )
+
+    def load(self, db: Session) -> None:
+        """Rebuild every board from the statistics table."""
+        business_ids: List[Optional[UUID]] = []
+        scores = {kind: array("q") for kind in LeaderboardKind}
+        synced_at = None
+        rows, pending = self._read_statistics(db, yield_per=10000)
+        for row in rows:
+            business_ids.append(row.business_id)
+            for kind, score in _row_scores(row, pending).items():
+                scores[kind].append(score)
+            if row.updated_at and (synced_at is None or row.updated_at > synced_at):
+                synced_at = row.updated_at
+
+        keys = {}
+        for kind in LeaderboardKind:
+            keys[kind] = RankedKeys(self._block_size)
+            keys[kind].bulk_load(_key(score, index) for index, score in enumerate(scores[kind]))
+
+        with self._lock:
+            self._business_ids = business_ids
+            self._indexes = {business_id: index for index, business_id in enumerate(business_ids)}
+            self._scores = scores
+            self._keys = keys
+            self._synced_at = synced_at
+
+    def sync(self, db: Session) -> int:
+        """Fold in statistics rows changed since the last sync."""
+        since = self._synced_at - SYNC_OVERLAP if self._synced_at is not None else None
+        synced_at = self._synced_at
+        changed = 0
+        rows, pending = self._read_statistics(db, since)
+        for row in rows:
+            self.set_scores(row.business_id, _row_scores(row, pending))
+            if row.updated_at and (synced_at is None or row.updated_at > synced_at):
+                synced_at = row.updated_at
+            changed += 1
+        self._synced_at = synced_at
+        return changed
+
+
+leaderboards = Leaderboards()
+
+
+def load_leaderboards() -> None:
+    """Build the leaderboards at startup."""
+    db = SessionLocal()
+    try:
+        leaderboards.load(db)
+        logger.info(f"Loaded {len(leaderboards)} businesses into the leaderboards")
+    except Exception:
+        logger.exception("Could not load the leaderboards")
+    finally:
+        db.close()
+
+
+def _sync_leaderboards() -> int:
+    db = SessionLocal()
+    try:
+        return leaderboards.sync(db)
+    finally:
+        db.close()
+
+
+async def run_leaderboard_sync(interval: float = settings.LEADERBOARD_SYNC_SECONDS) -> None:
+    """Periodically fold in statistics written by other workers until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(_sync_leaderboards)
+        except Exception:
+            logger.exception("Leaderboard sync failed")
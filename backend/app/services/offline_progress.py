@@ -0,0 +1,209 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from statistics import mean
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models.business import Business
+from app.models.statistics import Statistics
+from app.schemas.leaderboard import LeaderboardKind
+from app.services.business_events import Event, business_delta, publish_business_events, statistics_delta
+from app.services.leaderboard import leaderboards
+from app.services.order_generation import ORDER_COMPLEXITIES, ORDER_DEADLINE_MINUTES, ORDER_VALUES
+from app.services.simulation import load_state, step, step_events, step_statistics, write_results
+from app.services.statistics_history import build_minute_bucket_statement
+
+# Reads refresh last_played_at at most this often, so a player who keeps the
+# game open is never treated as away
+PRESENCE_RESOLUTION_SECONDS = 60.0
+
+# Orders arriving while away are settled from the order generator's means
+MEAN_COMPLEXITY = mean(ORDER_COMPLEXITIES)
+MEAN_VALUE = mean(ORDER_VALUES)
+MEAN_DEADLINE_SECONDS = mean(ORDER_DEADLINE_MINUTES) * 60
+
+
+@dataclass
+class OfflineProgress:
+    """What a business's automation did while its player was away."""
+
+    orders_received: int = 0
+    products_created: int = 0
+    orders_shipped: int = 0
+    orders_expired: int = 0
+    revenue: int = 0
+
+    @property
+    def reputation_delta(self) -> int:
+        return self.orders_shipped - 2 * self.orders_expired
+
+    @property
+    def statistics_deltas(self) -> Dict[str, int]:
+        return {
+            "orders_received": self.orders_received,
+            "products_created": self.products_created,
+            "orders_shipped": self.orders_shipped,
+            "orders_expired": self.orders_expired,
+            "total_revenue": self.revenue,
+        }
+
+    @property
+    def leaderboard_deltas(self) -> Dict[LeaderboardKind, int]:
+        return {
+            LeaderboardKind.PRODUCTS: self.products_created,
+            LeaderboardKind.SHIPPED: self.orders_shipped,
+            LeaderboardKind.REVENUE: self.revenue,
+        }
+
+
+def expected_offline_progress(seconds: float, production_rate: float, shipping_rate: float) -> OfflineProgress:
+    """
+    Closed-form outcome of the orders that would have arrived over seconds.
+
+    One order arrives every OFFLINE_ORDER_INTERVAL_SECONDS. Automation makes
+    and ships at most ``rate * seconds / MEAN_COMPLEXITY`` of them, and an
+    order only counts if a single one can get through within the mean
+    deadline. Every other order expires. The cost is the same for any
+    duration.
+    """
+    arrivals = int(seconds // settings.OFFLINE_ORDER_INTERVAL_SECONDS)
+    progress = OfflineProgress(orders_received=arrivals)
+    if not arrivals or production_rate <= 0:
+        progress.orders_expired = arrivals
+        return progress
+
+    production_time = MEAN_COMPLEXITY / production_rate
+    if production_time <= MEAN_DEADLINE_SECONDS:
+        progress.products_created = min(arrivals, math.floor(seconds / production_time))
+    if shipping_rate > 0 and production_time + MEAN_COMPLEXITY / shipping_rate <= MEAN_DEADLINE_SECONDS:
+        progress.orders_shipped = min(
+            progress.products_created, math.floor(seconds * shipping_rate / MEAN_COMPLEXITY)
+        )
+    progress.orders_expired = arrivals - progress.orders_shipped
+    progress.revenue = round(progress.orders_shipped * MEAN_VALUE)
+    return progress
+
+
+def _away_seconds(business: Business, now: datetime) -> Optional[float]:
+    if business.last_played_at is None:
+        return None
+    return (now - business.last_played_at).total_seconds()
+
+
+def apply_offline_progress(
+    db: Session, business_id: UUID, now: datetime
+) -> Optional[Tuple[Dict[LeaderboardKind, int], List[Event]]]:
+    """
+    Credit a business with what its automation did since last_played_at.
+
+    Active orders are advanced by one simulation step over the whole gap and
+    orders that would have arrived meanwhile are settled in closed form.
+    Businesses without automation just pick up where they left off. Every
+    change is left in the caller's transaction. Returns the leaderboard
+    deltas and the events to publish once it commits, or None when the
+    business does not exist or is no longer away.
+    """
+    business = (
+        db.query(Business)
+        .filter(Business.id == business_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+    if not business:
+        return None
+    seconds = _away_seconds(business, now)
+    # Another request may have resumed the business while this one waited
+    if seconds is None or seconds < settings.OFFLINE_PROGRESS_MIN_SECONDS:
+        return None
+
+    deltas = {kind: 0 for kind in LeaderboardKind}
+    events: List[Event] = []
+    simulated = {}
+    arrivals = OfflineProgress()
+    # The business is locked first, so load_state skips orders that status
+    # changes or the expiry sweeper hold rather than waiting on them
+    state = load_state(db, now, 1, business_id=business_id)
+    if state is not None:
+        # Active orders are written back and published exactly like a simulation tick
+        result = step(state)
+        write_results(db, state, result, now)
+        for step_business_events in step_events(state, result).values():
+            events += step_business_events
+        simulated = step_statistics(result, 0)
+        deltas[LeaderboardKind.PRODUCTS] += int(result.completed[0])
+        deltas[LeaderboardKind.SHIPPED] += int(result.shipped[0])
+        deltas[LeaderboardKind.REVENUE] += int(result.revenue[0])
+        arrivals = expected_offline_progress(
+            seconds, float(state.production_rate[0]), float(state.shipping_rate[0])
+        )
+
+    db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values(
+            currency=Business.currency + arrivals.revenue,
+            reputation=func.least(100, func.greatest(0, Business.reputation + arrivals.reputation_delta)),
+            last_played_at=now,
+        )
+    )
+    # Written directly rather than buffered, so the whole catch-up commits as one
+    increments = arrivals.statistics_deltas
+    for name, value in simulated.items():
+        increments[name] += value
+    if any(increments.values()):
+        db.execute(
+            update(Statistics)
+            .where(Statistics.business_id == business_id)
+            .values(**{name: getattr(Statistics, name) + value for name, value in increments.items()})
+        )
+        history = build_minute_bucket_statement({business_id: increments}, now)
+        if history is not None:
+            db.execute(history)
+    events += statistics_delta(**arrivals.statistics_deltas)
+    events += business_delta(currency=arrivals.revenue, reputation=arrivals.reputation_delta)
+    for kind, delta in arrivals.leaderboard_deltas.items():
+        deltas[kind] += delta
+    return deltas, events
+
+
+def resume_business(db: Session, business_id: UUID, now: Optional[datetime] = None) -> Optional[Business]:
+    """
+    Load a business for its player, first applying offline progress in one
+    transaction when they have been away for OFFLINE_PROGRESS_MIN_SECONDS.
+
+    Otherwise last_played_at is refreshed at most once per
+    PRESENCE_RESOLUTION_SECONDS, without touching updated_at. Returns None
+    when the business does not exist.
+    """
+    now = now or datetime.utcnow()
+    business = db.query(Business).filter(Business.id == business_id).first()
+    if not business:
+        return None
+
+    seconds = _away_seconds(business, now)
+    if seconds is not None and seconds >= settings.OFFLINE_PROGRESS_MIN_SECONDS:
+        progress = apply_offline_progress(db, business_id, now)
+        db.commit()
+        if progress:
+            deltas, events = progress
+            leaderboards.increment(business_id, deltas)
+            publish_business_events(business_id, events)
+        # The progress was written with Core updates
+        return db.query(Business).filter(Business.id == business_id).populate_existing().first()
+
+    if seconds is None or seconds >= PRESENCE_RESOLUTION_SECONDS:
+        db.execute(
+            update(Business)
+            .where(Business.id == business_id)
+            .values(last_played_at=now, updated_at=Business.updated_at)
+        )
+        db.commit()
+        set_committed_value(business, "last_played_at", now)
+    return business
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import Insert, delete, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.order import Order, OrderArchive
+from app.services.order_transitions import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Order columns copied into the archive as they are
+ARCHIVED_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "business_id",
+    "product_type",
+    "status",
+    "value",
+    "complexity",
+    "deadline",
+    "production_progress",
+    "shipping_progress",
+)
+
+
+def build_archive_statement(cutoff: datetime, now: datetime, batch_size: int) -> Insert:
+    """
+    Build a single statement that moves up to batch_size orders that shipped
+    or expired before cutoff from the order table into the archive, and
+    returns their ids.
+
+    Terminal orders never change again, so their updated_at is when they
+    finished. Rows locked by a concurrent mover are skipped.
+    """
+    due = (
+        select(Order.id)
+        .where(Order.status.in_(TERMINAL_STATUSES), Order.updated_at < cutoff)
+        .order_by(Order.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    moved = (
+        delete(Order)
+        .where(Order.id == due.c.id)
+        .returning(*(getattr(Order, name) for name in ARCHIVED_COLUMNS))
+        .cte("moved")
+    )
+    return (
+        OrderArchive.__table__.insert()
+        .from_select(
+            [*ARCHIVED_COLUMNS, "archived_at"],
+            select(*(moved.c[name] for name in ARCHIVED_COLUMNS), literal(now)),
+        )
+        .returning(OrderArchive.id)
+    )
+
+
+def archive_orders(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Move one batch of orders that finished before cutoff and return how many moved."""
+    moved = db.execute(build_archive_statement(cutoff, datetime.utcnow(), batch_size)).all()
+    db.commit()
+    return len(moved)
+
+
+def archive_finished_orders(after: timedelta, batch_size: int) -> int:
+    """Archive orders that finished more than after ago, in batches until none are left."""
+    cutoff = datetime.utcnow() - after
+    total = 0
+    while True:
+        db = SessionLocal()
+        try:
+            moved = archive_orders(db, cutoff, batch_size)
+        finally:
+            db.close()
+        total += moved
+        if moved < batch_size:
+            return total
+
+
+async def run_order_archiver(
+    interval: float = settings.ORDER_ARCHIVE_INTERVAL_SECONDS,
+    after: float = settings.ORDER_ARCHIVE_AFTER_SECONDS,
+    batch_size: int = settings.ORDER_ARCHIVE_BATCH_SIZE,
+) -> None:
+    """Archive finished orders every interval seconds until cancelled."""
+    while True:
+        try:
+            moved = await asyncio.to_thread(archive_finished_orders, timedelta(seconds=after), batch_size)
+            if moved:
+                logger.info(f"Archived {moved} finished orders")
+        except Exception:
+            logger.exception("Order archiving failed")
+        await asyncio.sleep(interval)
+
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict
+from uuid import UUID
+
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.business import Business
+from app.models.order import Order, OrderStatus
+from app.services.business_events import orders_expired_events, publish_many_business_events
+from app.services.order_transitions import TERMINAL_STATUSES
+from app.services.statistics_buffer import (
+    flush_statistics,
+    run_statistics_flusher,
+    statistics_buffer,
+)
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = tuple(s for s in OrderStatus if s not in TERMINAL_STATUSES)
+
+
+def build_expiry_statement(now: datetime, batch_size: int) -> Select:
+    """
+    Build a single statement that expires up to batch_size overdue orders and
+    applies the per-business reputation deltas. The orders_expired counts are
+    for the caller to buffer.
+
+    Rows locked by a concurrent sweep or order update are skipped, so several
+    workers can sweep at once. The affected businesses are locked in id order
+    before they are updated, so concurrent sweeps cannot deadlock on each
+    other's businesses. The statement returns one
+    ``(business_id, expired_count, order_ids)`` row per affected business.
+    """
+    due = (
+        select(Order.id)
+        .where(Order.deadline < now, Order.status.in_(ACTIVE_STATUSES))
+        .order_by(Order.deadline)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    expired = (
+        update(Order)
+        .where(Order.id == due.c.id)
+        .values(status=OrderStatus.EXPIRED, updated_at=now)
+        .returning(Order.id, Order.business_id)
+        .cte("expired")
+    )
+    counts = (
+        select(
+            expired.c.business_id,
+            func.count().label("expired_count"),
+            func.array_agg(expired.c.id).label("order_ids"),
+        )
+        .group_by(expired.c.business_id)
+        .cte("expired_counts")
+    )
+    # Without a lock order the update below locks businesses in hash order
+    locked = (
+        select(Business.id)
+        .where(Business.id.in_(select(counts.c.business_id)))
+        .order_by(Business.id)
+        .with_for_update()
+        .cte("locked")
+    )
+    business_update = (
+        update(Business)
+        .where(Business.id == locked.c.id, Business.id == counts.c.business_id)
+        .values(
+            reputation=func.greatest(0, Business.reputation - 2 * counts.c.expired_count),
+            updated_at=now,
+        )
+        .returning(Business.id)
+        .cte("business_update")
+    )
+    return select(counts.c.business_id, counts.c.expired_count, counts.c.order_ids).add_cte(
+        business_update
+    )
+
+
+def expire_overdue_orders(db: Session, batch_size: int) -> Dict[UUID, int]:
+    """Run one expiry sweep and return the number of expired orders per business."""
+    rows = db.execute(build_expiry_statement(datetime.utcnow(), batch_size)).all()
+    db.commit()
+    for row in rows:
+        statistics_buffer.add(row.business_id, orders_expired=row.expired_count)
+    publish_many_business_events(
+        (row.business_id, orders_expired_events(row.order_ids)) for row in rows
+    )
+    return {row.business_id: row.expired_count for row in rows}
+
+
+def sweep(batch_size: int) -> int:
+    """Expire overdue orders in batches until none are left."""
+    total = 0
+    while True:
+        db = SessionLocal()
+        try:
+            expired = sum(expire_overdue_orders(db, batch_size).values())
+        finally:
+            db.close()
+        total += expired
+        if expired < batch_size:
+            return total
+
+
+async def run_expiry_sweeper(
+    interval: float = settings.ORDER_EXPIRY_SWEEP_INTERVAL_SECONDS,
+    batch_size: int = settings.ORDER_EXPIRY_SWEEP_BATCH_SIZE,
+) -> None:
+    """Sweep overdue orders every interval seconds until cancelled."""
+    while True:
+        try:
+            expired = await asyncio.to_thread(sweep, batch_size)
+            if expired:
+                logger.info(f"Expired {expired} overdue orders")
+        except Exception:
+            logger.exception("Order expiry sweep failed")
+        await asyncio.sleep(interval)
+
+
+async def _run_standalone() -> None:
+    # Outside the API the sweeper flushes its own statistics
+    try:
+        await asyncio.gather(run_expiry_sweeper(), run_statistics_flusher())
+    finally:
+        await asyncio.to_thread(flush_statistics)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Starting order expiry sweeper")
+    asyncio.run(_run_standalone())
+
+
+if __name__ == "__main__":
+    main()
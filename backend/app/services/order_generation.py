@@ -0,0 +1,49 @@
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy import Insert, insert
+
+from app.models.order import Order, OrderStatus
+
+# Ranges random orders are drawn from, uniformly
+ORDER_VALUES = range(50, 101)
+ORDER_COMPLEXITIES = range(1, 4)
+ORDER_DEADLINE_MINUTES = range(1, 4)
+
+
+def random_orders(business_id: UUID, product_type: str, count: int) -> List[Dict[str, Any]]:
+    """
+    Draw count random orders for a business.
+
+    Each attribute is drawn for the whole batch in a single call, so a batch
+    costs the same number of RNG calls as a single order.
+    """
+    now = datetime.utcnow()
+    values = random.choices(ORDER_VALUES, k=count)
+    complexities = random.choices(ORDER_COMPLEXITIES, k=count)
+    deadlines = random.choices(ORDER_DEADLINE_MINUTES, k=count)
+    return [
+        {
+            "business_id": business_id,
+            "product_type": product_type,
+            "value": value,
+            "complexity": complexity,
+            "deadline": now + timedelta(minutes=minutes),
+            "status": OrderStatus.PENDING,
+        }
+        for value, complexity, minutes in zip(values, complexities, deadlines)
+    ]
+
+
+def insert_orders_statement() -> Insert:
+    """
+    Multi-row INSERT for order dicts that returns the new order rows in the
+    order they were passed in.
+
+    Plain rows are returned rather than ORM objects so the result survives
+    the commit without a refresh per order.
+    """
+    return insert(Order).returning(*Order.__table__.c, sort_by_parameter_order=True)
+
@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, and_, func, select, update
+
+from app.models.business import Business
+from app.models.order import Order, OrderStatus
+
+# Orders in these states are final and can no longer change status
+TERMINAL_STATUSES = (OrderStatus.SHIPPED, OrderStatus.EXPIRED)
+
+
+def statistics_increments(new_status: OrderStatus, value: int) -> Dict[str, int]:
+    """Statistics increments caused by moving an order worth value to new_status."""
+    if new_status == OrderStatus.COMPLETED:
+        return {"products_created": 1}
+    if new_status == OrderStatus.SHIPPED:
+        return {"orders_shipped": 1, "total_revenue": value}
+    if new_status == OrderStatus.EXPIRED:
+        return {"orders_expired": 1}
+    return {}
+
+
+def _business_side_effects(new_status: OrderStatus, moved: Any) -> Dict[str, Any]:
+    """Business increments caused by moving an order to new_status."""
+    if new_status == OrderStatus.SHIPPED:
+        return {
+            "currency": Business.currency + moved.c.value,
+            "reputation": func.least(100, Business.reputation + 1),
+        }
+    if new_status == OrderStatus.EXPIRED:
+        return {"reputation": func.greatest(0, Business.reputation - 2)}
+    return {}
+
+
+def build_transition_statement(
+    order_id: UUID,
+    new_status: OrderStatus,
+    expected_status: Optional[OrderStatus] = None,
+) -> Select:
+    """
+    Build a single statement that moves an order to new_status and applies the
+    matching business increments. The statistics increments are written
+    behind, see statistics_increments.
+
+    The order row is locked and only updated while it is still in
+    expected_status (or, when that is not given, while it is not terminal and
+    not already in new_status). The statement returns the updated order plus
+    its ``old_status``, or no row when the transition is stale.
+    """
+    # Column onupdate defaults are not applied inside CTEs, so updated_at is
+    # set explicitly on every table the statement touches.
+    now = datetime.utcnow()
+    previous = (
+        select(Order.id, Order.status)
+        .where(Order.id == order_id)
+        .with_for_update()
+        .cte("previous")
+    )
+    if expected_status is not None:
+        guard = previous.c.status == expected_status
+    else:
+        guard = and_(
+            previous.c.status != new_status,
+            previous.c.status.notin_(TERMINAL_STATUSES),
+        )
+
+    moved = (
+        update(Order)
+        .where(Order.id == previous.c.id, guard)
+        .values(status=new_status, updated_at=now)
+        .returning(*Order.__table__.c, previous.c.status.label("old_status"))
+        .cte("moved")
+    )
+
+    statement = select(moved)
+    business_values = _business_side_effects(new_status, moved)
+    if business_values:
+        statement = statement.add_cte(
+            update(Business)
+            .where(Business.id == moved.c.business_id)
+            .values(updated_at=now, **business_values)
+            .returning(Business.id)
+            .cte("business_update")
+        )
+    return statement
@@ -0,0 +1,414 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import Boolean, Float, Integer, String, case, cast, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.business import Business
+from app.models.order import Order, OrderStatus
+from app.models.technology import BusinessTechnology, Technology
+from app.schemas.leaderboard import LeaderboardKind
+from app.services.business_events import (
+    Event,
+    business_delta,
+    order_changed,
+    publish_many_business_events,
+    statistics_delta,
+)
+from app.services.click_batches import PROGRESS_EPSILON
+from app.services.leaderboard import leaderboards
+from app.services.order_expiry import ACTIVE_STATUSES
+from app.services.statistics_buffer import statistics_buffer
+
+logger = logging.getLogger(__name__)
+
+# Catalog technologies that drive the simulation, by name
+AUTO_PRODUCTION = "Auto-Production"
+AUTO_SHIPPING = "Auto-Shipping"
+FASTER_PRODUCTION = "Faster Production"
+FASTER_SHIPPING = "Faster Shipping"
+AUTOMATION_TECHNOLOGIES = (AUTO_PRODUCTION, AUTO_SHIPPING)
+SIMULATED_TECHNOLOGIES = AUTOMATION_TECHNOLOGIES + (FASTER_PRODUCTION, FASTER_SHIPPING)
+
+# Order statuses are held as small integer codes in the order arrays
+STATUSES = list(OrderStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+PENDING = STATUS_CODES[OrderStatus.PENDING]
+IN_PROGRESS = STATUS_CODES[OrderStatus.IN_PROGRESS]
+COMPLETED = STATUS_CODES[OrderStatus.COMPLETED]
+SHIPPED = STATUS_CODES[OrderStatus.SHIPPED]
+
+
+@dataclass
+class SimulationState:
+    """
+    Columnar state of a batch of businesses and their active orders.
+
+    Business arrays are indexed by position in ``business_ids``. Order arrays
+    are indexed by position in ``order_ids``; ``order_business`` holds each
+    order's business position and is sorted, with every business's orders in
+    queue (creation) order.
+    """
+
+    business_ids: List[UUID]
+    # Progress per second from automation, already scaled by efficiency
+    production_rate: np.ndarray
+    shipping_rate: np.ndarray
+    # Seconds since each business was last simulated
+    elapsed: np.ndarray
+
+    order_ids: List[UUID]
+    order_business: np.ndarray
+    complexity: np.ndarray
+    production_progress: np.ndarray
+    shipping_progress: np.ndarray
+    status: np.ndarray
+    value: np.ndarray
+
+
+@dataclass
+class StepResult:
+    """Per-business counters and the orders changed by one step."""
+
+    completed: np.ndarray
+    shipped: np.ndarray
+    revenue: np.ndarray
+    changed: np.ndarray
+
+
+def automation_rates(
+    click_power: np.ndarray,
+    levels: Dict[str, np.ndarray],
+    effects: Dict[str, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Production and shipping progress per second for each business.
+
+    An automation technology at level L clicks ``L * effect_value`` times the
+    manual click rate limit, each click worth the business's click_power.
+    Faster Production/Shipping multiply that by ``1 + L * effect_value``.
+    Manual clicks are not affected.
+    """
+    def rate(automation: str, efficiency: str) -> np.ndarray:
+        clicks = levels[automation] * effects[automation] * settings.CLICK_RATE_LIMIT_PER_SECOND
+        return clicks * click_power * (1.0 + levels[efficiency] * effects[efficiency])
+
+    return rate(AUTO_PRODUCTION, FASTER_PRODUCTION), rate(AUTO_SHIPPING, FASTER_SHIPPING)
+
+
+def _queue_heads(order_business: np.ndarray) -> np.ndarray:
+    """For each order, the position of its business's first order."""
+    if not order_business.size:
+        return order_business
+    starts = np.flatnonzero(np.diff(order_business, prepend=-1))
+    return np.repeat(starts, np.diff(starts, append=order_business.size))
+
+
+def _spend(budget: np.ndarray, order_business: np.ndarray, heads: np.ndarray, need: np.ndarray) -> np.ndarray:
+    """
+    Spend each business's progress budget on its orders' remaining need,
+    oldest first, and return the progress given to each order.
+
+    Orders outside the queue have a need of 0. A running sum of need within
+    each business gives how much of the budget the orders ahead of an order
+    use up; the order gets whatever is left, up to its own need.
+    """
+    ahead = np.cumsum(need) - need
+    ahead -= ahead[heads]
+    return np.clip(budget[order_business] - ahead, 0.0, need)
+
+
+def step(state: SimulationState) -> StepResult:
+    """
+    Advance every business in state by its elapsed time, in place.
+
+    Production progress goes to pending and in-progress orders, completing
+    each one once it reaches its complexity; shipping progress then goes to
+    completed orders, including those completed in this step. This mirrors
+    how click batches spend clicks. Progress left over once a queue is empty
+    is lost.
+    """
+    business = state.order_business
+    complexity = state.complexity
+    businesses = len(state.business_ids)
+    heads = _queue_heads(business)
+
+    producing = (state.status == PENDING) | (state.status == IN_PROGRESS)
+    need = (complexity - state.production_progress) * producing
+    produced = _spend(state.production_rate * state.elapsed, business, heads, need)
+    state.production_progress += produced
+    completed = producing & (need - produced <= PROGRESS_EPSILON)
+    state.production_progress[completed] = complexity[completed]
+    state.status[producing & (produced > 0)] = IN_PROGRESS
+    state.status[completed] = COMPLETED
+
+    queued = state.status == COMPLETED
+    need = (complexity - state.shipping_progress) * queued
+    carried = _spend(state.shipping_rate * state.elapsed, business, heads, need)
+    state.shipping_progress += carried
+    shipped = queued & (need - carried <= PROGRESS_EPSILON)
+    state.shipping_progress[shipped] = complexity[shipped]
+    state.status[shipped] = SHIPPED
+
+    # Weighted bincounts of the whole arrays beat masking them first
+    return StepResult(
+        completed=np.bincount(business, weights=completed, minlength=businesses).astype(np.int64),
+        shipped=np.bincount(business, weights=shipped, minlength=businesses).astype(np.int64),
+        revenue=np.bincount(business, weights=state.value * shipped, minlength=businesses).astype(np.int64),
+        changed=(producing & ((produced > 0) | completed)) | (queued & ((carried > 0) | shipped)),
+    )
+
+
+def load_state(
+    db: Session,
+    now: datetime,
+    batch_size: int,
+    business_id: Optional[UUID] = None,
+) -> Optional[SimulationState]:
+    """
+    Lock up to batch_size automated businesses not yet simulated at now,
+    least recently simulated first, and load them and their active orders.
+    Pass business_id to load only that business.
+
+    Businesses and orders locked elsewhere are skipped until the next tick;
+    a skipped order's share of the step goes to the orders queued behind it.
+    Overdue orders are left for the expiry sweeper. Returns None when no
+    business is due.
+    """
+    automated = (
+        select(BusinessTechnology.business_id)
+        .join(Technology, Technology.id == BusinessTechnology.technology_id)
+        .where(Technology.name.in_(AUTOMATION_TECHNOLOGIES), BusinessTechnology.level > 0)
+    )
+    due = select(Business.id, Business.click_power, Business.simulated_at).where(
+        Business.id.in_(automated),
+        or_(Business.simulated_at.is_(None), Business.simulated_at < now),
+    )
+    if business_id is not None:
+        due = due.where(Business.id == business_id)
+    rows = db.execute(
+        due.order_by(Business.simulated_at.asc().nulls_first())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return None
+
+    business_ids = [row.id for row in rows]
+    positions = {id: position for position, id in enumerate(business_ids)}
+    click_power = np.array([row.click_power or 1.0 for row in rows])
+    # A business is first simulated from the tick that picks it up
+    elapsed = np.array([
+        max((now - row.simulated_at).total_seconds(), 0.0) if row.simulated_at else 0.0
+        for row in rows
+    ])
+
+    levels = {name: np.zeros(len(rows)) for name in SIMULATED_TECHNOLOGIES}
+    effects = {name: np.zeros(len(rows)) for name in SIMULATED_TECHNOLOGIES}
+    for owner_id, name, effect_value, level in db.execute(
+        select(
+            BusinessTechnology.business_id,
+            Technology.name,
+            Technology.effect_value,
+            BusinessTechnology.level,
+        )
+        .join(Technology, Technology.id == BusinessTechnology.technology_id)
+        .where(
+            BusinessTechnology.business_id.in_(business_ids),
+            Technology.name.in_(SIMULATED_TECHNOLOGIES),
+        )
+    ):
+        levels[name][positions[owner_id]] = level
+        effects[name][positions[owner_id]] = effect_value
+    production_rate, shipping_rate = automation_rates(click_power, levels, effects)
+
+    orders = db.execute(
+        select(
+            Order.id,
+            Order.business_id,
+            Order.complexity,
+            Order.production_progress,
+            Order.shipping_progress,
+            Order.status,
+            Order.value,
+        )
+        .where(
+            Order.business_id.in_(business_ids),
+            Order.status.in_(ACTIVE_STATUSES),
+            Order.deadline >= now,
+        )
+        .order_by(Order.created_at, Order.id)
+        # Status changes and the expiry sweeper lock an order before its
+        # business, so waiting on one here could deadlock
+        .with_for_update(skip_locked=True)
+    ).all()
+    order_business = np.array([positions[order.business_id] for order in orders], dtype=np.int64)
+    # Group orders by business; the stable sort keeps each queue in creation order
+    by_business = np.argsort(order_business, kind="stable")
+    orders = [orders[index] for index in by_business]
+
+    return SimulationState(
+        business_ids=business_ids,
+        production_rate=production_rate,
+        shipping_rate=shipping_rate,
+        elapsed=elapsed,
+        order_ids=[order.id for order in orders],
+        order_business=order_business[by_business],
+        complexity=np.array([order.complexity for order in orders], dtype=np.float64),
+        production_progress=np.array([order.production_progress for order in orders], dtype=np.float64),
+        shipping_progress=np.array([order.shipping_progress for order in orders], dtype=np.float64),
+        status=np.array([STATUS_CODES[order.status] for order in orders], dtype=np.int8),
+        value=np.array([order.value for order in orders], dtype=np.int64),
+    )
+
+
+def write_results(db: Session, state: SimulationState, result: StepResult, now: datetime) -> None:
+    """
+    Write a step back with one UPDATE ... FROM (VALUES ...) for orders and
+    one for businesses. Statistics are left to the caller, see
+    step_statistics.
+
+    Every business in the batch is stamped as simulated at now, but only
+    businesses whose orders changed get a new updated_at, so idle ones keep
+    their snapshot ETag.
+    """
+    changed = np.flatnonzero(result.changed)
+    if changed.size:
+        order_rows = values(
+            column("id", PostgresUUID(as_uuid=True)),
+            column("status", String),
+            column("production_progress", Float),
+            column("shipping_progress", Float),
+            name="simulated_order",
+        ).data([
+            (
+                state.order_ids[index],
+                STATUSES[state.status[index]].name,
+                float(state.production_progress[index]),
+                float(state.shipping_progress[index]),
+            )
+            for index in changed
+        ])
+        db.execute(
+            update(Order)
+            .where(Order.id == order_rows.c.id)
+            .values(
+                status=cast(order_rows.c.status, Order.status.type),
+                production_progress=order_rows.c.production_progress,
+                shipping_progress=order_rows.c.shipping_progress,
+                updated_at=now,
+            )
+        )
+
+    touched = np.bincount(state.order_business[changed], minlength=len(state.business_ids)) > 0
+    business_rows = values(
+        column("id", PostgresUUID(as_uuid=True)),
+        column("shipped", Integer),
+        column("revenue", Integer),
+        column("touched", Boolean),
+        name="simulated_business",
+    ).data([
+        (business_id, int(result.shipped[index]), int(result.revenue[index]), bool(touched[index]))
+        for index, business_id in enumerate(state.business_ids)
+    ])
+    db.execute(
+        update(Business)
+        .where(Business.id == business_rows.c.id)
+        .values(
+            currency=Business.currency + business_rows.c.revenue,
+            reputation=func.least(100, Business.reputation + business_rows.c.shipped),
+            simulated_at=now,
+            updated_at=case((business_rows.c.touched, now), else_=Business.updated_at),
+        )
+    )
+
+
+def step_statistics(result: StepResult, index: int) -> Dict[str, int]:
+    """Statistics increments for the business at index."""
+    return {
+        "products_created": int(result.completed[index]),
+        "orders_shipped": int(result.shipped[index]),
+        "total_revenue": int(result.revenue[index]),
+    }
+
+
+def step_events(state: SimulationState, result: StepResult) -> Dict[UUID, List[Event]]:
+    """Events for what a step changed, by business."""
+    events: Dict[UUID, List[Event]] = {}
+    for index in np.flatnonzero(result.changed):
+        business_id = state.business_ids[state.order_business[index]]
+        events.setdefault(business_id, []).append(order_changed(
+            state.order_ids[index],
+            status=STATUSES[state.status[index]].value,
+            production_progress=float(state.production_progress[index]),
+            shipping_progress=float(state.shipping_progress[index]),
+        ))
+    for index in np.flatnonzero(result.completed + result.shipped):
+        revenue = int(result.revenue[index])
+        shipped = int(result.shipped[index])
+        events.setdefault(state.business_ids[index], []).extend(
+            statistics_delta(**step_statistics(result, index))
+            + business_delta(currency=revenue, reputation=shipped)
+        )
+    return events
+
+
+def simulate_batch(db: Session, now: datetime, batch_size: int) -> int:
+    """
+    Load, step and write back one batch of automated businesses in one
+    transaction. Returns the number of businesses simulated.
+    """
+    state = load_state(db, now, batch_size)
+    if state is None:
+        db.rollback()
+        return 0
+    result = step(state)
+    write_results(db, state, result, now)
+    db.commit()
+    for index in np.flatnonzero(result.completed + result.shipped):
+        statistics_buffer.add(state.business_ids[index], **step_statistics(result, index))
+        leaderboards.increment(state.business_ids[index], {
+            LeaderboardKind.PRODUCTS: int(result.completed[index]),
+            LeaderboardKind.SHIPPED: int(result.shipped[index]),
+            LeaderboardKind.REVENUE: int(result.revenue[index]),
+        })
+    publish_many_business_events(step_events(state, result).items())
+    return len(state.business_ids)
+
+
+def tick(batch_size: int) -> int:
+    """Simulate every automated business up to now, in batches."""
+    now = datetime.utcnow()
+    total = 0
+    while True:
+        db = SessionLocal()
+        try:
+            simulated = simulate_batch(db, now, batch_size)
+        finally:
+            db.close()
+        total += simulated
+        if simulated < batch_size:
+            return total
+
+
+async def run_simulation(
+    interval: float = settings.SIMULATION_TICK_SECONDS,
+    batch_size: int = settings.SIMULATION_BATCH_SIZE,
+) -> None:
+    """Tick the simulation every interval seconds until cancelled."""
+    while True:
+        started = time.monotonic()
+        try:
+            await asyncio.to_thread(tick, batch_size)
+        except Exception:
+            logger.exception("Simulation tick failed")
+        await asyncio.sleep(max(interval - (time.monotonic() - started), 0.0))
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Integer, Update, column, update, values
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.statistics import Statistics
+from app.services.statistics_history import build_minute_bucket_statement
+
+logger = logging.getLogger(__name__)
+
+# Statistics counters that are written behind
+COUNTER_COLUMNS = (
+    "orders_received",
+    "products_created",
+    "orders_shipped",
+    "orders_expired",
+    "total_revenue",
+    "total_spent",
+)
+
+Deltas = Dict[str, int]
+T = TypeVar("T")
+P = TypeVar("P")
+
+
+def _add_deltas(target: Dict[UUID, Deltas], business_id: UUID, deltas: Deltas) -> None:
+    totals = target.setdefault(business_id, dict.fromkeys(COUNTER_COLUMNS, 0))
+    for name, value in deltas.items():
+        totals[name] += value
+
+
+def build_flush_statement(deltas: Dict[UUID, Deltas], now: datetime) -> Update:
+    """Build one UPDATE ... FROM (VALUES ...) adding deltas to each business's statistics row."""
+    rows = values(
+        column("business_id", PostgresUUID(as_uuid=True)),
+        *(column(name, Integer) for name in COUNTER_COLUMNS),
+        name="statistics_delta",
+    ).data([
+        (business_id, *(business_deltas[name] for name in COUNTER_COLUMNS))
+        # A stable order keeps concurrent flushes from different workers
+        # from deadlocking on each other's rows
+        for business_id, business_deltas in sorted(deltas.items())
+    ])
+    return (
+        update(Statistics)
+        .where(Statistics.business_id == rows.c.business_id)
+        .values(
+            updated_at=now,
+            **{name: getattr(Statistics, name) + rows.c[name] for name in COUNTER_COLUMNS},
+        )
+    )
+
+
+class StatisticsBuffer:
+    """
+    Per-worker write-behind accumulator for statistics counters.
+
+    Writers add deltas once the change they count is committed, and a
+    background task folds everything added since the last flush into the
+    statistics table with a single statement, so hot businesses no longer
+    queue on their statistics row. Reads on this worker merge the deltas that
+    are not flushed yet. Deltas still buffered when a worker dies are lost.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[UUID, Deltas] = {}
+        # Deltas taken by a flush that has not committed yet
+        self._flushing: Dict[UUID, Deltas] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Seqlock generation, odd while a flush commits
+        self._generation = 0
+        self._committed = threading.Condition(self._lock)
+
+    def add(self, business_id: UUID, **deltas: int) -> None:
+        """Buffer increments to a business's statistics columns."""
+        deltas = {name: value for name, value in deltas.items() if value}
+        if not deltas:
+            return
+        with self._lock:
+            # Some routes take the id as a plain string
+            _add_deltas(self._pending, UUID(str(business_id)), deltas)
+
+    def pending(self, business_id: UUID) -> Optional[Deltas]:
+        """Deltas not yet visible in the statistics table, or None when there are none."""
+        business_id = UUID(str(business_id))
+        with self._lock:
+            sources = [
+                source[business_id] for source in (self._flushing, self._pending) if business_id in source
+            ]
+        if not sources:
+            return None
+        totals: Dict[UUID, Deltas] = {}
+        for deltas in sources:
+            _add_deltas(totals, business_id, deltas)
+        return totals[business_id]
+
+    def _read_consistent(self, read: Callable[[], T], pending: Callable[[], P]) -> Tuple[T, P]:
+        """
+        Call read, which loads statistics from the database, and pending, and
+        return both results once they agree.
+
+        While a flush commits, read may or may not see its deltas, and
+        pending still includes them. read is therefore only started when no
+        commit is in progress, and repeated if one started before pending
+        returned. Only the start of read's statement matters, as that fixes
+        its snapshot.
+        """
+        while True:
+            with self._lock:
+                while self._generation % 2:
+                    self._committed.wait()
+                generation = self._generation
+            result = read()
+            deltas = pending()
+            with self._lock:
+                if self._generation == generation:
+                    return result, deltas
+
+    def read_with_pending(self, business_id: UUID, read: Callable[[], T]) -> Tuple[T, Optional[Deltas]]:
+        """
+        Call read, which loads a business's statistics from the database, and
+        return its result with the deltas it does not include yet.
+        """
+        return self._read_consistent(read, lambda: self.pending(business_id))
+
+    def read_with_pending_all(self, read: Callable[[], T]) -> Tuple[T, Dict[UUID, Deltas]]:
+        """read_with_pending for statistics of any number of businesses."""
+        return self._read_consistent(read, self.pending_all)
+
+    def pending_all(self) -> Dict[UUID, Deltas]:
+        """Every business's deltas not yet visible in the statistics table."""
+        totals: Dict[UUID, Deltas] = {}
+        with self._lock:
+            for source in (self._flushing, self._pending):
+                for business_id, deltas in source.items():
+                    _add_deltas(totals, business_id, deltas)
+        return totals
+
+    def flush(self, db: Session) -> int:
+        """
+        Write every buffered delta in one statement, record it in the current
+        minute's history buckets and commit. Returns the number of businesses
+        written. On failure the deltas are kept for the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._flushing, self._pending = self._pending, {}
+            if not self._flushing:
+                return 0
+            try:
+                now = datetime.utcnow()
+                db.execute(build_flush_statement(self._flushing, now))
+                history = build_minute_bucket_statement(self._flushing, now)
+                if history is not None:
+                    db.execute(history)
+                with self._lock:
+                    self._generation += 1
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    for business_id, deltas in self._flushing.items():
+                        _add_deltas(self._pending, business_id, deltas)
+                    self._flushing = {}
+                    self._end_commit()
+                raise
+            with self._lock:
+                flushed, self._flushing = len(self._flushing), {}
+                self._end_commit()
+            return flushed
+
+    def _end_commit(self) -> None:
+        # Called with _lock held
+        if self._generation % 2:
+            self._generation += 1
+            self._committed.notify_all()
+
+
+statistics_buffer = StatisticsBuffer()
+
+
+def merge_pending(statistics: Any, deltas: Optional[Deltas]) -> Any:
+    """Add pending deltas to statistics read from the database."""
+    if statistics is not None and deltas:
+        for name, value in deltas.items():
+            setattr(statistics, name, getattr(statistics, name) + value)
+    return statistics
+
+
+def flush_statistics() -> int:
+    """Flush the buffer in a session of its own."""
+    db = SessionLocal()
+    try:
+        return statistics_buffer.flush(db)
+    finally:
+        db.close()
+
+
+async def run_statistics_flusher(interval: float = settings.STATISTICS_FLUSH_SECONDS) -> None:
+    """Flush buffered statistics every interval seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(flush_statistics)
+        except Exception:
+            logger.exception("Statistics flush failed")
@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Insert, Integer, Select, and_, cast, column, delete, func, literal, select, values
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, insert
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.business import Business
+from app.models.statistics_bucket import StatisticsBucket
+from app.schemas.statistics import StatisticsPoint, StatisticsSeries
+
+logger = logging.getLogger(__name__)
+
+# Bucket widths in seconds, finest first
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+RESOLUTIONS = (MINUTE, HOUR, DAY)
+
+# Each coarser width is rolled up from the next finer one
+ROLLUPS = ((MINUTE, HOUR, "hour"), (HOUR, DAY, "day"))
+
+# Statistics counters that are kept per bucket
+HISTORY_COLUMNS = (
+    "orders_received",
+    "orders_shipped",
+    "orders_expired",
+    "total_revenue",
+    "total_spent",
+)
+
+# Buckets are stamped before their transaction commits, so each rollup pass
+# re-reads a little of the previous one
+ROLLUP_OVERLAP = timedelta(seconds=5)
+# How far back the first rollup pass of a worker looks
+ROLLUP_CATCHUP = timedelta(days=1)
+
+EPOCH = datetime(1970, 1, 1)
+
+Deltas = Dict[str, int]
+
+
+def bucket_start(moment: datetime, resolution: int) -> datetime:
+    """Start of the bucket of width resolution that contains moment."""
+    seconds = int((moment - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=seconds - seconds % resolution)
+
+
+def _upsert(statement: Select, add: bool) -> Insert:
+    columns = ["id", "created_at", "updated_at", "business_id", "resolution", "bucket_start", *HISTORY_COLUMNS]
+    upsert = insert(StatisticsBucket).from_select(columns, statement)
+    return upsert.on_conflict_do_update(
+        index_elements=["business_id", "resolution", "bucket_start"],
+        set_={
+            "updated_at": upsert.excluded.updated_at,
+            **{
+                name: getattr(StatisticsBucket, name) + upsert.excluded[name] if add else upsert.excluded[name]
+                for name in HISTORY_COLUMNS
+            },
+        },
+    )
+
+
+def build_minute_bucket_statement(deltas: Dict[UUID, Deltas], now: datetime) -> Optional[Insert]:
+    """
+    Build one INSERT ... ON CONFLICT adding deltas to each business's bucket
+    for the current minute, or None when none of them are kept in history.
+    """
+    data = [
+        (business_id, *(business_deltas.get(name, 0) for name in HISTORY_COLUMNS))
+        # Same order as the statistics flush, so the two cannot deadlock
+        for business_id, business_deltas in sorted(deltas.items())
+        if any(business_deltas.get(name) for name in HISTORY_COLUMNS)
+    ]
+    if not data:
+        return None
+    rows = values(
+        column("business_id", PostgresUUID(as_uuid=True)),
+        *(column(name, Integer) for name in HISTORY_COLUMNS),
+        name="history_delta",
+    ).data(data)
+    statement = (
+        select(
+            func.gen_random_uuid(),
+            literal(now),
+            literal(now),
+            rows.c.business_id,
+            literal(MINUTE),
+            literal(bucket_start(now, MINUTE)),
+            *(rows.c[name] for name in HISTORY_COLUMNS),
+        )
+        # Deltas can outlive their business by up to a flush
+        .join(Business, Business.id == rows.c.business_id)
+        .order_by(rows.c.business_id)
+    )
+    return _upsert(statement, add=True)
+
+
+def build_rollup_statement(source: int, target: int, unit: str, since: datetime, now: datetime) -> Insert:
+    """
+    Build one statement recomputing every target bucket that has a source
+    bucket changed since since, from all of its source buckets.
+    """
+    touched = (
+        select(
+            StatisticsBucket.business_id,
+            func.date_trunc(unit, StatisticsBucket.bucket_start).label("bucket_start"),
+        )
+        .where(StatisticsBucket.resolution == source, StatisticsBucket.updated_at > since)
+        .distinct()
+        .cte("touched")
+    )
+    bucket = aliased(StatisticsBucket)
+    statement = (
+        select(
+            func.gen_random_uuid(),
+            literal(now),
+            literal(now),
+            touched.c.business_id,
+            literal(target),
+            touched.c.bucket_start,
+            *(func.sum(getattr(bucket, name)) for name in HISTORY_COLUMNS),
+        )
+        .join(
+            bucket,
+            and_(
+                bucket.business_id == touched.c.business_id,
+                bucket.resolution == source,
+                bucket.bucket_start >= touched.c.bucket_start,
+                bucket.bucket_start < touched.c.bucket_start + timedelta(seconds=target),
+            ),
+        )
+        .group_by(touched.c.business_id, touched.c.bucket_start)
+        .order_by(touched.c.business_id, touched.c.bucket_start)
+    )
+    return _upsert(statement, add=False)
+
+
+def roll_up_statistics(db: Session, since: datetime, now: datetime) -> None:
+    """Roll minute buckets up into hours and hours into days, then drop expired buckets."""
+    for source, target, unit in ROLLUPS:
+        db.execute(build_rollup_statement(source, target, unit, since, now))
+    for resolution, retention in (
+        (MINUTE, timedelta(hours=settings.STATISTICS_MINUTE_RETENTION_HOURS)),
+        (HOUR, timedelta(days=settings.STATISTICS_HOUR_RETENTION_DAYS)),
+    ):
+        db.execute(
+            delete(StatisticsBucket).where(
+                StatisticsBucket.resolution == resolution,
+                StatisticsBucket.bucket_start < now - retention,
+            )
+        )
+    db.commit()
+
+
+def _roll_up(since: datetime, now: datetime) -> None:
+    db = SessionLocal()
+    try:
+        roll_up_statistics(db, since, now)
+    finally:
+        db.close()
+
+
+async def run_statistics_rollup(interval: float = settings.STATISTICS_ROLLUP_SECONDS) -> None:
+    """Roll up statistics history every interval seconds until cancelled."""
+    since = datetime.utcnow() - ROLLUP_CATCHUP
+    while True:
+        now = datetime.utcnow()
+        try:
+            await asyncio.to_thread(_roll_up, since, now)
+            since = now - ROLLUP_OVERLAP
+        except Exception:
+            logger.exception("Statistics rollup failed")
+        await asyncio.sleep(interval)
+
+
+def series_resolution(step: int) -> int:
+    """Coarsest bucket width that evenly divides step."""
+    return next(resolution for resolution in reversed(RESOLUTIONS) if step % resolution == 0)
+
+
+def series_window(start: datetime, end: datetime, step: int) -> Tuple[datetime, int]:
+    """Align start to step and return it with the number of points up to end."""
+    start = bucket_start(start, step)
+    return start, math.ceil((end - start).total_seconds() / step)
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def series_bounds(
+    start: Optional[datetime], end: Optional[datetime], step: int, now: datetime
+) -> Tuple[datetime, datetime]:
+    """
+    Validate a series request, defaulting to the hour up to now. Naive
+    datetimes are taken as UTC. Raises ValueError, with a message for the
+    client, when the request is invalid.
+    """
+    end = _naive_utc(end) if end else now
+    start = _naive_utc(start) if start else end - timedelta(hours=1)
+    if step % MINUTE:
+        raise ValueError("step must be a whole number of minutes")
+    if start >= end:
+        raise ValueError("from must be before to")
+    if series_window(start, end, step)[1] > settings.STATISTICS_SERIES_MAX_POINTS:
+        raise ValueError(f"A series can have at most {settings.STATISTICS_SERIES_MAX_POINTS} points")
+    return start, end
+
+
+def load_series(
+    db: Session,
+    business_id: UUID,
+    start: datetime,
+    end: datetime,
+    step: int,
+    now: datetime,
+) -> Optional[StatisticsSeries]:
+    """
+    Sum a business's statistics history into points step seconds apart,
+    reading only the coarsest buckets that fit step. Increments this worker
+    has not flushed yet count towards the point containing now, the time
+    the request was made. Returns None when the business does not exist.
+    """
+    if db.query(Business.id).filter(Business.id == business_id).first() is None:
+        return None
+    resolution = series_resolution(step)
+    start, count = series_window(start, end, step)
+    end = start + timedelta(seconds=count * step)
+
+    offset = func.extract("epoch", StatisticsBucket.bucket_start) - (start - EPOCH).total_seconds()
+    index = cast(func.floor(offset / step), Integer).label("index")
+    statement = (
+        select(index, *(func.sum(getattr(StatisticsBucket, name)).label(name) for name in HISTORY_COLUMNS))
+        .where(
+            StatisticsBucket.business_id == business_id,
+            StatisticsBucket.resolution == resolution,
+            StatisticsBucket.bucket_start >= start,
+            StatisticsBucket.bucket_start < end,
+        )
+        .group_by(index)
+    )
+    # Imported here, the buffer writes minute buckets with this module
+    from app.services.statistics_buffer import statistics_buffer
+
+    rows, pending = statistics_buffer.read_with_pending(business_id, lambda: db.execute(statement).all())
+
+    points: List[StatisticsPoint] = [
+        StatisticsPoint(start=start + timedelta(seconds=position * step)) for position in range(count)
+    ]
+    for row in rows:
+        point = points[row.index]
+        for name in HISTORY_COLUMNS:
+            setattr(point, name, getattr(row, name))
+    if pending and start <= now < end:
+        point = points[int((now - start).total_seconds()) // step]
+        for name in HISTORY_COLUMNS:
+            setattr(point, name, getattr(point, name) + pending.get(name, 0))
+    return StatisticsSeries(
+        business_id=business_id,
+        start=start,
+        end=end,
+        step=step,
+        resolution=resolution,
+        points=points,
+    )
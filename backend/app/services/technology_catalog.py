@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.catalog_version import CatalogVersion
+from app.models.technology import Technology, TechnologyType
+
+logger = logging.getLogger(__name__)
+
+CATALOG_NAME = "technology"
+
+
+@dataclass(frozen=True)
+class CatalogTechnology:
+    """Immutable snapshot of a technology row."""
+
+    id: UUID
+    name: str
+    description: str
+    type: TechnologyType
+    base_cost: int
+    effect_value: float
+    created_at: datetime
+
+
+class TechnologyCatalog:
+    """
+    In-process cache of the technology catalog.
+
+    The catalog is keyed by technology id and tagged with the version stored
+    in the ``catalogversion`` table. Reads check that version at most once
+    every ``poll_interval`` seconds and reload the whole catalog when another
+    worker has bumped it.
+    """
+
+    def __init__(self, poll_interval: float = settings.TECHNOLOGY_CATALOG_POLL_SECONDS):
+        self.poll_interval = poll_interval
+        self.version: Optional[int] = None
+        self._by_id: Dict[UUID, CatalogTechnology] = {}
+        self._ordered: Tuple[CatalogTechnology, ...] = ()
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _read_version(self, db: Session) -> int:
+        version = (
+            db.query(CatalogVersion.version)
+            .filter(CatalogVersion.name == CATALOG_NAME)
+            .scalar()
+        )
+        return version or 0
+
+    def load(self, db: Session) -> None:
+        """(Re)load the whole catalog from the database."""
+        with self._lock:
+            version = self._read_version(db)
+            technologies = (
+                db.query(Technology)
+                .order_by(Technology.created_at, Technology.id)
+                .all()
+            )
+            ordered = tuple(
+                CatalogTechnology(
+                    id=technology.id,
+                    name=technology.name,
+                    description=technology.description,
+                    type=technology.type,
+                    base_cost=technology.base_cost,
+                    effect_value=technology.effect_value,
+                    created_at=technology.created_at,
+                )
+                for technology in technologies
+            )
+            self._ordered = ordered
+            self._by_id = {technology.id: technology for technology in ordered}
+            self.version = version
+            self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Force a reload on the next read."""
+        with self._lock:
+            self.version = None
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if self.version is None:
+            self.load(db)
+            return
+        if time.monotonic() - self._checked_at < self.poll_interval:
+            return
+        self._checked_at = time.monotonic()
+        if self._read_version(db) != self.version:
+            self.load(db)
+
+    def get(self, db: Session, technology_id: UUID) -> Optional[CatalogTechnology]:
+        """Look up a technology by id."""
+        self._ensure_fresh(db)
+        return self._by_id.get(technology_id)
+
+    def all(self, db: Session) -> List[CatalogTechnology]:
+        """Return every technology, ordered by creation time."""
+        self._ensure_fresh(db)
+        return list(self._ordered)
+
+    @staticmethod
+    def bump_version(db: Session) -> None:
+        """
+        Bump the catalog version in the caller's transaction so that all
+        workers reload the catalog once it commits.
+        """
+        statement = insert(CatalogVersion).values(name=CATALOG_NAME, version=1)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[CatalogVersion.name],
+                set_={"version": CatalogVersion.version + 1},
+            )
+        )
+
+
+technology_catalog = TechnologyCatalog()
+
+
+def load_technology_catalog() -> None:
+    """Warm the catalog cache at startup; reads fall back to loading lazily."""
+    db = SessionLocal()
+    try:
+        technology_catalog.load(db)
+        logger.info(f"Loaded {len(technology_catalog.all(db))} technologies into the catalog cache")
+    except Exception:
+        logger.exception("Could not preload the technology catalog")
+    finally:
+        db.close()
@@ -0,0 +1,95 @@
+"""
+Measure the per-request cost of resolving the current user.
+
+Resolves one bearer token through ``app.api.deps.get_current_user`` many
+times with the principal cache disabled (decode the JWT and SELECT the user
+on every request) and enabled, and reports latency and DB statements per
+call::
+
+    cd backend
+    python -m benchmarks.auth --iterations 5000 --output auth-results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="PostgreSQL URL to benchmark against (default: $DATABASE_URL)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="write results to this JSON file")
+    return parser.parse_args(argv)
+
+
+async def measure(get_current_user, token: str, iterations: int, query_counter) -> Dict[str, Any]:
+    from benchmarks.scenarios import percentiles
+
+    timings = []
+    queries_before = query_counter.count
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await get_current_user(token)
+        timings.append(time.perf_counter() - started)
+    queries = query_counter.count - queries_before
+    latency = percentiles(timings, scale=1_000_000)
+    latency["mean"] = round(sum(timings) / len(timings) * 1_000_000, 3)
+    return {
+        "iterations": iterations,
+        "latency_us": latency,
+        "queries_per_request": round(queries / iterations, 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from app.api.deps import get_current_user
+    from app.core.auth_cache import principal_cache
+    from app.core.database import SessionLocal, engine
+    from app.core.query_count import QueryCounter
+    from app.core.security import create_access_token
+    from app.models.user import User
+    from benchmarks.run import migrate
+
+    migrate()
+    db = SessionLocal()
+    try:
+        user = User(email=f"bench-auth-{uuid.uuid4().hex[:8]}@example.com", hashed_password="!")
+        db.add(user)
+        db.commit()
+        token = create_access_token(user.id)
+    finally:
+        db.close()
+    query_counter = QueryCounter([engine])
+
+    results = {}
+    ttl = principal_cache.ttl
+    for name, mode_ttl in (("uncached", 0), ("cached", ttl or 60.0)):
+        principal_cache.clear()
+        principal_cache.ttl = mode_ttl
+        results[name] = asyncio.run(measure(get_current_user, token, args.iterations, query_counter))
+        latency = results[name]["latency_us"]
+        print(
+            f"{name:10} mean {latency['mean']:>9.1f}us  p50 {latency['p50']:>9.1f}us  "
+            f"p99 {latency['p99']:>9.1f}us  {results[name]['queries_per_request']:.2f} q/req"
+        )
+    principal_cache.ttl = ttl
+    saved = results["uncached"]["latency_us"]["mean"] - results["cached"]["latency_us"]["mean"]
+    print(f"cache saves {saved:.1f}us per authenticated request")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"get_current_user": results, "saved_us_per_request": round(saved, 3)}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
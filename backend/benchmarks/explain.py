@@ -0,0 +1,157 @@
+"""
+Check that the hot endpoint and background queries are served by their indexes.
+
+Migrates the database in DATABASE_URL, then EXPLAINs each query, built the
+way the app builds it, and asserts that its plan scans the index named next
+to it. Nothing is executed. By default sequential scans are disabled for the
+session, so the check passes on an empty database as long as the index can
+serve the query. Pass --real-costs against a database with realistic volume
+(see ``python -m app.initial_data seed_world``) to check the planner picks
+the index on its own::
+
+    cd backend
+    python -m benchmarks.explain
+    python -m benchmarks.explain --real-costs --verbose
+
+Exits non-zero if any query does not use its index.
+"""
+import argparse
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Tuple, Union
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="PostgreSQL URL to check against (default: $DATABASE_URL)")
+    parser.add_argument("--real-costs", action="store_true",
+                        help="leave sequential scans enabled, for databases with realistic volume")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+    if args.database_url and not args.database_url.startswith(("postgres://", "postgresql")):
+        parser.error("the schema uses PostgreSQL-only features; --database-url must be PostgreSQL")
+    return args
+
+
+def queries() -> List[Tuple[str, Any, Union[str, Tuple[str, ...]]]]:
+    """``(name, statement, index)`` for every checked query; index may list alternatives."""
+    from sqlalchemy import select
+
+    from app.core.pagination import paginate
+    from app.models.business import Business
+    from app.models.order import Order, OrderArchive, OrderStatus
+    from app.models.statistics import Statistics
+    from app.models.statistics_bucket import StatisticsBucket
+    from app.models.technology import BusinessTechnology, Technology
+    from app.models.user import User
+    from app.services.order_archive import build_archive_statement
+    from app.services.order_expiry import ACTIVE_STATUSES, build_expiry_statement
+    from app.services.statistics_history import MINUTE
+
+    # Any ids and times will do: the plan does not depend on them
+    business_id = uuid.uuid4()
+    now = datetime.utcnow()
+    return [
+        ("orders of a business, by page",
+         paginate(select(Order).where(Order.business_id == business_id), Order, None, 0, 50),
+         "ix_order_business_id_created_at_id"),
+        ("active orders of a business",
+         select(Order).where(Order.business_id == business_id, Order.status.in_(ACTIVE_STATUSES)),
+         "ix_order_business_id_status"),
+        ("orders of a business in one status",
+         select(Order).where(Order.business_id == business_id, Order.status == OrderStatus.PENDING),
+         "ix_order_business_id_status"),
+        ("expiry sweep", build_expiry_statement(now, 500), "ix_order_deadline_active"),
+        ("order archiver", build_archive_statement(now - timedelta(minutes=5), now, 1000),
+         "ix_order_updated_at_terminal"),
+        ("archived orders of a business, by page",
+         paginate(select(OrderArchive).where(OrderArchive.business_id == business_id), OrderArchive, None, 0, 50),
+         "ix_orderarchive_business_id_created_at_id"),
+        ("businesses of an owner", select(Business).where(Business.owner_id == business_id),
+         "ix_business_owner_id"),
+        ("businesses, by page", paginate(select(Business), Business, None, 0, 50),
+         "ix_business_created_at_id"),
+        ("users, by page", paginate(select(User), User, None, 0, 50), "ix_user_created_at_id"),
+        ("statistics of a business", select(Statistics).where(Statistics.business_id == business_id),
+         "statistics_business_id_key"),
+        ("leaderboard sync", select(Statistics).where(Statistics.updated_at > now - timedelta(seconds=5)),
+         "ix_statistics_updated_at"),
+        ("technology of a business",
+         select(BusinessTechnology).where(
+             BusinessTechnology.business_id == business_id,
+             BusinessTechnology.technology_id == business_id,
+         ),
+         "ix_businesstechnology_business_id_technology_id"),
+        ("technologies of a business",
+         select(BusinessTechnology).where(BusinessTechnology.business_id == business_id),
+         "ix_businesstechnology_business_id_technology_id"),
+        ("technology by name", select(Technology).where(Technology.name == "Auto-Production"),
+         "ix_technology_name"),
+        ("statistics series",
+         select(StatisticsBucket).where(
+             StatisticsBucket.business_id == business_id,
+             StatisticsBucket.resolution == MINUTE,
+             StatisticsBucket.bucket_start >= now - timedelta(hours=1),
+         ),
+         # Both cover the range; only table statistics tell them apart
+         ("ix_statisticsbucket_business_id_resolution_bucket_start",
+          "ix_statisticsbucket_resolution_bucket_start")),
+        ("statistics rollup",
+         select(StatisticsBucket.business_id).where(
+             StatisticsBucket.resolution == MINUTE,
+             StatisticsBucket.updated_at > now - timedelta(minutes=1),
+         ),
+         "ix_statisticsbucket_resolution_updated_at"),
+    ]
+
+
+def explain(connection: Any, statement: Any) -> str:
+    from sqlalchemy import text
+    from sqlalchemy.dialects import postgresql
+
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return "\n".join(row[0] for row in connection.execute(text(f"EXPLAIN {sql}")))
+
+
+def uses_index(plan: str, indexes: Union[str, Tuple[str, ...]]) -> bool:
+    if isinstance(indexes, str):
+        indexes = (indexes,)
+    # "Index Scan using", "Index Only Scan using" or "Bitmap Index Scan on"
+    return any(
+        "Index" in line and f" {index} " in f"{line} " for line in plan.splitlines() for index in indexes
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from sqlalchemy import text
+
+    from app.core.database import engine
+    from benchmarks.run import migrate
+
+    migrate()
+    failures = []
+    with engine.connect() as connection:
+        if not args.real_costs:
+            connection.execute(text("SET enable_seqscan = off"))
+        for name, statement, index in queries():
+            plan = explain(connection, statement)
+            ok = uses_index(plan, index)
+            print(f"{'ok' if ok else 'FAIL':<4}  {name:<40} {index if isinstance(index, str) else ' or '.join(index)}")
+            if args.verbose or not ok:
+                print("      " + plan.replace("\n", "\n      "))
+            if not ok:
+                failures.append(name)
+        connection.rollback()
+    if failures:
+        sys.exit(f"{len(failures)} queries do not use their index: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
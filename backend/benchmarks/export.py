@@ -0,0 +1,154 @@
+"""
+Check that exporting a business's orders streams in constant memory.
+
+Migrates the database in DATABASE_URL and seeds one business with many
+orders, a share of them archived, with INSERT ... SELECT on the server so
+the seed itself costs no client memory. The app is then served by uvicorn
+in this process and the export is downloaded in every format. Chunks are
+discarded as they arrive. The growth of the process's peak RSS must stay
+under --max-rss-mb, otherwise the run exits non-zero::
+
+    cd backend
+    python -m benchmarks.export --orders 1000000 --max-rss-mb 64
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="PostgreSQL URL to benchmark against (default: $DATABASE_URL)")
+    parser.add_argument("--orders", type=int, default=1000000, help="orders to seed for the business")
+    parser.add_argument("--archived", type=float, default=0.5, help="share of the orders seeded into the archive")
+    parser.add_argument("--formats", nargs="+", default=["ndjson", "csv"], choices=["ndjson", "csv"])
+    parser.add_argument("--async-endpoints", action="store_true", help="serve the async routers")
+    parser.add_argument("--max-rss-mb", type=float, default=64.0,
+                        help="allowed growth of the peak RSS over the whole export")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    if args.database_url and not args.database_url.startswith(("postgres://", "postgresql")):
+        parser.error("the schema uses PostgreSQL-only features; --database-url must be PostgreSQL")
+    return args
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Settings are read at import time, so set them before importing the app."""
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DB_ASYNC_ENDPOINTS"] = "true" if args.async_endpoints else "false"
+    os.environ["ORDER_EXPIRY_SWEEPER_ENABLED"] = "false"
+    os.environ["SIMULATION_ENABLED"] = "false"
+    os.environ["ORDER_ARCHIVE_ENABLED"] = "false"
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed_orders(business_id, count: int, archived: int) -> None:
+    """Insert count orders for business_id, the first archived of them into the archive."""
+    from sqlalchemy import text
+
+    from app.core.database import SessionLocal
+
+    columns = """
+        gen_random_uuid(), now() - make_interval(secs => {count} - i), now(), :business_id,
+        'widget', 'SHIPPED', 10 + i % 50, 1 + i % 5, now(), 1.0, 1.0
+    """.format(count=count)
+    db = SessionLocal()
+    try:
+        db.execute(text(f"""
+            INSERT INTO orderarchive (id, created_at, updated_at, business_id, product_type, status,
+                                      value, complexity, deadline, production_progress,
+                                      shipping_progress, archived_at)
+            SELECT {columns}, now() FROM generate_series(1, :archived) AS i
+        """), {"business_id": business_id, "archived": archived})
+        db.execute(text(f"""
+            INSERT INTO "order" (id, created_at, updated_at, business_id, product_type, status,
+                                 value, complexity, deadline, production_progress, shipping_progress)
+            SELECT {columns} FROM generate_series(:archived + 1, :count) AS i
+        """), {"business_id": business_id, "archived": archived, "count": count})
+        db.execute(text('ANALYZE "order"'))
+        db.execute(text("ANALYZE orderarchive"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def download(url: str) -> Dict[str, Any]:
+    import httpx
+
+    started = time.perf_counter()
+    size = lines = 0
+    with httpx.stream("GET", url, timeout=None) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            size += len(chunk)
+            lines += chunk.count(b"\n")
+    return {"seconds": time.perf_counter() - started, "bytes": size, "lines": lines}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    configure_environment(args)
+
+    from app.core.database import SessionLocal
+    from app.initial_data import create_players
+    from app.main import app
+    from benchmarks.run import migrate
+    from benchmarks.server import AppServer
+
+    migrate()
+    db = SessionLocal()
+    try:
+        [(_, warmup_id), (_, business_id)] = create_players(db, 2, email_prefix=f"bench-export-{os.getpid()}-")
+    finally:
+        db.close()
+    seed_orders(warmup_id, 1000, 500)
+    seed_orders(business_id, args.orders, int(args.orders * args.archived))
+
+    server = AppServer(app, port=args.port)
+    server.start()
+    report: Dict[str, Any] = {"orders": args.orders, "formats": {}}
+    try:
+        # Small exports first, so the growth below is the large export's alone
+        for export_format in args.formats:
+            download(f"{server.url}/api/v1/orders/business/{warmup_id}/export?format={export_format}")
+        baseline = peak_rss_mb()
+        for export_format in args.formats:
+            url = f"{server.url}/api/v1/orders/business/{business_id}/export?format={export_format}"
+            result = download(url)
+            result["rows"] = result["lines"] - (1 if export_format == "csv" else 0)
+            result["rows_per_second"] = round(result["rows"] / result["seconds"])
+            report["formats"][export_format] = result
+            print(
+                f"{export_format:<7} {result['rows']:>9} rows  {result['bytes'] / 2 ** 20:>8.1f} MB  "
+                f"{result['seconds']:>6.1f}s  {result['rows_per_second']:>8} rows/s"
+            )
+            if result["rows"] != args.orders:
+                sys.exit(f"{export_format} export returned {result['rows']} rows, expected {args.orders}")
+        growth = peak_rss_mb() - baseline
+    finally:
+        server.stop()
+
+    report["baseline_rss_mb"] = round(baseline, 1)
+    report["rss_growth_mb"] = round(growth, 1)
+    print(f"peak RSS {baseline:.1f} MB before the exports, +{growth:.1f} MB during them")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    if growth > args.max_rss_mb:
+        sys.exit(f"peak RSS grew by {growth:.1f} MB, more than the allowed {args.max_rss_mb} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Measure the overhead of request metrics.
+
+End-to-end timings vary by more than the few percent being measured, so the
+instrumentation is timed in isolation instead:
+
+* the middleware, around a no-op ASGI app, against the bare app;
+* the cursor hooks, as ``SELECT 1`` on the database in DATABASE_URL with and
+  without them.
+
+Each cost is then taken as a share of a real request. Businesses are read
+through the app in process, with metrics on, to get the median request time
+and the statements per request::
+
+    cd backend
+    python -m benchmarks.metrics --iterations 20000 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="PostgreSQL URL to benchmark against (default: $DATABASE_URL)")
+    parser.add_argument("--iterations", type=int, default=20000, help="calls per micro-benchmark sample")
+    parser.add_argument("--requests", type=int, default=2000, help="business reads to time")
+    parser.add_argument("--samples", type=int, default=7, help="samples per micro-benchmark; the fastest is kept")
+    parser.add_argument("--output", help="write results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Settings are read at import time, so set them before importing the app."""
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ["METRICS_ENABLED"] = "true"
+    os.environ["ORDER_EXPIRY_SWEEPER_ENABLED"] = "false"
+    os.environ["SIMULATION_ENABLED"] = "false"
+    os.environ["ORDER_ARCHIVE_ENABLED"] = "false"
+    os.environ["PASSWORD_HASH_WORKERS"] = "0"
+    os.environ["BCRYPT_ROUNDS"] = "4"
+
+
+def fastest(call: Callable[[], Any], iterations: int, samples: int) -> float:
+    """Seconds per call, from the fastest of several samples."""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        timings.append((time.perf_counter() - started) / iterations)
+    return min(timings)
+
+
+async def fastest_async(call: Callable[[], Awaitable[Any]], iterations: int, samples: int) -> float:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await call()
+        timings.append((time.perf_counter() - started) / iterations)
+    return min(timings)
+
+
+async def middleware_cost(iterations: int, samples: int) -> float:
+    """Seconds MetricsMiddleware adds to a request."""
+    from app.core.instrumentation import MetricsMiddleware
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/"}
+    middleware = MetricsMiddleware(app)
+    bare = await fastest_async(lambda: app(scope, receive, send), iterations, samples)
+    instrumented = await fastest_async(lambda: middleware(scope, receive, send), iterations, samples)
+    return instrumented - bare
+
+
+def hook_cost(iterations: int, samples: int) -> float:
+    """Seconds the cursor hooks add to a statement."""
+    from sqlalchemy import create_engine, event, text
+
+    from app.core.config import settings
+    from app.core.instrumentation import _after_cursor_execute, _before_cursor_execute, instrument_engine
+
+    engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    statement = text("SELECT 1")
+    with engine.connect() as connection:
+        bare = fastest(lambda: connection.execute(statement), iterations, samples)
+    instrument_engine(engine)
+    with engine.connect() as connection:
+        instrumented = fastest(lambda: connection.execute(statement), iterations, samples)
+    event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+    engine.dispose()
+    return instrumented - bare
+
+
+async def business_reads(requests: int) -> Dict[str, float]:
+    """Median seconds per business read and the statements each one runs."""
+    import httpx
+
+    from app.core.instrumentation import request_statements
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        registered = await client.post(
+            "/api/v1/auth/register",
+            json={"email": f"metrics-{uuid.uuid4().hex}@example.com", "password": "benchmark"},
+        )
+        token = registered.raise_for_status().json()["access_token"]
+        business = await client.post(
+            "/api/v1/businesses/",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"name": "Metrics", "product_type": "widgets"},
+        )
+        path = f"/api/v1/businesses/{business.raise_for_status().json()['id']}"
+        for _ in range(requests // 10):
+            (await client.get(path)).raise_for_status()
+
+        statements = request_statements.labels("GET", "/api/v1/businesses/{business_id}")
+        statements.reset()
+        durations = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            (await client.get(path)).raise_for_status()
+            durations.append(time.perf_counter() - started)
+        snapshot = statements.snapshot()
+    return {"seconds": statistics.median(durations), "statements": snapshot["sum"] / snapshot["count"]}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    configure_environment(args)
+
+    middleware = asyncio.run(middleware_cost(args.iterations, args.samples))
+    hooks = hook_cost(args.iterations // 10, args.samples)
+    reads = asyncio.run(business_reads(args.requests))
+    overhead = middleware + hooks * reads["statements"]
+    report = {
+        "middleware_us": round(middleware * 1e6, 2),
+        "hooks_per_statement_us": round(hooks * 1e6, 2),
+        "business_read_us": round(reads["seconds"] * 1e6, 1),
+        "statements_per_read": reads["statements"],
+        "overhead_us": round(overhead * 1e6, 2),
+        "overhead_percent": round(overhead / reads["seconds"] * 100, 2),
+    }
+    print(f"middleware     {report['middleware_us']:>9.2f}us per request")
+    print(f"cursor hooks   {report['hooks_per_statement_us']:>9.2f}us per statement")
+    print(f"business read  {report['business_read_us']:>9.1f}us, {report['statements_per_read']:.1f} statements")
+    print(f"overhead       {report['overhead_us']:>9.2f}us ({report['overhead_percent']:.2f}%)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
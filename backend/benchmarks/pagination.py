@@ -0,0 +1,131 @@
+"""
+Compare offset and cursor pagination of a business's orders.
+
+Migrates the database in DATABASE_URL, seeds one business with many orders
+and times fetching a page at increasing depths through
+``app.core.pagination.paginate``, once with ``skip`` and once with the cursor
+of the row just before the page::
+
+    cd backend
+    python -m benchmarks.pagination --orders 20000 --output pagination-results.json
+"""
+import argparse
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="PostgreSQL URL to benchmark against (default: $DATABASE_URL)")
+    parser.add_argument("--orders", type=int, default=20000, help="orders to seed for the business")
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 1000, 5000, 10000, 19000],
+                        help="rows before the page")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    if args.database_url and not args.database_url.startswith(("postgres://", "postgresql")):
+        parser.error("the schema uses PostgreSQL-only features; --database-url must be PostgreSQL")
+    return args
+
+
+def seed_orders(db, business_id: uuid.UUID, count: int) -> None:
+    from app.models.order import Order, OrderStatus
+
+    now = datetime.utcnow()
+    db.bulk_insert_mappings(Order, [
+        {
+            "id": uuid.uuid4(),
+            "business_id": business_id,
+            "product_type": "widget",
+            "status": OrderStatus.SHIPPED,
+            "value": 10,
+            "complexity": 1,
+            "deadline": now,
+            "production_progress": 0.0,
+            "shipping_progress": 0.0,
+            "created_at": now - timedelta(seconds=count - i),
+            "updated_at": now,
+        }
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def time_page(query_for_page, iterations: int) -> Dict[str, float]:
+    from benchmarks.scenarios import percentiles
+
+    query_for_page().all()
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        query_for_page().all()
+        latencies.append(time.perf_counter() - started)
+    return percentiles(latencies, points=(50, 95))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from sqlalchemy import text
+
+    from app.core.database import SessionLocal
+    from app.core.pagination import encode_cursor, paginate
+    from app.initial_data import create_players
+    from app.models.order import Order
+    from benchmarks.run import migrate
+
+    migrate()
+    db = SessionLocal()
+    try:
+        [(_, business_id)] = create_players(db, 1, email_prefix=f"bench-pages-{uuid.uuid4().hex[:8]}-")
+        seed_orders(db, business_id, args.orders)
+        db.execute(text('ANALYZE "order"'))
+        db.commit()
+
+        rows = (
+            db.query(Order.created_at, Order.id)
+            .filter(Order.business_id == business_id)
+            .order_by(Order.created_at, Order.id)
+            .all()
+        )
+        report = {"orders": args.orders, "limit": args.limit, "iterations": args.iterations, "depths": {}}
+        for depth in args.depths:
+            depth = min(depth, len(rows) - args.limit)
+            cursor = encode_cursor(*rows[depth - 1]) if depth else None
+
+            def offset_page():
+                return paginate(db.query(Order).filter(Order.business_id == business_id), Order, None, depth, args.limit)
+
+            def cursor_page():
+                return paginate(db.query(Order).filter(Order.business_id == business_id), Order, cursor, 0, args.limit)
+
+            # Both paths must return the same page
+            assert [o.id for o in offset_page().all()] == [o.id for o in cursor_page().all()]
+            result = {
+                "offset_ms": time_page(offset_page, args.iterations),
+                "cursor_ms": time_page(cursor_page, args.iterations),
+            }
+            report["depths"][depth] = result
+            print(
+                f"depth {depth:>7}  offset p50 {result['offset_ms']['p50']:>7.2f}ms  "
+                f"cursor p50 {result['cursor_ms']['p50']:>7.2f}ms"
+            )
+    finally:
+        db.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
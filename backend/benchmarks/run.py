@@ -0,0 +1,231 @@
+"""
+Benchmark the API end to end.
+
+Starts ``app.main:app`` under uvicorn in this process against the database in
+DATABASE_URL, migrates it, seeds players through ``app.initial_data`` and
+drives each scenario with a fixed number of concurrent clients. Results are
+printed and written as JSON, e.g.::
+
+    cd backend
+    python -m benchmarks.run --players 200 --concurrency 32 --operations 2000 \
+        --output benchmark-results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    from benchmarks.scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="PostgreSQL URL to benchmark against (default: $DATABASE_URL)")
+    parser.add_argument("--players", type=int, default=100, help="users/businesses to seed")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients per scenario")
+    parser.add_argument("--operations", type=int, default=1000, help="operations per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="unrecorded operations per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--async-endpoints", action="store_true", help="serve routers from the async session")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0, help="random seed for scenario choices")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    if args.database_url and not args.database_url.startswith(("postgres://", "postgresql")):
+        parser.error("the schema uses PostgreSQL-only features; --database-url must be PostgreSQL")
+    return args
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Settings are read at import time, so set them before importing the app."""
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DB_ASYNC_ENDPOINTS"] = "true" if args.async_endpoints else "false"
+    # Keep background work out of the measurements
+    os.environ["ORDER_EXPIRY_SWEEPER_ENABLED"] = "false"
+    os.environ["SIMULATION_ENABLED"] = "false"
+    os.environ["ORDER_ARCHIVE_ENABLED"] = "false"
+    os.environ["LEADERBOARD_SYNC_SECONDS"] = "3600"
+
+
+def migrate() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    command.upgrade(config, "head")
+
+
+def seed(players: int, password: str) -> List[Any]:
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+    from app.initial_data import create_players, init_db
+    from app.models.business import Business
+    from benchmarks.scenarios import Player
+
+    db = SessionLocal()
+    try:
+        init_db(db)
+        prefix = f"bench-{uuid.uuid4().hex[:8]}-"
+        created = create_players(db, players, email_prefix=prefix, password=password, currency=10 ** 9)
+        owners = dict(
+            db.query(Business.id, Business.owner_id)
+            .filter(Business.id.in_([business_id for _, business_id in created]))
+            .all()
+        )
+    finally:
+        db.close()
+    return [
+        Player(email=email, business_id=business_id, token=create_access_token(owners[business_id]))
+        for email, business_id in created
+    ]
+
+
+async def run_scenario(
+    base_url: str,
+    scenario,
+    context,
+    operations: int,
+    concurrency: int,
+    query_counter,
+) -> Dict[str, Any]:
+    import httpx
+
+    from benchmarks.scenarios import Recorder, percentiles
+
+    recorder = Recorder()
+    remaining = operations
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async def worker(index: int, client: httpx.AsyncClient) -> None:
+        nonlocal remaining
+        # Each worker owns a disjoint slice of players, so per-player state
+        # (such as owned technologies) is never raced.
+        players = context.players[index::concurrency] or context.players
+        turn = 0
+        while remaining > 0:
+            remaining -= 1
+            await scenario(client, recorder, context, players[turn % len(players)])
+            turn += 1
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        queries_before = query_counter.count
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(index, client) for index in range(concurrency)))
+        duration = time.perf_counter() - started
+        queries = query_counter.count - queries_before
+
+    requests = len(recorder.latencies)
+    latency = percentiles(recorder.latencies)
+    latency["mean"] = round(sum(recorder.latencies) / requests * 1000, 3) if requests else 0.0
+    latency["max"] = round(max(recorder.latencies, default=0.0) * 1000, 3)
+    return {
+        "operations": operations,
+        "requests": requests,
+        "errors": recorder.errors,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(requests / duration, 1) if duration else 0.0,
+        "latency_ms": latency,
+        "queries_per_request": round(queries / requests, 2) if requests else 0.0,
+    }
+
+
+async def run(args: argparse.Namespace, base_url: str, players, query_counter) -> Dict[str, Any]:
+    import httpx
+
+    from benchmarks.scenarios import SCENARIOS, Context
+
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.get("/api/v1/technologies/")
+        response.raise_for_status()
+        technology_ids = [technology["id"] for technology in response.json()]
+
+    results = {}
+    for name in args.scenarios:
+        context = Context(
+            password="bench",
+            players=players,
+            technology_ids=technology_ids,
+            rng=random.Random(args.seed),
+        )
+        if args.warmup:
+            await run_scenario(base_url, SCENARIOS[name], context, args.warmup, args.concurrency, query_counter)
+        results[name] = await run_scenario(
+            base_url, SCENARIOS[name], context, args.operations, args.concurrency, query_counter
+        )
+        print_result(name, results[name])
+    return results
+
+
+def print_result(name: str, result: Dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"{name:32} {result['throughput_rps']:>9.1f} req/s  "
+        f"p50 {latency['p50']:>8.2f}ms  p95 {latency['p95']:>8.2f}ms  p99 {latency['p99']:>8.2f}ms  "
+        f"{result['queries_per_request']:>5.2f} q/req  {result['errors']} errors"
+    )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    configure_environment(args)
+    started_at = datetime.now(timezone.utc)
+
+    from app.core.database import async_engine, engine
+    from app.main import app
+    from app.core.query_count import QueryCounter
+    from benchmarks.server import AppServer
+
+    migrate()
+    players = seed(args.players, "bench")
+    query_counter = QueryCounter([engine, async_engine.sync_engine])
+
+    server = AppServer(app, port=args.port)
+    server.start()
+    try:
+        results = asyncio.run(run(args, server.url, players, query_counter))
+    finally:
+        server.stop()
+
+    report = {
+        "run": {
+            "started_at": started_at.isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "database": engine.url.render_as_string(hide_password=True),
+            "async_endpoints": args.async_endpoints,
+            "players": args.players,
+            "concurrency": args.concurrency,
+            "operations": args.operations,
+            "warmup": args.warmup,
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
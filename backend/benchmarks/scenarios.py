@@ -0,0 +1,133 @@
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+from uuid import UUID
+
+import httpx
+
+API = "/api/v1"
+
+
+@dataclass
+class Recorder:
+    """Latency and error tally for one scenario."""
+
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors += 1
+        return response
+
+
+@dataclass
+class Player:
+    """A seeded user and their business, owned by a single worker."""
+
+    email: str
+    business_id: UUID
+    token: str
+    technologies: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class Context:
+    password: str
+    players: List[Player]
+    technology_ids: List[str]
+    rng: random.Random
+    registered: Set[str] = field(default_factory=set)
+
+
+Scenario = Callable[[httpx.AsyncClient, Recorder, Context, Player], Awaitable[None]]
+
+
+async def register_login(client: httpx.AsyncClient, recorder: Recorder, context: Context, player: Player) -> None:
+    email = f"bench-{uuid.uuid4().hex}@example.com"
+    await recorder.request(
+        client, "POST", f"{API}/auth/register",
+        json={"email": email, "password": context.password},
+    )
+    await recorder.request(
+        client, "POST", f"{API}/auth/login",
+        data={"username": email, "password": context.password},
+    )
+
+
+async def generate_orders(client: httpx.AsyncClient, recorder: Recorder, context: Context, player: Player) -> None:
+    await recorder.request(client, "POST", f"{API}/orders/generate/{player.business_id}")
+
+
+async def ship_orders(client: httpx.AsyncClient, recorder: Recorder, context: Context, player: Player) -> None:
+    response = await recorder.request(client, "POST", f"{API}/orders/generate/{player.business_id}")
+    if response.status_code >= 400:
+        return
+    order_id = response.json()["id"]
+    for order_status in ("completed", "shipped"):
+        await recorder.request(
+            client, "PUT", f"{API}/orders/{order_id}", json={"status": order_status}
+        )
+
+
+async def purchase_upgrade_technologies(
+    client: httpx.AsyncClient, recorder: Recorder, context: Context, player: Player
+) -> None:
+    technology_id = context.rng.choice(context.technology_ids)
+    level = player.technologies.get(technology_id)
+    if level is None:
+        response = await recorder.request(
+            client, "POST", f"{API}/technologies/business/{player.business_id}",
+            json={"technology_id": technology_id, "level": 1},
+        )
+        if response.status_code < 400:
+            player.technologies[technology_id] = 1
+    else:
+        response = await recorder.request(
+            client, "PUT", f"{API}/technologies/business/{player.business_id}/{technology_id}",
+            json={"level": level + 1},
+        )
+        if response.status_code < 400:
+            player.technologies[technology_id] = level + 1
+
+
+async def read_leaderboards(client: httpx.AsyncClient, recorder: Recorder, context: Context, player: Player) -> None:
+    kind = context.rng.choice(("revenue", "shipped", "products"))
+    await recorder.request(client, "GET", f"{API}/leaderboards/{kind}", params={"limit": 10})
+    await recorder.request(client, "GET", f"{API}/leaderboards/{kind}/businesses/{player.business_id}")
+
+
+async def create_business(client: httpx.AsyncClient, recorder: Recorder, context: Context, player: Player) -> None:
+    await recorder.request(
+        client, "POST", f"{API}/businesses/",
+        json={"name": "Bench Business", "product_type": "widget"},
+        headers={"Authorization": f"Bearer {player.token}"},
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "register_login": register_login,
+    "create_business": create_business,
+    "generate_orders": generate_orders,
+    "ship_orders": ship_orders,
+    "purchase_upgrade_technologies": purchase_upgrade_technologies,
+    "read_leaderboards": read_leaderboards,
+}
+
+
+def percentiles(
+    values: List[float], points: Tuple[int, ...] = (50, 95, 99), scale: float = 1000
+) -> Dict[str, float]:
+    """Nearest-rank percentiles of durations in seconds, in milliseconds by default."""
+    if not values:
+        return {f"p{point}": 0.0 for point in points}
+    ordered = sorted(values)
+    return {
+        f"p{point}": round(ordered[max(0, -(-point * len(ordered) // 100) - 1)] * scale, 3)
+        for point in points
+    }
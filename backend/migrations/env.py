@@ -17,9 +17,14 @@ fileConfig(config.config_file_name)
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-from app.models import Base
+from app.core.base_model import Base
+from app.core.config import settings
+import app.models  # noqa: F401 - registers the models on Base.metadata
 target_metadata = Base.metadata
 
+# Use the same database as the application (e.g. Heroku's DATABASE_URL)
+config.set_main_option("sqlalchemy.url", str(settings.SQLALCHEMY_DATABASE_URI))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
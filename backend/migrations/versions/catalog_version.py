@@ -0,0 +1,37 @@
+"""Add catalog version counters
+
+Revision ID: 7e2f3a4b5c6d
+Revises: 5c1d2e3f4a6b
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7e2f3a4b5c6d'
+down_revision = '5c1d2e3f4a6b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_version = op.create_table('catalogversion',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.bulk_insert(catalog_version, [
+        {'id': uuid.uuid4(), 'name': 'technology', 'version': 0},
+    ])
+
+
+def downgrade():
+    op.drop_table('catalogversion')
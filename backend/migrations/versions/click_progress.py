@@ -0,0 +1,33 @@
+"""Make order progress non-null and add the business click-rate clock
+
+Revision ID: 9b4c5d6e7f8a
+Revises: 8a3b4c5d6e7f
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9b4c5d6e7f8a'
+down_revision = '8a3b4c5d6e7f'
+branch_labels = None
+depends_on = None
+
+
+PROGRESS_COLUMNS = ('production_progress', 'shipping_progress')
+
+
+def upgrade():
+    # The columns date from the initial schema; only rows that never made
+    # progress are rewritten
+    for column in PROGRESS_COLUMNS:
+        op.execute(f'UPDATE "order" SET {column} = 0 WHERE {column} IS NULL')
+        op.alter_column('order', column, existing_type=sa.Float(), nullable=False)
+    op.add_column('business', sa.Column('clicks_settled_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('business', 'clicks_settled_at')
+    for column in PROGRESS_COLUMNS:
+        op.alter_column('order', column, existing_type=sa.Float(), nullable=True)
@@ -0,0 +1,26 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: a1c5d6e7f8b9
+Revises: 9b4c5d6e7f8a
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a1c5d6e7f8b9'
+down_revision = '9b4c5d6e7f8a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_order_business_id_created_at_id', 'order', ['business_id', 'created_at', 'id'])
+    op.create_index('ix_business_created_at_id', 'business', ['created_at', 'id'])
+    op.create_index('ix_user_created_at_id', 'user', ['created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_user_created_at_id', table_name='user')
+    op.drop_index('ix_business_created_at_id', table_name='business')
+    op.drop_index('ix_order_business_id_created_at_id', table_name='order')
@@ -0,0 +1,53 @@
+"""Add the order archive
+
+Revision ID: d4f8a9b0c1e2
+Revises: c3e7f8a9b0d1
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'd4f8a9b0c1e2'
+down_revision = 'c3e7f8a9b0d1'
+branch_labels = None
+depends_on = None
+
+# The type already exists, it was created with the order table
+order_status = postgresql.ENUM(
+    'PENDING', 'IN_PROGRESS', 'COMPLETED', 'SHIPPED', 'EXPIRED', name='orderstatus', create_type=False
+)
+
+
+def upgrade():
+    op.create_table('orderarchive',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('product_type', sa.String(), nullable=False),
+        sa.Column('status', order_status, nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.Column('complexity', sa.Integer(), nullable=False),
+        sa.Column('deadline', sa.DateTime(), nullable=False),
+        sa.Column('production_progress', sa.Float(), nullable=False),
+        sa.Column('shipping_progress', sa.Float(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(['business_id'], ['business.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_orderarchive_business_id_created_at_id', 'orderarchive', ['business_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_order_updated_at_terminal', 'order', ['updated_at'],
+        postgresql_where=sa.text("status IN ('SHIPPED', 'EXPIRED')"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_order_updated_at_terminal', table_name='order')
+    op.drop_index('ix_orderarchive_business_id_created_at_id', table_name='orderarchive')
+    op.drop_table('orderarchive')
@@ -0,0 +1,126 @@
+"""Reconcile schema with models and add access-path indexes
+
+Revision ID: 5c1d2e3f4a6b
+Revises: 1234567890ab
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5c1d2e3f4a6b'
+down_revision = '1234567890ab'
+branch_labels = None
+depends_on = None
+
+# SQLAlchemy's Enum type stores member names, not values
+order_status = postgresql.ENUM(
+    'PENDING', 'IN_PROGRESS', 'COMPLETED', 'SHIPPED', 'EXPIRED', name='orderstatus'
+)
+technology_type = postgresql.ENUM(
+    'AUTOMATION', 'EFFICIENCY', 'CAPACITY', name='technologytype'
+)
+
+STATISTICS_COLUMNS = (
+    'orders_received',
+    'products_created',
+    'orders_shipped',
+    'orders_expired',
+    'total_revenue',
+    'total_spent',
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # The models map User to "user", not app_user
+    op.rename_table('app_user', 'user')
+    op.execute('ALTER INDEX ix_app_user_email RENAME TO ix_user_email')
+
+    # Technology type is a native enum in the models
+    technology_type.create(bind)
+    op.alter_column(
+        'technology', 'type',
+        type_=technology_type,
+        postgresql_using='upper(type)::technologytype',
+    )
+
+    # Order: quantity/reward -> value/complexity/deadline. The progress
+    # columns stay in place for the click progress revision to take over.
+    order_status.create(bind)
+    op.alter_column(
+        'order', 'status',
+        type_=order_status,
+        postgresql_using='upper(status)::orderstatus',
+    )
+    op.alter_column('order', 'reward', new_column_name='value')
+    op.drop_column('order', 'quantity')
+    op.add_column('order', sa.Column('complexity', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('order', sa.Column('deadline', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+    op.alter_column('order', 'complexity', server_default=None)
+    op.alter_column('order', 'deadline', server_default=None)
+
+    # Statistics: replace the old counters with the ones the models use
+    op.drop_column('statistics', 'total_orders_completed')
+    op.drop_column('statistics', 'total_currency_earned')
+    op.drop_column('statistics', 'total_clicks')
+    for column in STATISTICS_COLUMNS:
+        op.add_column('statistics', sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+        op.alter_column('statistics', column, server_default=None)
+    op.create_unique_constraint('statistics_business_id_key', 'statistics', ['business_id'])
+
+    op.execute('UPDATE businesstechnology SET level = 1 WHERE level IS NULL')
+    op.alter_column('businesstechnology', 'level', existing_type=sa.Integer(), nullable=False)
+
+    # Indexes for the hot access paths
+    op.create_index('ix_business_owner_id', 'business', ['owner_id'])
+    op.create_index('ix_order_business_id_status', 'order', ['business_id', 'status'])
+    op.create_index(
+        'ix_order_deadline_active', 'order', ['deadline'],
+        postgresql_where=sa.text("status IN ('PENDING', 'IN_PROGRESS', 'COMPLETED')"),
+    )
+    op.create_index(
+        'ix_businesstechnology_business_id_technology_id', 'businesstechnology',
+        ['business_id', 'technology_id'], unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_businesstechnology_business_id_technology_id', table_name='businesstechnology')
+    op.drop_index('ix_order_deadline_active', table_name='order')
+    op.drop_index('ix_order_business_id_status', table_name='order')
+    op.drop_index('ix_business_owner_id', table_name='business')
+
+    op.alter_column('businesstechnology', 'level', existing_type=sa.Integer(), nullable=True)
+
+    op.drop_constraint('statistics_business_id_key', 'statistics', type_='unique')
+    for column in STATISTICS_COLUMNS:
+        op.drop_column('statistics', column)
+    op.add_column('statistics', sa.Column('total_orders_completed', sa.Integer(), nullable=True))
+    op.add_column('statistics', sa.Column('total_currency_earned', sa.Integer(), nullable=True))
+    op.add_column('statistics', sa.Column('total_clicks', sa.Integer(), nullable=True))
+
+    op.drop_column('order', 'deadline')
+    op.drop_column('order', 'complexity')
+    op.add_column('order', sa.Column('quantity', sa.Integer(), nullable=False, server_default='1'))
+    op.alter_column('order', 'quantity', server_default=None)
+    op.alter_column('order', 'value', new_column_name='reward')
+    op.alter_column(
+        'order', 'status',
+        type_=sa.String(),
+        postgresql_using='lower(status::text)',
+    )
+    order_status.drop(op.get_bind())
+
+    op.alter_column(
+        'technology', 'type',
+        type_=sa.String(),
+        postgresql_using='lower(type::text)',
+    )
+    technology_type.drop(op.get_bind())
+
+    op.execute('ALTER INDEX ix_user_email RENAME TO ix_app_user_email')
+    op.rename_table('user', 'app_user')
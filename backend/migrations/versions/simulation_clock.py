@@ -0,0 +1,23 @@
+"""Add the business simulation clock
+
+Revision ID: b2d6e7f8a9c0
+Revises: a1c5d6e7f8b9
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b2d6e7f8a9c0'
+down_revision = 'a1c5d6e7f8b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('business', sa.Column('simulated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('business', 'simulated_at')
@@ -0,0 +1,49 @@
+"""Add time-bucketed statistics history
+
+Revision ID: c3e7f8a9b0d1
+Revises: b2d6e7f8a9c0
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c3e7f8a9b0d1'
+down_revision = 'b2d6e7f8a9c0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('statisticsbucket',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('resolution', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('orders_received', sa.Integer(), nullable=False),
+        sa.Column('orders_shipped', sa.Integer(), nullable=False),
+        sa.Column('orders_expired', sa.Integer(), nullable=False),
+        sa.Column('total_revenue', sa.Integer(), nullable=False),
+        sa.Column('total_spent', sa.Integer(), nullable=False),
+        sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(['business_id'], ['business.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_statisticsbucket_business_id_resolution_bucket_start',
+        'statisticsbucket',
+        ['business_id', 'resolution', 'bucket_start'],
+        unique=True,
+    )
+    op.create_index('ix_statisticsbucket_resolution_updated_at', 'statisticsbucket', ['resolution', 'updated_at'])
+    op.create_index('ix_statisticsbucket_resolution_bucket_start', 'statisticsbucket', ['resolution', 'bucket_start'])
+
+
+def downgrade():
+    op.drop_index('ix_statisticsbucket_resolution_bucket_start', table_name='statisticsbucket')
+    op.drop_index('ix_statisticsbucket_resolution_updated_at', table_name='statisticsbucket')
+    op.drop_index('ix_statisticsbucket_business_id_resolution_bucket_start', table_name='statisticsbucket')
+    op.drop_table('statisticsbucket')
@@ -0,0 +1,22 @@
+"""Index statistics by update time for the leaderboard sync
+
+Revision ID: 8a3b4c5d6e7f
+Revises: 7e2f3a4b5c6d
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8a3b4c5d6e7f'
+down_revision = '7e2f3a4b5c6d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_statistics_updated_at', 'statistics', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_statistics_updated_at', table_name='statistics')
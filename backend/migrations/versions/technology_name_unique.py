@@ -0,0 +1,58 @@
+"""Make technology names unique
+
+Revision ID: e5a9b0c1d2f3
+Revises: d4f8a9b0c1e2
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9b0c1d2f3'
+down_revision = 'd4f8a9b0c1e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Concurrent init_db runs could create a technology twice. Keep the oldest
+    # row of each name and move purchases of the others onto it, dropping the
+    # ones whose business already owns the kept row.
+    op.execute("""
+        CREATE TEMPORARY TABLE technology_duplicate ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id, first_value(id) OVER (PARTITION BY name ORDER BY created_at, id) AS keep_id
+            FROM technology
+        ) AS ranked
+        WHERE id <> keep_id
+    """)
+    op.execute("""
+        DELETE FROM businesstechnology AS bt
+        USING technology_duplicate AS d
+        WHERE bt.technology_id = d.id
+          AND EXISTS (
+              SELECT 1 FROM businesstechnology AS kept
+              WHERE kept.business_id = bt.business_id AND kept.technology_id = d.keep_id
+          )
+    """)
+    op.execute("""
+        DELETE FROM businesstechnology AS bt
+        USING technology_duplicate AS d
+        WHERE bt.technology_id = d.id
+          AND bt.id <> (
+              SELECT min(other.id::text)::uuid FROM businesstechnology AS other
+              JOIN technology_duplicate AS od ON od.id = other.technology_id
+              WHERE other.business_id = bt.business_id AND od.keep_id = d.keep_id
+          )
+    """)
+    op.execute("""
+        UPDATE businesstechnology AS bt SET technology_id = d.keep_id
+        FROM technology_duplicate AS d
+        WHERE bt.technology_id = d.id
+    """)
+    op.execute("DELETE FROM technology USING technology_duplicate AS d WHERE technology.id = d.id")
+    op.create_index('ix_technology_name', 'technology', ['name'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_technology_name', table_name='technology')